@@ -5,26 +5,375 @@ Provides reliable AI responses through multiple providers with intelligent failo
 """
 
 import os
+import sys
 import time
 import json
+import asyncio
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from ai_response_cache import StrategicResponseCache
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'backend'))
+from utils.llm_clients import get_async_llm_client, get_llm_client, llm_clients
+from utils.usage_ledger import usage_ledger
+from utils.prompt_cache import PromptParts, anthropic_prompt, chat_messages, context_blocks, prompt_cache_stats
+from context_assembler import count_tokens, fit_context
+
 load_dotenv()
 
+# Cheap models used for the "Test" health probe of each engine
+PROBE_MODELS = {
+    'openai': 'gpt-3.5-turbo',
+    'groq': 'llama3-8b-8192',
+    'together': 'NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO'
+}
+
+# Models used for strategic responses: engine -> (API model id, reported model name)
+ENGINE_MODELS = {
+    'openai': ('gpt-4o-mini', 'gpt-4o-mini'),
+    'groq': ('llama-3.1-70b-versatile', 'llama-3.1-70b-versatile'),
+    'together': ('NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO', 'llama-3-70b-chat'),
+    'anthropic': ('claude-3-haiku-20240307', 'claude-3-haiku')
+}
+
+ENGINE_API_KEY_ENV = {
+    'openai': 'OPENAI_API_KEY',
+    'groq': 'GROQ_API_KEY',
+    'together': 'TOGETHER_API_KEY',
+    'anthropic': 'ANTHROPIC_API_KEY'
+}
+
+STRATEGIC_SYSTEM_PROMPT = "You are PM33's Strategic AI Co-Pilot, an expert Product Manager consultant specializing in strategic analysis and executable frameworks."
+
+# Static prompt prefixes: kept byte-identical across calls so providers can cache them
+PM33_STRATEGIC_INSTRUCTIONS = STRATEGIC_SYSTEM_PROMPT + """
+
+Analyze the strategic question that follows the company context using proven PM frameworks.
+
+Provide a strategic analysis in this format:
+
+**STRATEGIC ANALYSIS:**
+[2-3 sentences of strategic assessment considering PM33's specific situation]
+
+**RECOMMENDED FRAMEWORK:**  
+[Which PM framework applies: ICE, RICE, OKR, Blue Ocean Strategy, Jobs-to-be-Done, etc.]
+
+**KEY ACTIONS:**
+1. [Specific action with assignee]
+2. [Specific action with assignee]  
+3. [Specific action with assignee]
+
+Focus on PM33's beta stage, limited resources, and strategic positioning in the AI PM tools market."""
+
+GENERAL_STRATEGIC_INSTRUCTIONS = STRATEGIC_SYSTEM_PROMPT + """
+
+Answer the strategic question that follows directly using proven business frameworks.
+
+Provide a comprehensive strategic analysis in this format:
+
+**STRATEGIC ANALYSIS:**
+[Direct answer to the question with strategic insights]
+
+**RECOMMENDED FRAMEWORK:**
+[Which business framework applies: Porter's Five Forces, Blue Ocean Strategy, Jobs-to-be-Done, Market Sizing, etc.]
+
+**KEY INSIGHTS:**
+1. [Specific strategic insight]
+2. [Specific strategic insight]
+3. [Specific strategic insight]
+
+Focus on providing actionable strategic guidance for product management and business decisions."""
+
+# Hedged requests: fire the next engine once the current one exceeds its observed p95
+HEDGE_DEFAULT_DELAY = 2.5    # seconds, used until enough latency samples exist
+HEDGE_MIN_DELAY = 0.25       # never hedge sooner than this
+HEDGE_MIN_SAMPLES = 5
+
+# Deadlines: one budget is shared by the whole failover chain of a request, and
+# each engine attempt is additionally capped (Anthropic keeps its 10s ceiling)
+DEFAULT_REQUEST_BUDGET = 20.0  # seconds
+ENGINE_CALL_TIMEOUTS = {
+    'openai': 15.0,
+    'groq': 10.0,
+    'together': 15.0,
+    'anthropic': 10.0
+}
+MIN_ATTEMPT_SECONDS = 0.5      # don't start an attempt with less budget than this
+
+# Company context token budget per engine: larger context windows and slower
+# engines get more, fast small-window engines stay cheap
+ENGINE_CONTEXT_TOKENS = {
+    'openai': int(os.getenv('PM33_CONTEXT_TOKENS_OPENAI', '1200')),
+    'groq': int(os.getenv('PM33_CONTEXT_TOKENS_GROQ', '600')),
+    'together': int(os.getenv('PM33_CONTEXT_TOKENS_TOGETHER', '600')),
+    'anthropic': int(os.getenv('PM33_CONTEXT_TOKENS_ANTHROPIC', '1500'))
+}
+DEFAULT_CONTEXT_TOKENS = 600
+
+# Live routing: rolling latency/error windows per engine and per query profile.
+# Observed latency replaces the static speed score once enough samples exist.
+LATENCY_WINDOW = 200         # samples kept per (engine, profile) window
+LATENCY_MIN_SAMPLES = 5
+LATENCY_TARGET_SECONDS = 1.0 # at or below this an engine earns the full speed score
+
+# Circuit breaker: open once the failure rate over the recent window crosses the
+# threshold, then allow a single half-open probe after a (backed-off) cooldown
+BREAKER_WINDOW = 20
+BREAKER_MIN_CALLS = 4
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_OPEN_SECONDS = 30.0
+BREAKER_MAX_OPEN_SECONDS = 300.0
+
+# Engine statuses that may be routed to. 'pending' means the client is built
+# but its background probe (lazy mode) has not finished yet.
+ROUTABLE_STATUSES = ('healthy', 'pending')
+
+class CallDeadline:
+    """Deadline budget shared by every engine attempt of one request
+    
+    Uses the monotonic clock and per-request client timeouts instead of
+    signals, so it works from any thread or event loop.
+    """
+    
+    def __init__(self, budget_seconds: float = DEFAULT_REQUEST_BUDGET, clock: Callable[[], float] = time.monotonic):
+        self.budget_seconds = budget_seconds
+        self._clock = clock
+        self.expires_at = clock() + budget_seconds
+    
+    def remaining(self) -> float:
+        """Seconds left in the budget (never negative)"""
+        return max(0.0, self.expires_at - self._clock())
+    
+    def can_attempt(self) -> bool:
+        """Whether enough budget is left to start another engine attempt"""
+        return self.remaining() >= MIN_ATTEMPT_SECONDS
+    
+    def timeout_for(self, engine_name: str) -> float:
+        """Timeout for one engine attempt: remaining budget capped per engine"""
+        return min(self.remaining(), ENGINE_CALL_TIMEOUTS.get(engine_name, DEFAULT_REQUEST_BUDGET))
+
+class EngineCircuitBreaker:
+    """Per-engine circuit breaker with closed, open and half-open states"""
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, window_size: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 failure_rate_threshold: float = BREAKER_FAILURE_RATE,
+                 open_seconds: float = BREAKER_OPEN_SECONDS, max_open_seconds: float = BREAKER_MAX_OPEN_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        
+        self._outcomes = deque(maxlen=window_size)  # True = success
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._open_seconds = open_seconds
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state, moving open -> half-open once the cooldown has elapsed"""
+        with self._lock:
+            self._advance()
+            return self._state
+    
+    def _advance(self):
+        """Transition open -> half-open after the cooldown (caller holds the lock)"""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+    
+    def is_available(self) -> bool:
+        """Whether the engine could take a request right now (does not claim a probe)"""
+        with self._lock:
+            self._advance()
+            if self._state == self.CLOSED:
+                return True
+            return self._state == self.HALF_OPEN and not self._probe_in_flight
+    
+    def allow_request(self) -> bool:
+        """Claim permission for one call; in half-open only a single probe is let through"""
+        with self._lock:
+            self._advance()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+    
+    def release(self):
+        """Give back a half-open probe slot when the call was cancelled without an outcome"""
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def record_success(self):
+        """Record a successful call; a successful half-open probe closes the circuit"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                self._open_seconds = self.base_open_seconds
+            self._probe_in_flight = False
+            self._outcomes.append(True)
+    
+    def record_failure(self):
+        """Record a failed call; trip the circuit when the window failure rate is too high"""
+        with self._lock:
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN:
+                # Failed probe - reopen with a longer cooldown
+                self._open_seconds = min(self._open_seconds * 2, self.max_open_seconds)
+                self._trip()
+                return
+            
+            self._outcomes.append(False)
+            if self._state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                if self._failure_rate() >= self.failure_rate_threshold:
+                    self._trip()
+    
+    def _trip(self):
+        """Open the circuit (caller holds the lock)"""
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._times_opened += 1
+    
+    def _failure_rate(self) -> float:
+        """Failure rate over the current window (caller holds the lock)"""
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+    
+    def snapshot(self) -> Dict:
+        """Breaker state for status reporting"""
+        with self._lock:
+            self._advance()
+            retry_in = 0.0
+            if self._state == self.OPEN:
+                retry_in = max(0.0, self._open_seconds - (self._clock() - self._opened_at))
+            return {
+                'state': self._state,
+                'failure_rate': round(self._failure_rate(), 3),
+                'window_calls': len(self._outcomes),
+                'times_opened': self._times_opened,
+                'retry_in_seconds': round(retry_in, 1)
+            }
+
+class EngineLatencyTracker:
+    """Rolling latency percentiles and error rates per engine and query profile"""
+    
+    ALL_PROFILES = '*'
+    
+    def __init__(self, window_size: int = LATENCY_WINDOW):
+        self.window_size = window_size
+        self._latencies: Dict[Tuple[str, str], deque] = {}
+        self._outcomes: Dict[Tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def profile_key(query_profile: Dict) -> str:
+        """Bucket a query profile by complexity and speed-critical flag"""
+        return f"{query_profile['complexity']}:{'fast' if query_profile['speed_critical'] else 'normal'}"
+    
+    def record(self, engine_name: str, profile_key: str, latency: Optional[float], success: bool):
+        """Record one call outcome under both the profile bucket and the engine-wide bucket"""
+        with self._lock:
+            for key in ((engine_name, profile_key), (engine_name, self.ALL_PROFILES)):
+                self._outcomes.setdefault(key, deque(maxlen=self.window_size)).append(success)
+                if success and latency is not None:
+                    self._latencies.setdefault(key, deque(maxlen=self.window_size)).append(latency)
+    
+    def stats(self, engine_name: str, profile_key: str = ALL_PROFILES) -> Dict:
+        """Percentiles and error rate for a profile bucket, falling back to engine-wide data"""
+        with self._lock:
+            key = (engine_name, profile_key)
+            if len(self._latencies.get(key, ())) < LATENCY_MIN_SAMPLES:
+                key = (engine_name, self.ALL_PROFILES)
+            latencies = sorted(self._latencies.get(key, ()))
+            outcomes = list(self._outcomes.get(key, ()))
+        
+        return {
+            'samples': len(latencies),
+            'calls': len(outcomes),
+            'p50': self._percentile(latencies, 0.50),
+            'p95': self._percentile(latencies, 0.95),
+            'error_rate': outcomes.count(False) / len(outcomes) if outcomes else 0.0,
+            'profile': key[1]
+        }
+    
+    @staticmethod
+    def _percentile(sorted_samples: List[float], fraction: float) -> Optional[float]:
+        """Nearest-rank percentile of pre-sorted samples"""
+        if not sorted_samples:
+            return None
+        return sorted_samples[min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))]
+    
+    def snapshot(self) -> Dict:
+        """Engine-wide latency and error stats for status reporting"""
+        with self._lock:
+            engines = sorted({engine for engine, _ in self._outcomes})
+        snapshot = {}
+        for engine in engines:
+            stats = self.stats(engine)
+            snapshot[engine] = {
+                'p50': round(stats['p50'], 3) if stats['p50'] is not None else None,
+                'p95': round(stats['p95'], 3) if stats['p95'] is not None else None,
+                'error_rate': round(stats['error_rate'], 3),
+                'calls': stats['calls']
+            }
+        return snapshot
+
 class AIEngineManager:
     """Manages multiple AI providers with intelligent failover and optimization"""
     
-    def __init__(self):
+    def __init__(self, lazy_init: Optional[bool] = None, response_cache: Optional[StrategicResponseCache] = None,
+                 request_budget_seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
         self.engines = {}
+        self.async_engines = set()  # engines with an async client, resolved per event loop
         self.engine_status = {}
-        self.response_times = {}
+        self.circuit_breakers: Dict[str, EngineCircuitBreaker] = {}
+        self.latency_tracker = EngineLatencyTracker()
+        
+        # Repeated demo/beta questions are served from cache (PM33_RESPONSE_CACHE_SIZE=0 disables).
+        # Exact matches only by default; pass a StrategicResponseCache with an embedding
+        # model (and PM33_RESPONSE_CACHE_SIMILARITY < 1) to also serve paraphrases
+        if response_cache is None and int(os.getenv('PM33_RESPONSE_CACHE_SIZE', '500')) > 0:
+            response_cache = StrategicResponseCache(
+                max_entries=int(os.getenv('PM33_RESPONSE_CACHE_SIZE', '500')),
+                ttl_seconds=float(os.getenv('PM33_RESPONSE_CACHE_TTL', '3600')),
+                similarity_threshold=float(os.getenv('PM33_RESPONSE_CACHE_SIMILARITY', '1.0'))
+            )
+        self.response_cache = response_cache
+        
+        # Default deadline budget shared across the failover chain of each request
+        if request_budget_seconds is None:
+            request_budget_seconds = float(os.getenv('PM33_REQUEST_BUDGET_SECONDS', str(DEFAULT_REQUEST_BUDGET)))
+        self.request_budget_seconds = request_budget_seconds
+        self.clock = clock  # Monotonic clock for deadlines and circuit breaker cooldowns
+        
+        # Lazy mode builds clients without probing and verifies them in the background
+        if lazy_init is None:
+            lazy_init = os.getenv('PM33_LAZY_ENGINE_INIT', '').lower() in ('1', 'true', 'yes')
+        self.lazy_init = lazy_init
+        self._status_lock = threading.Lock()
+        self._probe_threads: List[threading.Thread] = []
+        
         self.initialize_engines()
     
     def initialize_engines(self):
         """Initialize all available AI engines"""
-        print("🎯 Initializing AI Engine Manager...")
+        print(f"🎯 Initializing AI Engine Manager{' (lazy)' if self.lazy_init else ''}...")
         
         # Initialize OpenAI
         self._init_openai()
@@ -38,41 +387,117 @@ class AIEngineManager:
         # Initialize Anthropic (as fallback)
         self._init_anthropic()
         
+        if self.lazy_init:
+            # Probe all pending engines concurrently without blocking startup
+            pending = [name for name, status in self.engine_status.items() if status == 'pending']
+            self._start_background_probes(pending)
+            print(f"⚡ {len(pending)} AI engines warming up in background: {', '.join(pending)}")
+            return
+        
         # Show available engines
         available = [name for name, status in self.engine_status.items() if status == 'healthy']
         print(f"✅ {len(available)} AI engines available: {', '.join(available)}")
     
+    def _register_engine(self, engine_name: str, client):
+        """Register a built client; probe it now unless running in lazy mode"""
+        self.engines[engine_name] = client
+        
+        if self.lazy_init:
+            self.engine_status[engine_name] = 'pending'
+            return
+        
+        self._probe_engine(engine_name)
+        self.engine_status[engine_name] = 'healthy'
+    
+    def _probe_engine(self, engine_name: str):
+        """Make a minimal "Test" completion against an engine (raises on failure)"""
+        client = self.engines[engine_name]
+        client.chat.completions.create(
+            model=PROBE_MODELS[engine_name],
+            messages=[{"role": "user", "content": "Test"}],
+            max_tokens=10,
+            timeout=ENGINE_CALL_TIMEOUTS[engine_name]
+        )
+    
+    def _start_background_probes(self, engine_names: List[str]):
+        """Run health probes for the given engines concurrently on daemon threads"""
+        for engine_name in engine_names:
+            thread = threading.Thread(
+                target=self._background_probe,
+                args=(engine_name,),
+                name=f"pm33-probe-{engine_name}",
+                daemon=True
+            )
+            self._probe_threads.append(thread)
+            thread.start()
+    
+    def _background_probe(self, engine_name: str):
+        """Probe one engine and record the outcome without clobbering live-call results"""
+        try:
+            self._probe_engine(engine_name)
+            self._set_status_if_pending(engine_name, 'healthy')
+            print(f"✅ {engine_name} engine verified in background")
+        except Exception as e:
+            self._set_status_if_pending(engine_name, f'error: {str(e)[:50]}...')
+            print(f"❌ {engine_name} background probe failed: {str(e)}")
+    
+    def _set_status_if_pending(self, engine_name: str, status: str):
+        """Update an engine status only if no real call has settled it yet"""
+        with self._status_lock:
+            if self.engine_status.get(engine_name) == 'pending':
+                self.engine_status[engine_name] = status
+    
+    def _mark_healthy(self, engine_name: str):
+        """Mark an engine healthy after a successful real call"""
+        with self._status_lock:
+            self.engine_status[engine_name] = 'healthy'
+    
+    def _is_routable(self, engine_name: str) -> bool:
+        """Whether traffic may be sent to an engine (initialized and circuit not open)"""
+        if self.engine_status.get(engine_name) not in ROUTABLE_STATUSES:
+            return False
+        return self._breaker(engine_name).is_available()
+    
+    def _breaker(self, engine_name: str) -> EngineCircuitBreaker:
+        """Get (or create) the circuit breaker for an engine"""
+        with self._status_lock:
+            if engine_name not in self.circuit_breakers:
+                self.circuit_breakers[engine_name] = EngineCircuitBreaker(clock=self.clock)
+            return self.circuit_breakers[engine_name]
+    
+    def wait_for_probes(self, timeout: Optional[float] = None) -> Dict:
+        """Block until background probes finish (lazy mode); returns engine status"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._probe_threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        return dict(self.engine_status)
+    
     def _init_openai(self):
         """Initialize OpenAI engine"""
         try:
-            import openai
             api_key = os.getenv('OPENAI_API_KEY')
             
             if not api_key:
                 self.engine_status['openai'] = 'no_key'
                 return
             
-            client = openai.OpenAI(api_key=api_key)
-            
-            # Quick test
-            test_response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "Test"}],
-                max_tokens=10
-            )
+            client = get_llm_client('openai', api_key)
+            self.async_engines.add('openai')
             
-            self.engines['openai'] = client
-            self.engine_status['openai'] = 'healthy'
+            # Quick test (deferred to a background probe in lazy mode)
+            self._register_engine('openai', client)
             print("✅ OpenAI engine initialized")
             
         except Exception as e:
+            self.engines.pop('openai', None)
+            self.async_engines.discard('openai')
             self.engine_status['openai'] = f'error: {str(e)[:50]}...'
             print(f"❌ OpenAI initialization failed: {str(e)}")
     
     def _init_groq(self):
         """Initialize Groq engine (ultra-fast)"""
         try:
-            from groq import Groq
             groq_key = os.getenv('GROQ_API_KEY')
             
             if not groq_key:
@@ -80,27 +505,22 @@ class AIEngineManager:
                 print("⚡ Groq engine available - need API key from console.groq.com/keys (free)")
                 return
             
-            client = Groq(api_key=groq_key)
+            client = get_llm_client('groq', groq_key)
+            self.async_engines.add('groq')
             
-            # Quick test
-            test_response = client.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[{"role": "user", "content": "Test"}],
-                max_tokens=10
-            )
-            
-            self.engines['groq'] = client
-            self.engine_status['groq'] = 'healthy'
+            # Quick test (deferred to a background probe in lazy mode)
+            self._register_engine('groq', client)
             print("✅ Groq engine initialized (ultra-fast inference)")
             
         except Exception as e:
+            self.engines.pop('groq', None)
+            self.async_engines.discard('groq')
             self.engine_status['groq'] = f'error: {str(e)[:50]}...'
             print(f"❌ Groq initialization failed: {str(e)}")
     
     def _init_together(self):
         """Initialize Together AI engine"""
         try:
-            from together import Together
             together_key = os.getenv('TOGETHER_API_KEY')
             
             if not together_key:
@@ -108,35 +528,31 @@ class AIEngineManager:
                 print("🤝 Together AI available - signup at api.together.xyz/settings/api-keys ($1 free credit)")
                 return
             
-            client = Together(api_key=together_key)
+            client = get_llm_client('together', together_key)
+            self.async_engines.add('together')
             
-            # Quick test with serverless model
-            response = client.chat.completions.create(
-                model="NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO",
-                messages=[{"role": "user", "content": "Test"}],
-                max_tokens=10
-            )
-            
-            self.engines['together'] = client
-            self.engine_status['together'] = 'healthy'
+            # Quick test with serverless model (deferred to a background probe in lazy mode)
+            self._register_engine('together', client)
             print("✅ Together AI engine initialized (cost-effective)")
             
         except Exception as e:
+            self.engines.pop('together', None)
+            self.async_engines.discard('together')
             self.engine_status['together'] = f'error: {str(e)[:50]}...'
             print(f"❌ Together AI initialization failed: {str(e)}")
     
     def _init_anthropic(self):
         """Initialize Anthropic engine (problematic)"""
         try:
-            import anthropic
             api_key = os.getenv('ANTHROPIC_API_KEY')
             
             if not api_key:
                 self.engine_status['anthropic'] = 'no_key'
                 return
             
-            client = anthropic.Anthropic(api_key=api_key)
+            client = get_llm_client('anthropic', api_key)
             self.engines['anthropic'] = client
+            self.async_engines.add('anthropic')
             self.engine_status['anthropic'] = 'available_untested'  # Don't test to avoid hangs
             print("🔶 Anthropic engine available (untested due to reliability issues)")
             
@@ -144,9 +560,15 @@ class AIEngineManager:
             self.engine_status['anthropic'] = f'error: {str(e)[:50]}...'
             print(f"❌ Anthropic initialization failed: {str(e)}")
     
-    def get_strategic_response(self, question: str, context: str) -> Dict:
+    def get_strategic_response(self, question: str, context: str, deadline_seconds: Optional[float] = None) -> Dict:
         """Get strategic response with intelligent engine selection optimized for performance/quality/cost"""
         
+        deadline = CallDeadline(deadline_seconds or self.request_budget_seconds, self.clock)
+        
+        cached = self._get_cached_response(question, context)
+        if cached:
+            return cached
+        
         # Analyze query complexity and requirements
         query_profile = self._analyze_query_requirements(question, context)
         
@@ -156,29 +578,445 @@ class AIEngineManager:
         print(f"🎯 Query profile: {query_profile['complexity']} complexity, {query_profile['context_size']} context")
         print(f"🚀 Engine priority: {' → '.join(engine_priority)}")
         
+        profile_key = EngineLatencyTracker.profile_key(query_profile)
+        
         for engine_name in engine_priority:
-            if self.engine_status.get(engine_name) == 'healthy':
+            if not deadline.can_attempt():
+                print(f"⏱️ Request budget of {deadline.budget_seconds:.1f}s exhausted - skipping remaining engines")
+                break
+            
+            breaker = self._breaker(engine_name)
+            if self._is_routable(engine_name) and breaker.allow_request():
                 try:
                     print(f"🚀 Trying {engine_name} engine...")
-                    response = self._call_engine(engine_name, question, context)
+                    response = self._call_engine(engine_name, question, context, deadline)
                     
                     if response:
+                        # First successful real call verifies a lazily initialized engine
+                        self._mark_healthy(engine_name)
+                        breaker.record_success()
+                        self.latency_tracker.record(engine_name, profile_key, response['meta']['response_time'], True)
+                        
                         # Add query profile to response metadata
                         response['meta']['query_profile'] = query_profile
                         response['meta']['engine_selection_reason'] = self._get_selection_reason(engine_name, query_profile)
                         
                         print(f"✅ {engine_name} responded successfully")
+                        self._cache_response(question, context, response)
                         return response
-                        
+                    
+                    breaker.release()
+                    
                 except Exception as e:
                     print(f"❌ {engine_name} failed: {str(e)[:100]}...")
-                    self.engine_status[engine_name] = 'degraded'
+                    breaker.record_failure()
+                    self.latency_tracker.record(engine_name, profile_key, None, False)
                     continue
         
         # All engines failed - return structured fallback
         print("⚠️ All AI engines failed - returning structured fallback")
         return self._create_fallback_response(question, context)
     
+    async def get_strategic_response_async(self, question: str, context: str, deadline_seconds: Optional[float] = None) -> Dict:
+        """Async strategic response that hedges a slow engine with the next-ranked one"""
+        
+        deadline = CallDeadline(deadline_seconds or self.request_budget_seconds, self.clock)
+        
+        cached = self._get_cached_response(question, context)
+        if cached:
+            return cached
+        
+        query_profile = self._analyze_query_requirements(question, context)
+        engine_priority = [
+            engine for engine in self._select_optimal_engines(query_profile)
+            if engine in self.async_engines and self._is_routable(engine)
+        ]
+        
+        print(f"🎯 Query profile: {query_profile['complexity']} complexity, {query_profile['context_size']} context")
+        print(f"🚀 Async engine priority: {' → '.join(engine_priority)}")
+        
+        profile_key = EngineLatencyTracker.profile_key(query_profile)
+        response = await self._hedged_engine_call(engine_priority, question, context, deadline, profile_key)
+        
+        if response:
+            response['meta']['query_profile'] = query_profile
+            response['meta']['engine_selection_reason'] = self._get_selection_reason(response['meta']['engine'], query_profile)
+            self._cache_response(question, context, response)
+            return response
+        
+        print("⚠️ All AI engines failed - returning structured fallback")
+        return self._create_fallback_response(question, context)
+    
+    async def _hedged_engine_call(self, engine_priority: List[str], question: str, context: str,
+                                  deadline: CallDeadline, profile_key: str = EngineLatencyTracker.ALL_PROFILES) -> Optional[Dict]:
+        """Race engines in priority order with at most one hedge per request
+        
+        The top engine is called first. If it has not answered within its p95
+        latency, the next engine is fired as a hedge and the first good answer
+        wins; the loser is cancelled. Failures fail over to the next engine.
+        """
+        remaining = list(engine_priority)
+        in_flight: Dict[asyncio.Task, str] = {}
+        hedged = False
+        
+        def launch() -> bool:
+            # Start the next engine whose circuit lets a request through
+            while remaining and deadline.can_attempt():
+                engine_name = remaining.pop(0)
+                if not self._breaker(engine_name).allow_request():
+                    continue
+                print(f"🚀 Trying {engine_name} engine (async)...")
+                task = asyncio.create_task(self._call_engine_async(engine_name, question, context, deadline))
+                in_flight[task] = engine_name
+                return True
+            return False
+        
+        launch()
+        
+        try:
+            while in_flight:
+                hedge_delay = None
+                if remaining and not hedged and len(in_flight) == 1:
+                    hedge_delay = self._hedge_delay(next(iter(in_flight.values())), profile_key)
+                wait_timeout = deadline.remaining() if hedge_delay is None else min(hedge_delay, deadline.remaining())
+                
+                done, _ = await asyncio.wait(in_flight.keys(), timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    if deadline.remaining() <= 0:
+                        print(f"⏱️ Request budget of {deadline.budget_seconds:.1f}s exhausted - cancelling in-flight engines")
+                        return None
+                    
+                    # Primary exceeded its p95 - fire the next-ranked engine alongside it
+                    hedged = True
+                    print(f"⏱️ No answer after {hedge_delay:.2f}s - hedging with the next engine")
+                    launch()
+                    continue
+                
+                winner = None
+                for task in done:
+                    engine_name = in_flight.pop(task)
+                    breaker = self._breaker(engine_name)
+                    if task.exception() is not None:
+                        print(f"❌ {engine_name} failed: {str(task.exception())[:100]}...")
+                        breaker.record_failure()
+                        self.latency_tracker.record(engine_name, profile_key, None, False)
+                    elif task.result():
+                        breaker.record_success()
+                        self.latency_tracker.record(engine_name, profile_key, task.result()['meta']['response_time'], True)
+                        if winner is None:
+                            winner = task.result()
+                    else:
+                        breaker.release()
+                
+                if winner:
+                    engine_name = winner['meta']['engine']
+                    self._mark_healthy(engine_name)
+                    winner['meta']['hedged'] = hedged
+                    print(f"✅ {engine_name} responded successfully{' (hedged)' if hedged else ''}")
+                    return winner
+                
+                if not in_flight and remaining:
+                    launch()
+            
+            return None
+        finally:
+            # Cancel the losing request(s) so they stop consuming a connection
+            for task, engine_name in in_flight.items():
+                task.cancel()
+                self._breaker(engine_name).release()
+    
+    async def _call_engine_async(self, engine_name: str, question: str, context: str,
+                                 deadline: Optional[CallDeadline] = None) -> Dict:
+        """Call specific AI engine through its async client"""
+        
+        if engine_name not in self.async_engines:
+            raise Exception(f"Async client not available for engine: {engine_name}")
+        
+        client = self._client_for_attempt(self._async_client(engine_name), engine_name, deadline)
+        model, reported_model = ENGINE_MODELS[engine_name]
+        parts = self._strategic_prompt_parts(question, context, engine_name)
+        
+        start_time = time.time()
+        with usage_ledger.track(engine_name, model, 'engine_manager.strategic') as call:
+            if engine_name == 'anthropic':
+                response = call.response = await client.messages.create(
+                    model=model,
+                    max_tokens=800,
+                    **anthropic_prompt(parts, model)
+                )
+                ai_response = response.content[0].text
+            else:
+                response = call.response = await client.chat.completions.create(
+                    model=model,
+                    messages=chat_messages(parts),
+                    max_tokens=800,
+                    temperature=0.7
+                )
+                ai_response = response.choices[0].message.content
+        
+        response_time = time.time() - start_time
+        
+        return {
+            'response': ai_response,
+            'meta': {
+                'engine': engine_name,
+                'model': reported_model,
+                'response_time': response_time,
+                'context_chars': len(context),
+                'usage': call.record.summary(),
+                'timestamp': datetime.now().isoformat()
+            }
+        }
+    
+    def _hedge_delay(self, engine_name: str, profile_key: str = EngineLatencyTracker.ALL_PROFILES) -> float:
+        """p95 response time of an engine, used as the deadline before hedging"""
+        stats = self.latency_tracker.stats(engine_name, profile_key)
+        if stats['samples'] < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return max(HEDGE_MIN_DELAY, stats['p95'])
+    
+    def stream_strategic_response(self, question: str, context: str, deadline_seconds: Optional[float] = None) -> Iterator[Dict]:
+        """Stream a strategic response token by token from whichever engine answers first
+        
+        Yields {'type': 'token', 'text': ...} events followed by one
+        {'type': 'done', 'response': ..., 'meta': ...} event. Engines that fail
+        before their first token are failed over; a failure mid-stream ends
+        the stream with an {'type': 'error'} event.
+        """
+        deadline = CallDeadline(deadline_seconds or self.request_budget_seconds, self.clock)
+        
+        cached = self._get_cached_response(question, context)
+        if cached:
+            yield {'type': 'token', 'text': cached['response']}
+            yield {'type': 'done', 'response': cached['response'], 'meta': cached['meta']}
+            return
+        
+        query_profile = self._analyze_query_requirements(question, context)
+        profile_key = EngineLatencyTracker.profile_key(query_profile)
+        
+        for engine_name in self._select_optimal_engines(query_profile):
+            if not deadline.can_attempt():
+                print(f"⏱️ Request budget of {deadline.budget_seconds:.1f}s exhausted - skipping remaining engines")
+                break
+            
+            breaker = self._breaker(engine_name)
+            if not breaker.allow_request():
+                continue
+            
+            print(f"🚀 Streaming from {engine_name} engine...")
+            start_time = time.time()
+            first_token_time = None
+            chunks = []
+            
+            try:
+                for text in self._stream_engine(engine_name, question, context, deadline):
+                    if first_token_time is None:
+                        first_token_time = time.time() - start_time
+                    chunks.append(text)
+                    yield {'type': 'token', 'text': text}
+            except GeneratorExit:
+                # Client went away mid-stream - free a half-open probe slot
+                breaker.release()
+                raise
+            except Exception as e:
+                print(f"❌ {engine_name} stream failed: {str(e)[:100]}...")
+                breaker.record_failure()
+                self.latency_tracker.record(engine_name, profile_key, None, False)
+                if chunks:
+                    yield {'type': 'error', 'engine': engine_name, 'error': str(e)[:200]}
+                    return
+                continue
+            
+            response = self._finish_stream(engine_name, question, context, ''.join(chunks),
+                                           time.time() - start_time, first_token_time, query_profile)
+            yield {'type': 'done', 'response': response['response'], 'meta': response['meta']}
+            return
+        
+        print("⚠️ All AI engines failed - returning structured fallback")
+        fallback = self._create_fallback_response(question, context)
+        yield {'type': 'token', 'text': fallback['response']}
+        yield {'type': 'done', 'response': fallback['response'], 'meta': fallback['meta']}
+    
+    async def astream_strategic_response(self, question: str, context: str,
+                                         deadline_seconds: Optional[float] = None) -> AsyncIterator[Dict]:
+        """Async variant of stream_strategic_response using the providers' async clients"""
+        deadline = CallDeadline(deadline_seconds or self.request_budget_seconds, self.clock)
+        
+        cached = self._get_cached_response(question, context)
+        if cached:
+            yield {'type': 'token', 'text': cached['response']}
+            yield {'type': 'done', 'response': cached['response'], 'meta': cached['meta']}
+            return
+        
+        query_profile = self._analyze_query_requirements(question, context)
+        profile_key = EngineLatencyTracker.profile_key(query_profile)
+        
+        for engine_name in self._select_optimal_engines(query_profile):
+            if engine_name not in self.async_engines:
+                continue
+            if not deadline.can_attempt():
+                print(f"⏱️ Request budget of {deadline.budget_seconds:.1f}s exhausted - skipping remaining engines")
+                break
+            
+            breaker = self._breaker(engine_name)
+            if not breaker.allow_request():
+                continue
+            
+            print(f"🚀 Streaming from {engine_name} engine (async)...")
+            start_time = time.time()
+            first_token_time = None
+            chunks = []
+            
+            try:
+                async for text in self._astream_engine(engine_name, question, context, deadline):
+                    if first_token_time is None:
+                        first_token_time = time.time() - start_time
+                    chunks.append(text)
+                    yield {'type': 'token', 'text': text}
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                print(f"❌ {engine_name} stream failed: {str(e)[:100]}...")
+                breaker.record_failure()
+                self.latency_tracker.record(engine_name, profile_key, None, False)
+                if chunks:
+                    yield {'type': 'error', 'engine': engine_name, 'error': str(e)[:200]}
+                    return
+                continue
+            
+            response = self._finish_stream(engine_name, question, context, ''.join(chunks),
+                                           time.time() - start_time, first_token_time, query_profile)
+            yield {'type': 'done', 'response': response['response'], 'meta': response['meta']}
+            return
+        
+        print("⚠️ All AI engines failed - returning structured fallback")
+        fallback = self._create_fallback_response(question, context)
+        yield {'type': 'token', 'text': fallback['response']}
+        yield {'type': 'done', 'response': fallback['response'], 'meta': fallback['meta']}
+    
+    def _stream_engine(self, engine_name: str, question: str, context: str, deadline: CallDeadline) -> Iterator[str]:
+        """Yield text deltas from one engine's streaming API"""
+        if engine_name not in self.engines:
+            raise Exception(f"Client not available for engine: {engine_name}")
+        
+        client = self._client_for_attempt(self.engines[engine_name], engine_name, deadline)
+        model, _ = ENGINE_MODELS[engine_name]
+        parts = self._strategic_prompt_parts(question, context, engine_name)
+        
+        with usage_ledger.track(engine_name, model, 'engine_manager.strategic_stream') as call:
+            # Estimated usage so far, recorded if the consumer stops reading early
+            call.usage['input_tokens'] = count_tokens(parts.text())
+            if engine_name == 'anthropic':
+                with client.messages.stream(
+                    model=model,
+                    max_tokens=800,
+                    **anthropic_prompt(parts, model)
+                ) as stream:
+                    for text in stream.text_stream:
+                        call.usage['output_tokens'] += count_tokens(text)
+                        yield text
+                    call.response = stream.get_final_message()
+                return
+            
+            stream = client.chat.completions.create(
+                model=model,
+                messages=chat_messages(parts),
+                max_tokens=800,
+                temperature=0.7,
+                stream=True,
+                **self._stream_usage_options(engine_name)
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    call.usage['output_tokens'] += count_tokens(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+                # The final chunk carries the usage block
+                if getattr(chunk, 'usage', None) or getattr(chunk, 'x_groq', None):
+                    call.response = chunk
+    
+    async def _astream_engine(self, engine_name: str, question: str, context: str, deadline: CallDeadline) -> AsyncIterator[str]:
+        """Yield text deltas from one engine's async streaming API"""
+        client = self._client_for_attempt(self._async_client(engine_name), engine_name, deadline)
+        model, _ = ENGINE_MODELS[engine_name]
+        parts = self._strategic_prompt_parts(question, context, engine_name)
+        
+        with usage_ledger.track(engine_name, model, 'engine_manager.strategic_stream') as call:
+            # Estimated usage so far, recorded if the stream is cancelled or closed early
+            call.usage['input_tokens'] = count_tokens(parts.text())
+            if engine_name == 'anthropic':
+                async with client.messages.stream(
+                    model=model,
+                    max_tokens=800,
+                    **anthropic_prompt(parts, model)
+                ) as stream:
+                    async for text in stream.text_stream:
+                        call.usage['output_tokens'] += count_tokens(text)
+                        yield text
+                    call.response = await stream.get_final_message()
+                return
+            
+            stream = await client.chat.completions.create(
+                model=model,
+                messages=chat_messages(parts),
+                max_tokens=800,
+                temperature=0.7,
+                stream=True,
+                **self._stream_usage_options(engine_name)
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    call.usage['output_tokens'] += count_tokens(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+                # The final chunk carries the usage block
+                if getattr(chunk, 'usage', None) or getattr(chunk, 'x_groq', None):
+                    call.response = chunk
+    
+    @staticmethod
+    def _stream_usage_options(engine_name: str) -> Dict:
+        """Ask OpenAI to append token usage to the end of a stream"""
+        return {'stream_options': {'include_usage': True}} if engine_name == 'openai' else {}
+    
+    def _finish_stream(self, engine_name: str, question: str, context: str, text: str,
+                       response_time: float, first_token_time: Optional[float], query_profile: Dict) -> Dict:
+        """Record a completed stream like a regular call and build its response dict"""
+        self._mark_healthy(engine_name)
+        self._breaker(engine_name).record_success()
+        self.latency_tracker.record(engine_name, EngineLatencyTracker.profile_key(query_profile), response_time, True)
+        
+        response = {
+            'response': text,
+            'meta': {
+                'engine': engine_name,
+                'model': ENGINE_MODELS[engine_name][1],
+                'response_time': response_time,
+                'time_to_first_token': first_token_time,
+                'streamed': True,
+                'context_chars': len(context),
+                'timestamp': datetime.now().isoformat(),
+                'query_profile': query_profile,
+                'engine_selection_reason': self._get_selection_reason(engine_name, query_profile)
+            }
+        }
+        print(f"✅ {engine_name} stream completed (first token after {first_token_time or 0:.2f}s)")
+        self._cache_response(question, context, response)
+        return response
+    
+    def _get_cached_response(self, question: str, context: str) -> Optional[Dict]:
+        """Serve a repeated (or near-identical) question from the response cache"""
+        if not self.response_cache:
+            return None
+        cached = self.response_cache.get(question, context)
+        if cached:
+            print(f"⚡ Cache hit ({cached['meta']['cache']}) - served in {cached['meta']['response_time'] * 1000:.1f}ms")
+        return cached
+    
+    def _cache_response(self, question: str, context: str, response: Dict):
+        """Store a successful engine response for later identical/similar questions"""
+        if self.response_cache:
+            self.response_cache.put(question, context, response)
+    
     def _analyze_query_requirements(self, question: str, context: str) -> Dict:
         """Analyze query to determine optimal engine selection"""
         
@@ -233,15 +1071,21 @@ class AIEngineManager:
         
         # Score engines based on requirements
         engine_scores = {}
+        profile_key = EngineLatencyTracker.profile_key(query_profile)
         
         for engine, profile in engine_profiles.items():
             score = 0
+            live = self.latency_tracker.stats(engine, profile_key)
+            
+            # Speed optimization - observed latency overrides the static profile once sampled
+            speed = profile['speed']
+            if live['samples'] >= LATENCY_MIN_SAMPLES:
+                speed = self._observed_speed_score(live, query_profile['speed_critical'])
             
-            # Speed optimization
             if query_profile['speed_critical']:
-                score += profile['speed'] * 2
+                score += speed * 2
             else:
-                score += profile['speed']
+                score += speed
             
             # Quality optimization for complex queries
             if query_profile['complexity'] == 'high':
@@ -256,8 +1100,12 @@ class AIEngineManager:
             if query_profile['context_size'] == 'large' and profile['context_limit'] > 16000:
                 score += 3
             
-            # Penalize if engine is not healthy
-            if self.engine_status.get(engine) != 'healthy':
+            # Discount engines by their recently observed error rate
+            if live['calls'] >= LATENCY_MIN_SAMPLES:
+                score *= (1 - live['error_rate'])
+            
+            # Penalize if engine is not healthy (or still pending verification)
+            if not self._is_routable(engine):
                 score = 0
             
             engine_scores[engine] = score
@@ -268,6 +1116,12 @@ class AIEngineManager:
         # Return engines with score > 0
         return [engine for engine, score in sorted_engines if score > 0]
     
+    @staticmethod
+    def _observed_speed_score(live_stats: Dict, speed_critical: bool) -> float:
+        """Map observed latency onto the 0-10 speed scale (tail latency for speed-critical queries)"""
+        latency = live_stats['p95'] if speed_critical else live_stats['p50']
+        return 10 * LATENCY_TARGET_SECONDS / max(latency, LATENCY_TARGET_SECONDS)
+    
     def _get_selection_reason(self, engine: str, query_profile: Dict) -> str:
         """Get human-readable reason for engine selection"""
         reasons = []
@@ -297,39 +1151,51 @@ class AIEngineManager:
         else:
             return base_reason
     
-    def _call_engine(self, engine_name: str, question: str, context: str) -> Dict:
+    def _call_engine(self, engine_name: str, question: str, context: str, deadline: Optional[CallDeadline] = None) -> Dict:
         """Call specific AI engine"""
         
         if engine_name == 'openai':
-            return self._call_openai(question, context)
+            return self._call_openai(question, context, deadline)
         elif engine_name == 'groq':
-            return self._call_groq(question, context)
+            return self._call_groq(question, context, deadline)
         elif engine_name == 'together':
-            return self._call_together(question, context)
+            return self._call_together(question, context, deadline)
         elif engine_name == 'anthropic':
-            return self._call_anthropic(question, context)
+            return self._call_anthropic(question, context, deadline)
         else:
             raise Exception(f"Unknown engine: {engine_name}")
     
-    def _call_openai(self, question: str, context: str) -> Dict:
+    def _async_client(self, engine_name: str):
+        """Pooled async client for engine on the running event loop"""
+        return get_async_llm_client(engine_name, os.getenv(ENGINE_API_KEY_ENV[engine_name]))
+    
+    @staticmethod
+    def _client_for_attempt(client, engine_name: str, deadline: Optional[CallDeadline]):
+        """Client view bounded by the request deadline
+        
+        SDK-level retries are disabled so one attempt can never outlive its
+        timeout; retrying is the failover chain's job.
+        """
+        deadline = deadline or CallDeadline()
+        return client.with_options(timeout=deadline.timeout_for(engine_name), max_retries=0)
+    
+    def _call_openai(self, question: str, context: str, deadline: Optional[CallDeadline] = None) -> Dict:
         """Call OpenAI with strategic prompt"""
         if 'openai' not in self.engines:
             raise Exception("OpenAI client not available")
         
-        client = self.engines['openai']
+        client = self._client_for_attempt(self.engines['openai'], 'openai', deadline)
         
-        prompt = self._build_strategic_prompt(question, context)
+        parts = self._strategic_prompt_parts(question, context, 'openai')
         
         start_time = time.time()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Use the faster, cheaper model
-            messages=[
-                {"role": "system", "content": "You are PM33's Strategic AI Co-Pilot, an expert Product Manager consultant specializing in strategic analysis and executable frameworks."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=800,
-            temperature=0.7
-        )
+        with usage_ledger.track('openai', "gpt-4o-mini", 'engine_manager.strategic') as call:
+            response = call.response = client.chat.completions.create(
+                model="gpt-4o-mini",  # Use the faster, cheaper model
+                messages=chat_messages(parts),
+                max_tokens=800,
+                temperature=0.7
+            )
         
         response_time = time.time() - start_time
         ai_response = response.choices[0].message.content
@@ -341,29 +1207,28 @@ class AIEngineManager:
                 'model': 'gpt-4o-mini',
                 'response_time': response_time,
                 'context_chars': len(context),
+                'usage': call.record.summary(),
                 'timestamp': datetime.now().isoformat()
             }
         }
     
-    def _call_groq(self, question: str, context: str) -> Dict:
+    def _call_groq(self, question: str, context: str, deadline: Optional[CallDeadline] = None) -> Dict:
         """Call Groq with ultra-fast inference"""
         if 'groq' not in self.engines:
             raise Exception("Groq client not available")
         
-        client = self.engines['groq']
+        client = self._client_for_attempt(self.engines['groq'], 'groq', deadline)
         
-        prompt = self._build_strategic_prompt(question, context)
+        parts = self._strategic_prompt_parts(question, context, 'groq')
         
         start_time = time.time()
-        response = client.chat.completions.create(
-            model="llama-3.1-70b-versatile",  # Best balance of speed/quality
-            messages=[
-                {"role": "system", "content": "You are PM33's Strategic AI Co-Pilot, an expert Product Manager consultant specializing in strategic analysis and executable frameworks."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=800,
-            temperature=0.7
-        )
+        with usage_ledger.track('groq', "llama-3.1-70b-versatile", 'engine_manager.strategic') as call:
+            response = call.response = client.chat.completions.create(
+                model="llama-3.1-70b-versatile",  # Best balance of speed/quality
+                messages=chat_messages(parts),
+                max_tokens=800,
+                temperature=0.7
+            )
         
         response_time = time.time() - start_time
         ai_response = response.choices[0].message.content
@@ -375,29 +1240,28 @@ class AIEngineManager:
                 'model': 'llama-3.1-70b-versatile',
                 'response_time': response_time,
                 'context_chars': len(context),
+                'usage': call.record.summary(),
                 'timestamp': datetime.now().isoformat()
             }
         }
     
-    def _call_together(self, question: str, context: str) -> Dict:
+    def _call_together(self, question: str, context: str, deadline: Optional[CallDeadline] = None) -> Dict:
         """Call Together AI with cost-effective inference"""
         if 'together' not in self.engines:
             raise Exception("Together AI client not available")
         
-        client = self.engines['together']
+        client = self._client_for_attempt(self.engines['together'], 'together', deadline)
         
-        prompt = self._build_strategic_prompt(question, context)
+        parts = self._strategic_prompt_parts(question, context, 'together')
         
         start_time = time.time()
-        response = client.chat.completions.create(
-            model="NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO",  # Serverless model
-            messages=[
-                {"role": "system", "content": "You are PM33's Strategic AI Co-Pilot, an expert Product Manager consultant specializing in strategic analysis and executable frameworks."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=800,
-            temperature=0.7
-        )
+        with usage_ledger.track('together', "NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO", 'engine_manager.strategic') as call:
+            response = call.response = client.chat.completions.create(
+                model="NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO",  # Serverless model
+                messages=chat_messages(parts),
+                max_tokens=800,
+                temperature=0.7
+            )
         
         response_time = time.time() - start_time
         ai_response = response.choices[0].message.content
@@ -409,56 +1273,48 @@ class AIEngineManager:
                 'model': 'llama-3-70b-chat',
                 'response_time': response_time,
                 'context_chars': len(context),
+                'usage': call.record.summary(),
                 'timestamp': datetime.now().isoformat()
             }
         }
     
-    def _call_anthropic(self, question: str, context: str) -> Dict:
-        """Call Anthropic with timeout protection"""
+    def _call_anthropic(self, question: str, context: str, deadline: Optional[CallDeadline] = None) -> Dict:
+        """Call Anthropic with timeout protection (per-request deadline, safe off the main thread)"""
         if 'anthropic' not in self.engines:
             raise Exception("Anthropic client not available")
         
-        # Add timeout protection to prevent hangs
-        import signal
+        client = self._client_for_attempt(self.engines['anthropic'], 'anthropic', deadline)
+        parts = self._strategic_prompt_parts(question, context, 'anthropic')
         
-        def timeout_handler(signum, frame):
-            raise Exception("Anthropic API timeout after 10 seconds")
-        
-        try:
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(10)  # 10 second timeout
-            
-            client = self.engines['anthropic']
-            prompt = self._build_strategic_prompt(question, context)
-            
-            start_time = time.time()
-            response = client.messages.create(
+        start_time = time.time()
+        with usage_ledger.track('anthropic', "claude-3-haiku-20240307", 'engine_manager.strategic') as call:
+            response = call.response = client.messages.create(
                 model="claude-3-haiku-20240307",
                 max_tokens=800,
-                messages=[{"role": "user", "content": prompt}]
+                **anthropic_prompt(parts, "claude-3-haiku-20240307")
             )
-            
-            signal.alarm(0)  # Cancel timeout
-            response_time = time.time() - start_time
-            ai_response = response.content[0].text
-            
-            return {
-                'response': ai_response,
-                'meta': {
-                    'engine': 'anthropic',
-                    'model': 'claude-3-haiku',
-                    'response_time': response_time,
-                    'context_chars': len(context),
-                    'timestamp': datetime.now().isoformat()
-                }
+        
+        response_time = time.time() - start_time
+        ai_response = response.content[0].text
+        
+        return {
+            'response': ai_response,
+            'meta': {
+                'engine': 'anthropic',
+                'model': 'claude-3-haiku',
+                'response_time': response_time,
+                'context_chars': len(context),
+                'usage': call.record.summary(),
+                'timestamp': datetime.now().isoformat()
             }
-            
-        except Exception as e:
-            signal.alarm(0)  # Cancel timeout
-            raise e
+        }
     
-    def _build_strategic_prompt(self, question: str, context: str) -> str:
-        """Build strategic prompt optimized for AI engines"""
+    def _strategic_prompt_parts(self, question: str, context: str, engine_name: Optional[str] = None) -> PromptParts:
+        """Build strategic prompt as a cacheable static prefix + per-question suffix
+        
+        Company context is packed into the engine's token budget, keeping the
+        sections most relevant to the question when it does not fit.
+        """
         
         # Check if question is PM33-specific or general business question
         pm33_keywords = ['pm33', 'our company', 'our product', 'our startup', 'we should', 'our team', 'our users', 'our competitors']
@@ -466,47 +1322,17 @@ class AIEngineManager:
         
         if is_pm33_specific:
             # PM33-specific strategic analysis
-            return f"""You are PM33's Strategic AI Co-Pilot. Analyze this strategic question using proven PM frameworks.
-
-COMPANY CONTEXT (PM33):
-{context[:1200]}
-
-STRATEGIC QUESTION: {question}
-
-Provide a strategic analysis in this format:
-
-**STRATEGIC ANALYSIS:**
-[2-3 sentences of strategic assessment considering PM33's specific situation]
-
-**RECOMMENDED FRAMEWORK:**  
-[Which PM framework applies: ICE, RICE, OKR, Blue Ocean Strategy, Jobs-to-be-Done, etc.]
-
-**KEY ACTIONS:**
-1. [Specific action with assignee]
-2. [Specific action with assignee]  
-3. [Specific action with assignee]
-
-Focus on PM33's beta stage, limited resources, and strategic positioning in the AI PM tools market."""
+            return PromptParts(
+                static=PM33_STRATEGIC_INSTRUCTIONS,
+                context=f"COMPANY CONTEXT (PM33):\n{fit_context(question, context_blocks.compact(context), ENGINE_CONTEXT_TOKENS.get(engine_name, DEFAULT_CONTEXT_TOKENS))}",
+                dynamic=f"STRATEGIC QUESTION: {question}"
+            )
         else:
             # General strategic/business question
-            return f"""You are a Strategic AI Co-Pilot for Product Managers. Answer this strategic question directly using proven business frameworks.
-
-QUESTION: {question}
-
-Provide a comprehensive strategic analysis in this format:
-
-**STRATEGIC ANALYSIS:**
-[Direct answer to the question with strategic insights]
-
-**RECOMMENDED FRAMEWORK:**
-[Which business framework applies: Porter's Five Forces, Blue Ocean Strategy, Jobs-to-be-Done, Market Sizing, etc.]
-
-**KEY INSIGHTS:**
-1. [Specific strategic insight]
-2. [Specific strategic insight]
-3. [Specific strategic insight]
-
-Focus on providing actionable strategic guidance for product management and business decisions."""
+            return PromptParts(
+                static=GENERAL_STRATEGIC_INSTRUCTIONS,
+                dynamic=f"QUESTION: {question}"
+            )
 
     def _create_fallback_response(self, question: str, context: str) -> Dict:
         """Create structured fallback when all AI engines fail"""
@@ -520,7 +1346,8 @@ Focus on providing actionable strategic guidance for product management and busi
                 'context_chars': len(context),
                 'timestamp': datetime.now().isoformat(),
                 'available_engines': list(self.engine_status.keys()),
-                'engine_health': self.engine_status
+                'engine_health': self.engine_status,
+                'circuit_breakers': {name: breaker.snapshot() for name, breaker in self.circuit_breakers.items()}
             }
         }
     
@@ -529,7 +1356,15 @@ Focus on providing actionable strategic guidance for product management and busi
         return {
             'engines': self.engine_status,
             'healthy_count': len([s for s in self.engine_status.values() if s == 'healthy']),
+            'pending_count': len([s for s in self.engine_status.values() if s == 'pending']),
             'total_count': len(self.engine_status),
+            'lazy_init': self.lazy_init,
+            'circuit_breakers': {name: breaker.snapshot() for name, breaker in self.circuit_breakers.items()},
+            'latency': self.latency_tracker.snapshot(),
+            'response_cache': self.response_cache.stats() if self.response_cache else None,
+            'http_pool': llm_clients.stats(),
+            'usage': usage_ledger.stats(),
+            'prompt_cache': prompt_cache_stats(),
             'timestamp': datetime.now().isoformat()
         }
 
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+PM33 Strategic Response Cache
+Exact-match and embedding-similarity cache in front of AIEngineManager
+"""
+
+import copy
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+# Sparse {dimension: weight} or dense [weight, ...] vectors are both accepted
+Vector = Union[Dict[int, float], List[float]]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9$%]+")
+
+
+def cosine_similarity(a: Vector, b: Vector) -> float:
+    """Cosine similarity for sparse dict or dense list vectors"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        if len(a) > len(b):
+            a, b = b, a
+        dot = sum(weight * b.get(index, 0.0) for index, weight in a.items())
+        norm_a = math.sqrt(sum(w * w for w in a.values()))
+        norm_b = math.sqrt(sum(w * w for w in b.values()))
+    else:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm_a = math.sqrt(sum(x * x for x in a))
+        norm_b = math.sqrt(sum(y * y for y in b))
+
+    if not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+class StrategicResponseCache:
+    """Response cache keyed on normalized question + context fingerprint
+
+    Tier 1 is an exact match on the normalized question. Tier 2 compares the
+    question embedding against cached questions that share the same context
+    fingerprint; it only runs when an embedding model is injected and
+    similarity_threshold is below 1.0, since near-miss questions can ask the
+    opposite thing. Entries expire after ttl_seconds and the cache is bounded
+    by max_entries with least-recently-used eviction.
+    """
+
+    def __init__(self, max_entries: int = 500, ttl_seconds: float = 3600,
+                 similarity_threshold: float = 1.0, embedder=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embedder = embedder
+        if embedder is None and similarity_threshold < 1.0:
+            print("⚠️ Response cache similarity tier needs an embedding model; serving exact matches only")
+
+        # (context fingerprint, normalized question) -> entry, in LRU order
+        self._entries: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        # context fingerprint -> keys, to bound the similarity scan
+        self._by_context: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+        self.counters = {
+            'exact_hits': 0,
+            'semantic_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether misses fall through to the embedding-similarity tier"""
+        return self.embedder is not None and self.similarity_threshold < 1.0
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace"""
+        return ' '.join(_TOKEN_PATTERN.findall(question.lower()))
+
+    @staticmethod
+    def context_fingerprint(context: str) -> str:
+        """Stable fingerprint of the context string sent with the question"""
+        return hashlib.sha256(context.encode('utf-8')).hexdigest()[:16]
+
+    def get(self, question: str, context: str) -> Optional[Dict]:
+        """Return a copy of a cached response, or None on a miss"""
+        start_time = time.time()
+        normalized = self.normalize_question(question)
+        fingerprint = self.context_fingerprint(context)
+        key = (fingerprint, normalized)
+
+        with self._lock:
+            entry = self._live_entry(key)
+            tier = 'exact'
+
+            if entry is None and self.semantic_enabled:
+                entry, tier = self._similar_entry(fingerprint, normalized), 'semantic'
+
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+
+            self._entries.move_to_end(entry['key'])
+            self.counters[f'{tier}_hits'] += 1
+            response = copy.deepcopy(entry['response'])
+
+        meta = response.setdefault('meta', {})
+        meta['original_response_time'] = meta.get('response_time')
+        meta['response_time'] = time.time() - start_time
+        meta['cache'] = tier
+        meta['cached_at'] = entry['cached_at']
+        meta['timestamp'] = datetime.now().isoformat()
+        return response
+
+    def put(self, question: str, context: str, response: Dict):
+        """Cache an engine response (fallback responses should not be cached)"""
+        normalized = self.normalize_question(question)
+        fingerprint = self.context_fingerprint(context)
+        key = (fingerprint, normalized)
+
+        entry = {
+            'key': key,
+            'response': copy.deepcopy(response),
+            'embedding': self.embedder.embed(normalized) if self.semantic_enabled else None,
+            'stored_at': time.monotonic(),
+            'cached_at': datetime.now().isoformat()
+        }
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = entry
+            self._by_context.setdefault(fingerprint, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._forget(old_key)
+                self.counters['evictions'] += 1
+
+    def _live_entry(self, key: Tuple[str, str]) -> Optional[Dict]:
+        """Entry for key if present and not expired (caller holds the lock)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry['stored_at'] > self.ttl_seconds:
+            del self._entries[key]
+            self._forget(key)
+            self.counters['expirations'] += 1
+            return None
+        return entry
+
+    def _similar_entry(self, fingerprint: str, normalized: str) -> Optional[Dict]:
+        """Most similar live entry under the same context (caller holds the lock)"""
+        candidates = list(self._by_context.get(fingerprint, ()))
+        if not candidates:
+            return None
+
+        query_embedding = self.embedder.embed(normalized)
+        best_entry, best_score = None, self.similarity_threshold
+
+        for key in candidates:
+            entry = self._live_entry(key)
+            if entry is None or entry['embedding'] is None:
+                continue
+            score = cosine_similarity(query_embedding, entry['embedding'])
+            if score >= best_score:
+                best_entry, best_score = entry, score
+
+        return best_entry
+
+    def _forget(self, key: Tuple[str, str]):
+        """Drop key from the per-context index (caller holds the lock)"""
+        keys = self._by_context.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_context[key[0]]
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
+            self._by_context.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and size for status reporting"""
+        with self._lock:
+            counters = dict(self.counters)
+            size = len(self._entries)
+
+        lookups = counters['exact_hits'] + counters['semantic_hits'] + counters['misses']
+        hits = counters['exact_hits'] + counters['semantic_hits']
+        return {
+            **counters,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'size': size,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'semantic': self.semantic_enabled
+        }
@@ -16,6 +16,10 @@ from models.user import User
 from models.subscription import Subscription  
 from models.operation import Operation
 from models.billing import BillingRecord
+from models.llm_usage import LLMUsage
+from models.workflow import StoredWorkflow
+from models.workflow_job import WorkflowJob
+from models.context_document import ContextDocument
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,49 @@
+"""Add llm_usage table for per-call token and cost accounting
+
+Revision ID: 002_llm_usage
+Revises: 001_initial_schema
+Create Date: 2025-08-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_llm_usage'
+down_revision: Union[str, None] = '001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create llm_usage table."""
+    
+    op.create_table(
+        'llm_usage',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('operation_id', sa.Integer(), nullable=True),
+        sa.Column('engine', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('call_site', sa.String(length=100), nullable=False),
+        sa.Column('success', sa.Boolean(), nullable=True, default=True),
+        sa.Column('latency_ms', sa.Integer(), nullable=True),
+        sa.Column('input_tokens', sa.Integer(), nullable=True, default=0),
+        sa.Column('output_tokens', sa.Integer(), nullable=True, default=0),
+        sa.Column('cache_read_tokens', sa.Integer(), nullable=True, default=0),
+        sa.Column('cache_write_tokens', sa.Integer(), nullable=True, default=0),
+        sa.Column('cost', sa.Numeric(precision=12, scale=6), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['operation_id'], ['operations.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_llm_usage_operation_id'), 'llm_usage', ['operation_id'])
+    op.create_index(op.f('ix_llm_usage_call_site'), 'llm_usage', ['call_site'])
+    op.create_index(op.f('ix_llm_usage_created_at'), 'llm_usage', ['created_at'])
+
+
+def downgrade() -> None:
+    """Drop llm_usage table."""
+    op.drop_table('llm_usage')
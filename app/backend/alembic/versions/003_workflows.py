@@ -0,0 +1,42 @@
+"""Add workflows table for stored strategic workflows and idempotency keys
+
+Revision ID: 003_workflows
+Revises: 002_llm_usage
+Create Date: 2025-08-22 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_workflows'
+down_revision: Union[str, None] = '002_llm_usage'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create workflows table."""
+    
+    op.create_table(
+        'workflows',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=255), nullable=True),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('query', sa.Text(), nullable=False),
+        sa.Column('workflow_type', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('result', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index(op.f('ix_workflows_created_at'), 'workflows', ['created_at'])
+
+
+def downgrade() -> None:
+    """Drop workflows table."""
+    op.drop_table('workflows')
@@ -0,0 +1,43 @@
+"""Add workflow_jobs table for background workflow generation
+
+Revision ID: 004_workflow_jobs
+Revises: 003_workflows
+Create Date: 2025-08-25 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_workflow_jobs'
+down_revision: Union[str, None] = '003_workflows'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create workflow_jobs table."""
+    
+    op.create_table(
+        'workflow_jobs',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('query', sa.Text(), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=True),
+        sa.Column('progress', sa.Text(), nullable=True),
+        sa.Column('workflow_id', sa.String(length=64), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['workflow_id'], ['workflows.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_workflow_jobs_status'), 'workflow_jobs', ['status'])
+
+
+def downgrade() -> None:
+    """Drop workflow_jobs table."""
+    op.drop_table('workflow_jobs')
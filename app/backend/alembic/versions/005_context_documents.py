@@ -0,0 +1,41 @@
+"""Add context_documents table for per-tenant company context
+
+Revision ID: 005_context_documents
+Revises: 004_workflow_jobs
+Create Date: 2025-08-26 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_context_documents'
+down_revision: Union[str, None] = '004_workflow_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create context_documents table."""
+    
+    op.create_table(
+        'context_documents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.String(length=64), nullable=False),
+        sa.Column('context_type', sa.String(length=50), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'context_type', name='uq_context_documents_tenant_type')
+    )
+    op.create_index(op.f('ix_context_documents_id'), 'context_documents', ['id'])
+    op.create_index(op.f('ix_context_documents_tenant_id'), 'context_documents', ['tenant_id'])
+
+
+def downgrade() -> None:
+    """Drop context_documents table."""
+    op.drop_table('context_documents')
@@ -0,0 +1,31 @@
+"""Add tenant_id to users for per-tenant context access
+
+Revision ID: 006_user_tenant
+Revises: 005_context_documents
+Create Date: 2025-08-27 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_user_tenant'
+down_revision: Union[str, None] = '005_context_documents'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add users.tenant_id."""
+    
+    op.add_column('users', sa.Column('tenant_id', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_users_tenant_id'), 'users', ['tenant_id'])
+
+
+def downgrade() -> None:
+    """Drop users.tenant_id."""
+    op.drop_index(op.f('ix_users_tenant_id'), table_name='users')
+    op.drop_column('users', 'tenant_id')
@@ -0,0 +1,29 @@
+"""Add cancelled flag to llm_usage
+
+Revision ID: 007_llm_usage_cancelled
+Revises: 006_user_tenant
+Create Date: 2025-08-28 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_llm_usage_cancelled'
+down_revision: Union[str, None] = '006_user_tenant'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add llm_usage.cancelled."""
+    
+    op.add_column('llm_usage', sa.Column('cancelled', sa.Boolean(), server_default=sa.false(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop llm_usage.cancelled."""
+    op.drop_column('llm_usage', 'cancelled')
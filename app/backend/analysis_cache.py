@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+PM33 Analysis Cache
+Per-tenant memory of the last strategic analysis for each company context fingerprint
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+ANALYSIS_CACHE_TTL = float(os.getenv("PM33_ANALYSIS_CACHE_TTL", "3600"))  # seconds
+ANALYSIS_CACHE_MAX_TENANTS = int(os.getenv("PM33_ANALYSIS_CACHE_MAX_TENANTS", "1000"))
+ANALYSIS_CACHE_MAX_PER_TENANT = int(os.getenv("PM33_ANALYSIS_CACHE_MAX_PER_TENANT", "8"))
+
+
+def context_fingerprint(context_str: str) -> str:
+    """Short stable hash of the formatted company context"""
+    return hashlib.sha256(context_str.encode("utf-8")).hexdigest()[:16]
+
+
+def tenant_key(context: Dict[str, Any]) -> str:
+    """Tenant the context belongs to (explicit tenant id, else company name)"""
+    return str(context.get("tenant_id") or context.get("company_name") or "default")
+
+
+@dataclass
+class CachedAnalysis:
+    fingerprint: str
+    situation_assessment: str
+    objective: str
+    workflow_name: str
+    created_at: float
+    hits: int = 0
+
+
+class AnalysisCache:
+    """LRU of tenants, each holding an LRU of analyses keyed by context fingerprint"""
+
+    def __init__(self, ttl: float = ANALYSIS_CACHE_TTL, max_tenants: int = ANALYSIS_CACHE_MAX_TENANTS,
+                 max_per_tenant: int = ANALYSIS_CACHE_MAX_PER_TENANT):
+        self.ttl = ttl
+        self.max_tenants = max_tenants
+        self.max_per_tenant = max_per_tenant
+        self._tenants: "OrderedDict[str, OrderedDict[str, CachedAnalysis]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "expired": 0}
+
+    def get(self, tenant: str, fingerprint: str) -> Optional[CachedAnalysis]:
+        """Prior analysis for this tenant and unchanged context, if still fresh"""
+        with self._lock:
+            entries = self._tenants.get(tenant)
+            entry = entries.get(fingerprint) if entries else None
+            if entry is not None and time.time() - entry.created_at > self.ttl:
+                del entries[fingerprint]
+                self.counters["expired"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+
+            self._tenants.move_to_end(tenant)
+            entries.move_to_end(fingerprint)
+            entry.hits += 1
+            self.counters["hits"] += 1
+            return entry
+
+    def store(self, tenant: str, fingerprint: str, analysis: Dict[str, Any]):
+        """Remember the situation assessment of a full analysis"""
+        if not analysis.get("description"):
+            return
+        entry = CachedAnalysis(
+            fingerprint=fingerprint,
+            situation_assessment=analysis["description"],
+            objective=analysis.get("objective", ""),
+            workflow_name=analysis.get("workflow_name", ""),
+            created_at=time.time(),
+        )
+        with self._lock:
+            entries = self._tenants.setdefault(tenant, OrderedDict())
+            self._tenants.move_to_end(tenant)
+            entries[fingerprint] = entry
+            entries.move_to_end(fingerprint)
+            while len(entries) > self.max_per_tenant:
+                entries.popitem(last=False)
+            while len(self._tenants) > self.max_tenants:
+                self._tenants.popitem(last=False)
+            self.counters["stores"] += 1
+
+    def invalidate(self, tenant: str):
+        """Forget every cached analysis for a tenant"""
+        with self._lock:
+            self._tenants.pop(tenant, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            tenants = len(self._tenants)
+            entries = sum(len(entries) for entries in self._tenants.values())
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "tenants": tenants,
+            "entries": entries,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+analysis_cache = AnalysisCache()
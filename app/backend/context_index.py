@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+PM33 Context Index
+Section-level chunks of the company context files with an inverted index and BM25 ranking
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+MAX_CHUNK_CHARS = int(os.getenv("PM33_CONTEXT_MAX_CHUNK_CHARS", "1200"))
+
+# Standard BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can could do does for from has have how i if in into is it its
+may me more most my no not of on or our out should so than that the their them then there these
+they this to up us was we were what when where which while who why will with would you your
+""".split())
+
+# Longest first; a suffix is only stripped if at least four letters remain
+_SUFFIXES = ("ations", "ation", "ities", "ions", "ives", "ity", "ion", "ive", "ors", "ers", "ing",
+             "ies", "or", "er", "ed", "es", "ly", "s")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_HEADING_RE = re.compile(r"^(#{1,3})\s+(.*)$")
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping so competitor/competitive/competition share a term"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed index terms without stopwords"""
+    return [_stem(token) for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS and len(token) > 1]
+
+
+@dataclass(frozen=True)
+class ContextChunk:
+    id: str  # "<context_type>#<position>"
+    context_type: str
+    heading: str
+    text: str
+    position: int
+
+
+def chunk_markdown(context_type: str, content: str, max_chars: int = MAX_CHUNK_CHARS) -> Tuple[ContextChunk, ...]:
+    """Split a markdown file into heading sections, breaking long sections at blank lines"""
+    sections: List[Tuple[str, List[str]]] = []
+    heading, lines = "", []
+    for line in content.split("\n"):
+        match = _HEADING_RE.match(line.strip())
+        if match:
+            if any(l.strip() for l in lines):
+                sections.append((heading, lines))
+            heading, lines = match.group(2).strip(), []
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append((heading, lines))
+
+    chunks = []
+    for heading, lines in sections:
+        for text in _split_long("\n".join(lines).strip(), max_chars):
+            chunks.append(ContextChunk(f"{context_type}#{len(chunks)}", context_type, heading, text, len(chunks)))
+    return tuple(chunks)
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    parts, current = [], ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            parts.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+        # A single oversized paragraph is cut at line boundaries
+        while len(current) > max_chars:
+            cut = current.rfind("\n", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            parts.append(current[:cut].rstrip())
+            current = current[cut:].lstrip()
+    if current:
+        parts.append(current)
+    return parts
+
+
+class BM25Index:
+    """Immutable inverted index over context chunks
+
+    Build a new index when chunks change (chunks of unchanged files are
+    reused, so only edited files are re-chunked). Scoring only touches the
+    postings of the query terms.
+    """
+
+    def __init__(self, chunks: Iterable[ContextChunk], k1: float = BM25_K1, b: float = BM25_B):
+        self.chunks: Tuple[ContextChunk, ...] = tuple(chunks)
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}  # term -> [(chunk index, term frequency)]
+        self.lengths: List[int] = []
+
+        for i, chunk in enumerate(self.chunks):
+            # The file's name is indexed with each section (sections rarely repeat it)
+            terms = tokenize(f"{chunk.context_type.replace('_', ' ')}\n{chunk.heading}\n{chunk.text}")
+            self.lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                self.postings.setdefault(term, []).append((i, count))
+
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        n = len(self.chunks)
+        self.idf = {
+            term: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    @classmethod
+    def from_files(cls, chunks_by_type: Mapping[str, Sequence[ContextChunk]]) -> "BM25Index":
+        return cls(chunk for chunks in chunks_by_type.values() for chunk in chunks)
+
+    def score(self, query: str, context_types: Optional[Iterable[str]] = None) -> List[Tuple[ContextChunk, float]]:
+        """Chunks matching any query term, best first"""
+        allowed = set(context_types) if context_types is not None else None
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self.postings[term]:
+                norm = 1 - self.b + self.b * self.lengths[i] / self.average_length
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            (self.chunks[i], score) for i, score in ranked
+            if allowed is None or self.chunks[i].context_type in allowed
+        ]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "chunks": len(self.chunks),
+            "terms": len(self.postings),
+            "average_chunk_terms": round(self.average_length, 1),
+        }
@@ -5,48 +5,230 @@ Loads and manages company context for strategic AI responses
 
 import os
 import json
-from typing import Dict, List, Optional, Any
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import re
 from datetime import datetime
+from context_index import BM25Index, ContextChunk, chunk_markdown
+from context_assembler import CONTEXT_MAX_TOKENS, AssembledContext, ContextCandidate, assemble
+
+# The repository's strategy/context unless PM33_CONTEXT_PATH points elsewhere
+DEFAULT_CONTEXT_PATH = os.getenv("PM33_CONTEXT_PATH", str(Path(__file__).resolve().parents[2] / "strategy" / "context"))
+
+CONTEXT_FILES = {
+    'company_profile': 'company/company-profile.md',
+    'business_model': 'company/business-model.md',
+    'ideal_customer_profile': 'gtm/ideal-customer-profile.md',
+    'customer_segments': 'gtm/customer-segments.md',
+    'current_priorities': 'operations/current-priorities.md',
+    'team_structure': 'operations/team-structure.md',
+    'direct_competitors': 'competitive/direct-competitors.md',
+    'competitive_advantages': 'competitive/competitive-advantages.md',
+    'product_strategy': 'product/product-strategy.md',
+    'financial_position': 'financial/financial-position.md'
+}
+
+# Used when nothing in the query matches the indexed context
+DEFAULT_CONTEXT_TYPES = ['company_profile', 'current_priorities']
+
+# "bm25" (keyword) or "vector" (embedding similarity) section retrieval
+CONTEXT_RETRIEVAL = os.getenv("PM33_CONTEXT_RETRIEVAL", "bm25")
+# Where vector mode keeps its embeddings (default: .vectors inside the context directory)
+CONTEXT_VECTOR_DIR = os.getenv("PM33_CONTEXT_VECTOR_DIR")
+
+# Seconds between checks for edited context files in watch mode
+CONTEXT_POLL_INTERVAL = float(os.getenv("PM33_CONTEXT_POLL_INTERVAL", "2"))
+
+# (changed context types, removed context types) -> None, called after each swap
+ContextListener = Callable[[List[str], List[str]], None]
+
+# Parsed (summary, chunks) shared by every manager that loads identical content
+PARSED_CONTEXT_CACHE_SIZE = int(os.getenv("PM33_PARSED_CONTEXT_CACHE_SIZE", "1024"))
+_parsed_context: "OrderedDict[Tuple[str, str], Tuple[str, Tuple[ContextChunk, ...]]]" = OrderedDict()
+_parsed_context_lock = threading.Lock()
+
+class FileContextSource:
+    """Context documents stored as markdown files under one directory"""
+    
+    def __init__(self, context_path: str):
+        self.context_path = context_path
+    
+    def location(self, context_type: str) -> str:
+        return os.path.join(self.context_path, CONTEXT_FILES[context_type])
+    
+    def signatures(self) -> Dict[str, Any]:
+        """Cheap change marker (mtime, size) for each document that exists"""
+        signatures = {}
+        for context_type in CONTEXT_FILES:
+            try:
+                stat = os.stat(self.location(context_type))
+            except OSError:
+                continue
+            signatures[context_type] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+    
+    def read(self, context_type: str) -> Tuple[str, float]:
+        """Document content and last-updated timestamp"""
+        path = self.location(context_type)
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read(), os.path.getmtime(path)
+    
+    def write(self, context_type: str, content: str):
+        path = self.location(context_type)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
 
 class StrategicContextManager:
-    """Manages company context for strategic AI responses"""
+    """Manages company context for strategic AI responses
     
-    def __init__(self, context_path: str = None):
-        self.context_path = context_path or "/Users/ssaper/Desktop/my-projects/pm33-claude-execution/strategy/context"
+    Documents come from a source (files under context_path by default).
+    context_cache is replaced wholesale (never mutated in place) whenever
+    files change, so readers holding a reference always see one consistent
+    snapshot. watch() polls the files and reloads only those that changed.
+    Each entry carries its section chunks; the BM25 index over them is
+    rebuilt on every swap (reusing chunks of unchanged files). In vector
+    mode the chunks are also embedded, recomputing only changed sections.
+    """
+    
+    def __init__(self, context_path: str = None, retrieval: str = CONTEXT_RETRIEVAL, embedder=None,
+                 source=None, vector_dir: str = None):
+        self.context_path = context_path or DEFAULT_CONTEXT_PATH
+        self.source = source or FileContextSource(self.context_path)
         self.context_cache = {}
+        self.index = BM25Index(())
+        self.vectors = None
+        if retrieval == "vector":
+            # numpy is only needed in vector mode
+            from context_vectors import VectorIndex
+            self.vectors = VectorIndex(vector_dir or CONTEXT_VECTOR_DIR or os.path.join(self.context_path, ".vectors"), embedder)
+        self.version = 0  # Bumped on every cache swap
+        self._signatures: Dict[str, Any] = {}  # context type -> source change marker
+        self._listeners: List[ContextListener] = []
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
         self.load_all_context()
     
     def load_all_context(self):
         """Load all context files into memory"""
-        context_files = {
-            'company_profile': 'company/company-profile.md',
-            'business_model': 'company/business-model.md',
-            'ideal_customer_profile': 'gtm/ideal-customer-profile.md',
-            'customer_segments': 'gtm/customer-segments.md',
-            'current_priorities': 'operations/current-priorities.md',
-            'team_structure': 'operations/team-structure.md',
-            'direct_competitors': 'competitive/direct-competitors.md',
-            'competitive_advantages': 'competitive/competitive-advantages.md',
-            'product_strategy': 'product/product-strategy.md',
-            'financial_position': 'financial/financial-position.md'
-        }
+        self.refresh(force=True)
+    
+    def refresh(self, force: bool = False) -> Dict[str, List[str]]:
+        """Reload and re-summarize only the documents whose change marker and content hash changed
+        
+        Returns the context types that changed and were removed.
+        """
+        with self._lock:
+            cache = dict(self.context_cache)
+            signatures = dict(self._signatures)
+            changed, removed = [], []
+            current = self.source.signatures()
+            
+            for context_key in CONTEXT_FILES:
+                signature = current.get(context_key)
+                if signature is None:
+                    if cache.pop(context_key, None) is not None:
+                        removed.append(context_key)
+                    signatures.pop(context_key, None)
+                    continue
+                
+                if not force and signatures.get(context_key) == signature:
+                    continue
+                
+                try:
+                    content, last_updated = self.source.read(context_key)
+                except Exception as e:
+                    print(f"Error loading context {self.source.location(context_key)}: {e}")
+                    continue
+                
+                signatures[context_key] = signature
+                content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+                previous = cache.get(context_key)
+                if previous is not None and previous['content_hash'] == content_hash:
+                    # Touched but not edited; keep the existing summary
+                    continue
+                
+                cache[context_key] = self._cache_entry(
+                    context_key, content, self.source.location(context_key), last_updated, content_hash
+                )
+                changed.append(context_key)
+            
+            # Publish the new snapshot in one assignment; summaries and chunks travel with their content
+            self._signatures = signatures
+            if changed or removed:
+                self.index = BM25Index.from_files({key: entry['chunks'] for key, entry in cache.items()})
+                if self.vectors is not None:
+                    self.vectors.sync(self.index.chunks)
+                self.context_cache = cache
+                self.version += 1
         
-        for context_key, file_path in context_files.items():
-            full_path = os.path.join(self.context_path, file_path)
-            if os.path.exists(full_path):
+        if changed or removed:
+            self._notify(changed, removed)
+        return {'changed': changed, 'removed': removed}
+    
+    def watch(self, interval: float = CONTEXT_POLL_INTERVAL):
+        """Poll the context files in a background thread and reload edited ones"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        
+        def poll():
+            while not self._stop_watching.wait(interval):
                 try:
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        self.context_cache[context_key] = {
-                            'content': content,
-                            'file_path': full_path,
-                            'last_updated': os.path.getmtime(full_path),
-                            'summary': self._extract_summary(content)
-                        }
+                    result = self.refresh()
+                    if result['changed'] or result['removed']:
+                        print(f"🔄 Reloaded context: {', '.join(result['changed'] + result['removed'])}")
                 except Exception as e:
-                    print(f"Error loading context file {full_path}: {e}")
+                    print(f"⚠️ Context refresh failed: {e}")
+        
+        self._watcher = threading.Thread(target=poll, name="context-watcher", daemon=True)
+        self._watcher.start()
+    
+    def stop_watching(self):
+        """Stop the background watcher, if running"""
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+    
+    def add_listener(self, listener: ContextListener):
+        """Call listener(changed, removed) after each cache swap, e.g. to update a derived index"""
+        self._listeners.append(listener)
+    
+    def _cache_entry(self, context_key: str, content: str, location: str, last_updated: float,
+                     content_hash: str) -> Dict[str, Any]:
+        key = (context_key, content_hash)
+        with _parsed_context_lock:
+            parsed = _parsed_context.get(key)
+            if parsed is not None:
+                _parsed_context.move_to_end(key)
+        if parsed is None:
+            # Summaries and chunks are immutable, so tenants with the same document share them
+            parsed = (self._extract_summary(content), chunk_markdown(context_key, content))
+            with _parsed_context_lock:
+                _parsed_context[key] = parsed
+                while len(_parsed_context) > PARSED_CONTEXT_CACHE_SIZE:
+                    _parsed_context.popitem(last=False)
+        
+        return {
+            'content': content,
+            'file_path': location,
+            'last_updated': last_updated,
+            'content_hash': content_hash,
+            'summary': parsed[0],
+            'chunks': parsed[1]
+        }
+    
+    def _notify(self, changed: List[str], removed: List[str]):
+        for listener in list(self._listeners):
+            try:
+                listener(changed, removed)
+            except Exception as e:
+                print(f"⚠️ Context listener failed: {e}")
     
     def _extract_summary(self, content: str) -> str:
         """Extract key summary points from markdown content"""
@@ -62,75 +244,66 @@ class StrategicContextManager:
         
         return '\n'.join(summary_points[:10])  # Top 10 summary points
     
-    def get_relevant_context(self, query: str, context_types: List[str] = None) -> str:
-        """Get context relevant to a strategic query"""
-        if context_types is None:
-            context_types = self._identify_relevant_context_types(query)
-        
-        relevant_context = []
-        
-        for context_type in context_types:
-            if context_type in self.context_cache:
-                context_data = self.context_cache[context_type]
-                relevant_context.append(f"## {context_type.replace('_', ' ').title()}")
-                relevant_context.append(context_data['summary'])
-                relevant_context.append("")
-        
-        return '\n'.join(relevant_context)
+    def get_relevant_context(self, query: str, context_types: List[str] = None,
+                             max_tokens: int = CONTEXT_MAX_TOKENS) -> str:
+        """Get the most relevant, freshest context sections for a strategic query, within max_tokens"""
+        return self.assemble_context(query, context_types, max_tokens).text
     
-    def _identify_relevant_context_types(self, query: str) -> List[str]:
-        """Identify what context types are relevant for a query"""
-        query_lower = query.lower()
-        relevant_types = []
+    def assemble_context(self, query: str, context_types: List[str] = None,
+                         max_tokens: int = CONTEXT_MAX_TOKENS) -> AssembledContext:
+        """Rank sections by relevance (BM25 or vectors) and document freshness and pack them into max_tokens"""
+        cache = self.context_cache  # One snapshot for the whole answer
+        if self.vectors is not None:
+            ranked = self.vectors.score(query, context_types)
+        else:
+            ranked = self.index.score(query, context_types)
         
-        # Keyword-based context matching
-        context_keywords = {
-            'company_profile': ['company', 'mission', 'vision', 'values', 'business model'],
-            'ideal_customer_profile': ['customer', 'user', 'target', 'market', 'audience', 'icp'],
-            'current_priorities': ['priority', 'goals', 'objectives', 'focus', 'timeline', 'deadline'],
-            'direct_competitors': ['competitor', 'competition', 'competitive', 'market', 'rival'],
-            'product_strategy': ['product', 'feature', 'roadmap', 'development', 'technology'],
-            'financial_position': ['budget', 'funding', 'revenue', 'cost', 'money', 'financial'],
-            'team_structure': ['team', 'hiring', 'resources', 'people', 'capacity']
-        }
-        
-        for context_type, keywords in context_keywords.items():
-            if any(keyword in query_lower for keyword in keywords):
-                relevant_types.append(context_type)
+        if ranked:
+            top = ranked[0][1]
+            scored = [(chunk, score / top) for chunk, score in ranked]
+        else:
+            # Nothing in the query matches; lead with the core documents, earliest sections first
+            scored = [
+                (chunk, 1.0 / (1 + chunk.position))
+                for context_type in (context_types or DEFAULT_CONTEXT_TYPES) if context_type in cache
+                for chunk in cache[context_type]['chunks']
+            ]
         
-        # Always include company profile and current priorities for strategic context
-        if 'company_profile' not in relevant_types:
-            relevant_types.insert(0, 'company_profile')
-        if 'current_priorities' not in relevant_types:
-            relevant_types.append('current_priorities')
-        
-        return relevant_types
+        candidates = [
+            ContextCandidate(chunk, relevance, cache[chunk.context_type]['last_updated'] if chunk.context_type in cache else None)
+            for chunk, relevance in scored
+        ]
+        return assemble(candidates, max_tokens, type_order=list(CONTEXT_FILES))
     
     def get_context_summary(self) -> Dict[str, Any]:
         """Get summary of available context"""
+        cache = self.context_cache
         summary = {
-            'total_context_files': len(self.context_cache),
-            'context_categories': list(self.context_cache.keys()),
-            'last_updated': max([ctx['last_updated'] for ctx in self.context_cache.values()]) if self.context_cache else None,
-            'context_health': self._assess_context_health()
+            'total_context_files': len(cache),
+            'context_categories': list(cache.keys()),
+            'last_updated': max([ctx['last_updated'] for ctx in cache.values()]) if cache else None,
+            'context_version': self.version,
+            'index': self.index.stats(),
+            'vectors': self.vectors.stats() if self.vectors is not None else None,
+            'context_health': self._assess_context_health(cache)
         }
         return summary
     
-    def _assess_context_health(self) -> Dict[str, Any]:
+    def _assess_context_health(self, cache: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Assess completeness and freshness of context"""
         required_contexts = [
             'company_profile', 'ideal_customer_profile', 
             'current_priorities', 'direct_competitors'
         ]
         
-        missing_contexts = [ctx for ctx in required_contexts if ctx not in self.context_cache]
+        missing_contexts = [ctx for ctx in required_contexts if ctx not in cache]
         
         # Check freshness (context older than 7 days is stale)
         stale_threshold = 7 * 24 * 60 * 60  # 7 days in seconds
         current_time = datetime.now().timestamp()
         
         stale_contexts = []
-        for ctx_name, ctx_data in self.context_cache.items():
+        for ctx_name, ctx_data in cache.items():
             if current_time - ctx_data['last_updated'] > stale_threshold:
                 stale_contexts.append(ctx_name)
         
@@ -138,26 +311,21 @@ class StrategicContextManager:
             'completeness_score': (len(required_contexts) - len(missing_contexts)) / len(required_contexts),
             'missing_contexts': missing_contexts,
             'stale_contexts': stale_contexts,
-            'total_contexts_loaded': len(self.context_cache)
+            'total_contexts_loaded': len(cache)
         }
     
     def update_context(self, context_type: str, content: str) -> bool:
-        """Update specific context content"""
-        if context_type not in self.context_cache:
+        """Update (or create) specific context content"""
+        if context_type not in CONTEXT_FILES:
             return False
         
-        file_path = self.context_cache[context_type]['file_path']
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self.source.write(context_type, content)
             
-            # Refresh cache
-            self.context_cache[context_type] = {
-                'content': content,
-                'file_path': file_path,
-                'last_updated': datetime.now().timestamp(),
-                'summary': self._extract_summary(content)
-            }
+            # Reload through the normal path (coarse mtimes may hide a same-size rewrite)
+            with self._lock:
+                self._signatures.pop(context_type, None)
+            self.refresh()
             return True
         except Exception as e:
             print(f"Error updating context {context_type}: {e}")
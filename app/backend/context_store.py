@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+PM33 Tenant Context Store
+Per-tenant StrategicContextManagers, loaded on first use and bounded by an LRU
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from context_manager import (
+    CONTEXT_FILES, CONTEXT_POLL_INTERVAL, CONTEXT_RETRIEVAL, DEFAULT_CONTEXT_PATH, StrategicContextManager
+)
+
+# "filesystem" (one directory per tenant) or "database" (context_documents table)
+CONTEXT_BACKEND = os.getenv("PM33_CONTEXT_BACKEND", "filesystem")
+# Filesystem backend: <root>/<tenant_id>/company/company-profile.md, ...
+CONTEXT_TENANT_ROOT = os.getenv("PM33_CONTEXT_TENANT_ROOT", str(Path(DEFAULT_CONTEXT_PATH).parent / "tenants"))
+CONTEXT_MAX_TENANTS = int(os.getenv("PM33_CONTEXT_MAX_TENANTS", "256"))
+# Pick up documents edited outside update_context (by hand, or DB rows written by another
+# process): a tenant's sources are re-checked on access, at most every CONTEXT_POLL_INTERVAL seconds
+CONTEXT_WATCH = os.getenv("PM33_CONTEXT_WATCH", "").lower() in ("1", "true", "yes")
+
+# Served from DEFAULT_CONTEXT_PATH by the filesystem backend (the original single-company context)
+DEFAULT_TENANT = "default"
+
+_TENANT_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def validate_tenant_id(tenant_id: str) -> str:
+    """Tenant ids become directory names and keys, so only allow a safe alphabet"""
+    if not isinstance(tenant_id, str) or not _TENANT_ID_RE.match(tenant_id):
+        raise ValueError(f"Invalid tenant id: {tenant_id!r}")
+    return tenant_id
+
+
+class DatabaseContextSource:
+    """A tenant's context documents stored in the context_documents table
+
+    Uses the synchronous session factory, like the context manager itself;
+    call from a worker thread inside async code.
+    """
+
+    def __init__(self, tenant_id: str, session_factory: Optional[Callable[[], Any]] = None):
+        from models.context_document import ContextDocument
+        if session_factory is None:
+            from utils.sync_database import SessionLocal as session_factory
+
+        self.tenant_id = tenant_id
+        self._model = ContextDocument
+        self._session_factory = session_factory
+
+    def location(self, context_type: str) -> str:
+        return f"db://context_documents/{self.tenant_id}/{context_type}"
+
+    def signatures(self) -> Dict[str, Any]:
+        """updated_at and length per document, in one query"""
+        from sqlalchemy import func, select
+
+        model = self._model
+        with self._session_factory() as db:
+            rows = db.execute(
+                select(model.context_type, model.updated_at, func.length(model.content))
+                .where(model.tenant_id == self.tenant_id)
+            ).all()
+        return {context_type: (str(updated_at), length) for context_type, updated_at, length in rows}
+
+    def read(self, context_type: str) -> Tuple[str, float]:
+        from sqlalchemy import select
+
+        model = self._model
+        with self._session_factory() as db:
+            document = db.execute(
+                select(model).where(model.tenant_id == self.tenant_id, model.context_type == context_type)
+            ).scalar_one()
+            updated_at = document.updated_at or document.created_at
+            return document.content, updated_at.timestamp() if updated_at else 0.0
+
+    def write(self, context_type: str, content: str):
+        from sqlalchemy import select
+
+        model = self._model
+        with self._session_factory() as db:
+            document = db.execute(
+                select(model).where(model.tenant_id == self.tenant_id, model.context_type == context_type)
+            ).scalar_one_or_none()
+            if document is None:
+                db.add(model(tenant_id=self.tenant_id, context_type=context_type, content=content))
+            else:
+                document.content = content
+            db.commit()
+
+
+class TenantContextStore:
+    """LRU of per-tenant context managers
+
+    A tenant's context is loaded the first time it is asked for; the least
+    recently used tenants are dropped past max_tenants. Parsed summaries and
+    chunks are shared across tenants with identical documents (see
+    context_manager), so the LRU bounds per-tenant state, not shared content.
+
+    With watch enabled, get() refreshes a tenant whose documents were last
+    checked more than poll_interval seconds ago (no thread per tenant).
+    """
+
+    def __init__(self, backend: str = CONTEXT_BACKEND, root: str = CONTEXT_TENANT_ROOT,
+                 max_tenants: int = CONTEXT_MAX_TENANTS, retrieval: str = CONTEXT_RETRIEVAL,
+                 session_factory: Optional[Callable[[], Any]] = None, watch: bool = CONTEXT_WATCH,
+                 poll_interval: float = CONTEXT_POLL_INTERVAL):
+        if backend not in ("filesystem", "database"):
+            raise ValueError(f"Unknown context backend: {backend}")
+        self.backend = backend
+        self.root = root
+        self.max_tenants = max_tenants
+        self.retrieval = retrieval
+        self.session_factory = session_factory
+        self.watch = watch
+        self.poll_interval = poll_interval
+        self._checked_at: Dict[str, float] = {}  # tenant -> monotonic time of its last refresh check
+        self._managers: "OrderedDict[str, StrategicContextManager]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self.counters = {"hits": 0, "loads": 0, "evictions": 0, "refreshes": 0}
+
+    def get(self, tenant_id: str) -> StrategicContextManager:
+        """The tenant's context manager, loading it on first use"""
+        validate_tenant_id(tenant_id)
+        with self._lock:
+            manager = self._managers.get(tenant_id)
+            if manager is not None:
+                self._managers.move_to_end(tenant_id)
+                self.counters["hits"] += 1
+            else:
+                loading = self._loading.setdefault(tenant_id, threading.Lock())
+        if manager is not None:
+            self._refresh_if_due(tenant_id, manager)
+            return manager
+
+        # One load per tenant; concurrent first requests wait for it
+        with loading:
+            with self._lock:
+                manager = self._managers.get(tenant_id)
+                if manager is not None:
+                    self._managers.move_to_end(tenant_id)
+                    self.counters["hits"] += 1
+                    return manager
+
+            try:
+                manager = self._load(tenant_id)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(tenant_id, None)
+                raise
+
+            with self._lock:
+                self._managers[tenant_id] = manager
+                self._loading.pop(tenant_id, None)
+                self._checked_at[tenant_id] = time.monotonic()
+                self.counters["loads"] += 1
+                evicted = []
+                while len(self._managers) > self.max_tenants:
+                    evicted_id, evicted_manager = self._managers.popitem(last=False)
+                    self._checked_at.pop(evicted_id, None)
+                    evicted.append(evicted_manager)
+                    self.counters["evictions"] += 1
+        for old in evicted:
+            old.stop_watching()
+        return manager
+
+    def invalidate(self, tenant_id: str):
+        """Drop a tenant's loaded context; the next get() reloads it"""
+        with self._lock:
+            manager = self._managers.pop(tenant_id, None)
+            self._checked_at.pop(tenant_id, None)
+        if manager is not None:
+            manager.stop_watching()
+
+    def update(self, tenant_id: str, context_type: str, content: str) -> bool:
+        """Write one of a tenant's context documents and reload it"""
+        if context_type not in CONTEXT_FILES:
+            return False
+        return self.get(tenant_id).update_context(context_type, content)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "backend": self.backend,
+            "watch": self.watch,
+            "tenants_loaded": len(self._managers),
+            "max_tenants": self.max_tenants,
+        }
+
+    def _refresh_if_due(self, tenant_id: str, manager: StrategicContextManager):
+        """Reload a tenant's edited documents when watching and its last check is poll_interval old"""
+        if not self.watch:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at.get(tenant_id, 0.0) < self.poll_interval:
+                return
+            self._checked_at[tenant_id] = now
+
+        try:
+            result = manager.refresh()
+        except Exception as e:
+            # Keep serving the loaded snapshot; the next check retries
+            print(f"⚠️ Context refresh failed for tenant {tenant_id}: {e}")
+            return
+        if result["changed"] or result["removed"]:
+            with self._lock:
+                self.counters["refreshes"] += 1
+            print(f"🔄 Reloaded context for tenant {tenant_id}: {', '.join(result['changed'] + result['removed'])}")
+
+    def _load(self, tenant_id: str) -> StrategicContextManager:
+        if self.backend == "database":
+            vector_root = Path(self.root) / ".vectors"
+            return StrategicContextManager(
+                context_path=str(Path(self.root) / tenant_id),
+                retrieval=self.retrieval,
+                source=DatabaseContextSource(tenant_id, self.session_factory),
+                vector_dir=str(vector_root / tenant_id),
+            )
+
+        context_path = DEFAULT_CONTEXT_PATH if tenant_id == DEFAULT_TENANT else os.path.join(self.root, tenant_id)
+        return StrategicContextManager(context_path=context_path, retrieval=self.retrieval)
+
+
+tenant_contexts = TenantContextStore()
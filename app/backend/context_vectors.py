@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+PM33 Context Vectors
+Embedding index over context chunks, persisted as a memory-mapped matrix next to its manifest
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from context_index import ContextChunk, tokenize
+
+EMBEDDING_DIM = int(os.getenv("PM33_EMBEDDING_DIM", "384"))
+VECTOR_MIN_SCORE = float(os.getenv("PM33_VECTOR_MIN_SCORE", "0.1"))  # Cosine similarity
+
+VECTORS_FILE = "vectors.f32"
+MANIFEST_FILE = "manifest.json"
+
+
+class Embedder(Protocol):
+    """Anything that turns texts into rows of an (n, dim) float32 matrix"""
+
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+class HashingEmbedder:
+    """Offline default: signed feature hashing of index terms and adjacent term pairs
+
+    Deterministic across processes (no Python hash()), so persisted vectors
+    stay valid after a restart. Captures lexical overlap with stemming; swap
+    in a model-backed Embedder for real semantic similarity.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            terms = tokenize(text)
+            features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+            for feature in features:
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dim
+                matrix[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+        return _normalize(matrix)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def chunk_text(chunk: ContextChunk) -> str:
+    """Text embedded for a chunk (file name and heading included, as in the BM25 index)"""
+    return f"{chunk.context_type.replace('_', ' ')}\n{chunk.heading}\n{chunk.text}"
+
+
+def chunk_hash(chunk: ContextChunk) -> str:
+    """Content key of a chunk; moving a section within a file keeps its vector"""
+    return hashlib.sha256(chunk_text(chunk).encode("utf-8")).hexdigest()[:24]
+
+
+class VectorIndex:
+    """Flat (exact) cosine search over chunk embeddings stored in a memory-mapped file
+
+    sync() embeds only chunks whose content is new, copies the rest from the
+    existing file, and replaces the file atomically. A restarted process
+    reopens the file without embedding anything.
+    """
+
+    def __init__(self, directory: Path, embedder: Optional[Embedder] = None):
+        self.directory = Path(directory)
+        self.embedder = embedder or HashingEmbedder()
+        self._lock = threading.Lock()
+        # (chunks, vectors, content hash of each row) replaced together on sync
+        self._state: Tuple[Tuple[ContextChunk, ...], np.ndarray, Tuple[str, ...]] = (
+            (), np.zeros((0, self.embedder.dim), dtype=np.float32), ()
+        )
+        self.counters = {"embedded": 0, "reused": 0, "syncs": 0}
+        self._open()
+
+    def sync(self, chunks: Iterable[ContextChunk]) -> Dict[str, int]:
+        """Make the index hold exactly these chunks; returns how many were embedded and reused"""
+        chunks = tuple(chunks)
+        with self._lock:
+            _, old_vectors, old_hashes = self._state
+            hashes = tuple(chunk_hash(chunk) for chunk in chunks)
+            if hashes == old_hashes:
+                # Same content in the same order; only refresh chunk metadata
+                self._state = (chunks, old_vectors, hashes)
+                self.counters["reused"] += len(chunks)
+                self.counters["syncs"] += 1
+                return {"embedded": 0, "reused": len(chunks)}
+
+            old_rows = {h: i for i, h in enumerate(old_hashes)}
+            missing = [i for i, h in enumerate(hashes) if h not in old_rows]
+            vectors = np.zeros((len(chunks), self.embedder.dim), dtype=np.float32)
+            for i, h in enumerate(hashes):
+                if h in old_rows:
+                    vectors[i] = old_vectors[old_rows[h]]
+            if missing:
+                embedded = self.embedder.embed([chunk_text(chunks[i]) for i in missing])
+                vectors[missing] = _normalize(np.asarray(embedded, dtype=np.float32))
+
+            self._state = (chunks, self._persist(vectors, hashes), hashes)
+            result = {"embedded": len(missing), "reused": len(chunks) - len(missing)}
+            self.counters["embedded"] += result["embedded"]
+            self.counters["reused"] += result["reused"]
+            self.counters["syncs"] += 1
+            return result
+
+    def score(self, query: str, context_types: Optional[Iterable[str]] = None,
+              top_k: Optional[int] = None, min_score: float = VECTOR_MIN_SCORE) -> List[Tuple[ContextChunk, float]]:
+        """Chunks by cosine similarity to the query, best first"""
+        chunks, vectors, _ = self._state
+        if not chunks:
+            return []
+        query_vector = _normalize(np.asarray(self.embedder.embed([query]), dtype=np.float32))[0]
+        similarities = vectors @ query_vector
+
+        if context_types is not None:
+            allowed = set(context_types)
+            mask = np.fromiter((chunk.context_type in allowed for chunk in chunks), dtype=bool, count=len(chunks))
+            similarities = np.where(mask, similarities, -np.inf)
+
+        if top_k is not None and top_k < len(chunks):
+            candidates = np.argpartition(-similarities, top_k)[:top_k]
+        else:
+            candidates = np.arange(len(chunks))
+        ranked = candidates[np.argsort(-similarities[candidates], kind="stable")]
+        return [(chunks[i], float(similarities[i])) for i in ranked if similarities[i] >= min_score]
+
+    def stats(self) -> Dict[str, Any]:
+        chunks, vectors, _ = self._state
+        return {
+            **self.counters,
+            "chunks": len(chunks),
+            "dim": self.embedder.dim,
+            "embedder": self.embedder.name,
+            "bytes": int(vectors.nbytes),
+        }
+
+    def _open(self):
+        """Reopen persisted vectors written by the same embedder (chunks arrive with the next sync)"""
+        try:
+            manifest = json.loads((self.directory / MANIFEST_FILE).read_text(encoding="utf-8"))
+            if manifest["embedder"] != self.embedder.name or manifest["dim"] != self.embedder.dim:
+                return
+            hashes = manifest["hashes"]
+            if not hashes:
+                return
+            # A crash between the two renames leaves a manifest that doesn't match the matrix
+            if (self.directory / VECTORS_FILE).stat().st_size != len(hashes) * self.embedder.dim * 4:
+                return
+            vectors = np.memmap(self.directory / VECTORS_FILE, dtype=np.float32, mode="r",
+                                shape=(len(hashes), self.embedder.dim))
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"⚠️ Ignoring unreadable context vectors in {self.directory}: {e}")
+            return
+        # No chunk objects yet, so nothing is searchable until sync(); rows are reused by hash
+        self._state = ((), vectors, tuple(hashes))
+
+    def _persist(self, vectors: np.ndarray, hashes: Tuple[str, ...]) -> np.ndarray:
+        """Write vectors and manifest atomically and return a read-only memmap of them"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            vectors_tmp = self.directory / f"{VECTORS_FILE}.tmp"
+            manifest_tmp = self.directory / f"{MANIFEST_FILE}.tmp"
+            vectors.tofile(vectors_tmp)
+            manifest_tmp.write_text(json.dumps({
+                "embedder": self.embedder.name,
+                "dim": self.embedder.dim,
+                "hashes": list(hashes),
+            }), encoding="utf-8")
+            os.replace(vectors_tmp, self.directory / VECTORS_FILE)
+            os.replace(manifest_tmp, self.directory / MANIFEST_FILE)
+        except OSError as e:
+            # Still searchable from memory; only the restart cache is lost
+            print(f"⚠️ Could not persist context vectors to {self.directory}: {e}")
+            return vectors
+        if not hashes:
+            return vectors
+        return np.memmap(self.directory / VECTORS_FILE, dtype=np.float32, mode="r", shape=vectors.shape)
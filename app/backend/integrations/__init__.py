@@ -0,0 +1,50 @@
+"""External PM tool sync (Jira, Linear) for strategic workflows."""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from .http import RetryingHTTPClient, SyncError
+from .state import SyncState, SyncedItem
+from .jira import JiraSync
+from .linear import LinearSync
+
+SYNC_TOOLS = {"jira": JiraSync, "linear": LinearSync}
+
+
+async def sync_workflow(workflow, integration_config: Dict[str, Any],
+                        previous_state: Optional[Dict[str, Dict[str, Any]]] = None,
+                        transports: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Sync workflow to every enabled tool concurrently; returns per-tool results.
+
+    Each result includes ``state``; pass the results' states back as
+    previous_state ({tool: state}) to push only what changed on the next sync.
+    """
+    previous_state = previous_state or {}
+    transports = transports or {}
+    enabled = [tool for tool in SYNC_TOOLS if integration_config.get(f"{tool}_enabled")]
+
+    async def run(tool: str) -> Dict[str, Any]:
+        try:
+            syncer = SYNC_TOOLS[tool].from_config(integration_config, transport=transports.get(tool))
+        except SyncError as e:
+            return {"error": str(e)}
+        try:
+            return await syncer.sync(workflow, SyncState.from_dict(previous_state.get(tool), tool))
+        except SyncError as e:
+            return {"error": str(e), "status_code": e.status_code}
+        finally:
+            await syncer.aclose()
+
+    results = await asyncio.gather(*(run(tool) for tool in enabled))
+    return dict(zip(enabled, results))
+
+
+__all__ = [
+    "RetryingHTTPClient",
+    "SyncError",
+    "SyncState",
+    "SyncedItem",
+    "JiraSync",
+    "LinearSync",
+    "sync_workflow",
+]
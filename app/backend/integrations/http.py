@@ -0,0 +1,159 @@
+"""Retrying, concurrency-bounded HTTP client shared by the PM tool integrations."""
+
+import asyncio
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Safe to send again after an ambiguous failure (the server may have applied the first one)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Failures where the request never reached the server
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Attempts of a create that looks up its marker before each re-send
+CREATE_ATTEMPTS = 3
+
+T = TypeVar("T")
+
+
+class SyncError(Exception):
+    """A PM tool request failed after retries (or returned a non-retryable error)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: str = ""):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+    @property
+    def may_have_succeeded(self) -> bool:
+        """Whether the server may have applied the request anyway (5xx or a lost response)."""
+        return self.status_code is None or self.status_code >= 500
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Delay requested by a 429/503 Retry-After header (seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryingHTTPClient:
+    """httpx.AsyncClient with bounded concurrency and retry/backoff on 429 and 5xx.
+
+    Non-idempotent methods (POST, PATCH) are only retried when the server
+    cannot have acted on them: 429, 503 with Retry-After, or a connection
+    that was never established. Pass ``idempotent=True`` for requests that
+    are safe to repeat anyway (e.g. read-only GraphQL queries).
+
+    ``transport`` can be an ``httpx.MockTransport`` (or any local server's base
+    URL can be used) so integrations are testable without the real service.
+    """
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None, auth: Any = None,
+                 max_concurrency: int = 4, max_retries: int = 4, backoff: float = 0.5,
+                 max_backoff: float = 30.0, timeout: float = 30.0, transport: Any = None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url, headers=headers, auth=auth, timeout=timeout, transport=transport
+        )
+        self.counters = {"requests": 0, "retries": 0, "rate_limited": 0}
+
+    async def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> httpx.Response:
+        """Send a request, retrying transient failures; raises SyncError when it gives up."""
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            error = None
+            async with self._semaphore:
+                self.counters["requests"] += 1
+                try:
+                    response = await self._client.request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    response = None
+                    error = e
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                if response.is_error:
+                    raise SyncError(
+                        f"{method} {url} failed with {response.status_code}",
+                        status_code=response.status_code,
+                        body=response.text[:500],
+                    )
+                return response
+
+            if attempt >= self.max_retries or not (idempotent or self._not_applied(response, error)):
+                if response is None:
+                    raise SyncError(f"{method} {url} failed: {error}") from error
+                raise SyncError(
+                    f"{method} {url} failed with {response.status_code} after {attempt + 1} attempts",
+                    status_code=response.status_code,
+                    body=response.text[:500],
+                )
+
+            delay = None
+            if response is not None:
+                if response.status_code == 429:
+                    self.counters["rate_limited"] += 1
+                delay = retry_after_seconds(response)
+            if delay is None:
+                # Exponential backoff with full jitter
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+            attempt += 1
+            self.counters["retries"] += 1
+            await asyncio.sleep(min(delay, self.max_backoff))
+
+    @staticmethod
+    def _not_applied(response: Optional[httpx.Response], error: Optional[Exception]) -> bool:
+        """Whether a failed request was certainly not acted on, so even a POST can be re-sent."""
+        if response is None:
+            return isinstance(error, NOT_SENT_ERRORS)
+        if response.status_code == 429:
+            return True
+        return response.status_code == 503 and "Retry-After" in response.headers
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "RetryingHTTPClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+async def create_once(create: Callable[[], Awaitable[T]], find: Callable[[], Awaitable[Optional[T]]],
+                      attempts: int = CREATE_ATTEMPTS) -> T:
+    """Run a non-idempotent create, re-sending it only after ``find`` shows the last try created nothing.
+
+    ``find`` looks the item up by a stable marker sent with the create (a
+    label or client-chosen id), so a create whose response was lost is
+    picked up instead of duplicated.
+    """
+    for attempt in range(attempts):
+        try:
+            return await create()
+        except SyncError as e:
+            if not e.may_have_succeeded or attempt + 1 >= attempts:
+                raise
+        existing = await find()
+        if existing is not None:
+            return existing
@@ -0,0 +1,187 @@
+"""Jira sync: one epic per workflow, stories created with the bulk issue endpoint."""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from .http import CREATE_ATTEMPTS, RetryingHTTPClient, SyncError, create_once
+from .state import SyncState, SyncedItem, fingerprint
+
+# Jira Cloud accepts at most 50 issues per bulk create request
+JIRA_BULK_LIMIT = 50
+
+
+def marker_label(item_id: str) -> str:
+    """Label set on created issues so a create whose response was lost can be found again."""
+    return f"pm33-{item_id}"
+
+
+class JiraSync:
+    """Pushes a StrategicWorkflow to a Jira project (REST API v2, plain-text descriptions)."""
+
+    tool = "jira"
+
+    def __init__(self, base_url: str, project_key: str, email: Optional[str] = None,
+                 api_token: Optional[str] = None, max_concurrency: int = 4, transport: Any = None):
+        self.project_key = project_key
+        self.client = RetryingHTTPClient(
+            base_url.rstrip("/"),
+            headers={"Accept": "application/json"},
+            auth=(email, api_token) if email and api_token else None,
+            max_concurrency=max_concurrency,
+            transport=transport,
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], transport: Any = None) -> "JiraSync":
+        """Build from integration_config, falling back to JIRA_* environment variables."""
+        base_url = config.get("jira_base_url") or os.getenv("JIRA_BASE_URL")
+        project_key = config.get("jira_project_key") or os.getenv("JIRA_PROJECT_KEY")
+        if not base_url or not project_key:
+            raise SyncError("Jira sync needs jira_base_url and jira_project_key")
+        return cls(
+            base_url,
+            project_key,
+            email=config.get("jira_email") or os.getenv("JIRA_EMAIL"),
+            api_token=config.get("jira_api_token") or os.getenv("JIRA_API_TOKEN"),
+            transport=transport,
+        )
+
+    def epic_fields(self, workflow) -> Dict[str, Any]:
+        return {
+            "summary": workflow.name,
+            "description": f"Strategic Objective: {workflow.strategic_objective}\n\n{workflow.description}",
+            "issuetype": {"name": "Epic"},
+            "project": {"key": self.project_key},
+        }
+
+    def story_fields(self, task, epic_key: str) -> Dict[str, Any]:
+        return {
+            "summary": task.title,
+            "description": f"Strategic Rationale: {task.strategic_rationale}\n\nSuccess Criteria: {task.success_criteria}\n\n{task.description}",
+            "issuetype": {"name": "Story"},
+            "project": {"key": self.project_key},
+            "priority": {"name": task.priority.value.title()},
+            "duedate": task.due_date.strftime("%Y-%m-%d"),
+            "parent": {"key": epic_key},
+        }
+
+    async def sync(self, workflow, state: Optional[SyncState] = None) -> Dict[str, Any]:
+        """Create or update the epic, bulk-create new stories and update changed ones."""
+        state = state or SyncState(tool=self.tool)
+        result = {"epic": None, "created": [], "updated": [], "unchanged": 0, "failed": []}
+
+        epic_fields = self.epic_fields(workflow)
+        if state.parent is None:
+            label = marker_label(workflow.id)
+
+            async def create_epic():
+                fields = {**epic_fields, "labels": [label]}
+                return (await self.client.request("POST", "/rest/api/2/issue", json={"fields": fields})).json()
+
+            async def find_epic():
+                return (await self._find_by_labels([label])).get(label)
+
+            created = await create_once(create_epic, find_epic)
+            state.parent = SyncedItem(key=created["key"], id=created.get("id"), fingerprint=fingerprint(epic_fields))
+        elif state.parent.fingerprint != fingerprint(epic_fields):
+            await self.client.request("PUT", f"/rest/api/2/issue/{state.parent.key}", json={"fields": epic_fields})
+            state.parent.fingerprint = fingerprint(epic_fields)
+        result["epic"] = state.parent.key
+
+        payloads = {task.id: self.story_fields(task, state.parent.key) for task in workflow.tasks}
+        to_create, to_update, unchanged = state.diff(payloads)
+        result["unchanged"] = len(unchanged)
+
+        for start in range(0, len(to_create), JIRA_BULK_LIMIT):
+            await self._bulk_create(to_create[start:start + JIRA_BULK_LIMIT], payloads, state, result)
+
+        outcomes = await asyncio.gather(
+            *(self._update(task_id, payloads[task_id], state) for task_id in to_update),
+            return_exceptions=True,
+        )
+        for task_id, outcome in zip(to_update, outcomes):
+            if isinstance(outcome, Exception):
+                result["failed"].append({"task_id": task_id, "error": str(outcome)})
+            else:
+                result["updated"].append(state.tasks[task_id].key)
+
+        result["removed"] = state.removed(payloads)
+        result["requests"] = self.client.counters["requests"]
+        result["state"] = state.to_dict()
+        return result
+
+    async def _bulk_create(self, task_ids: List[str], payloads: Dict[str, Dict], state: SyncState, result: Dict):
+        response, error = None, None
+        for attempt in range(CREATE_ATTEMPTS):
+            try:
+                response = await self.client.request(
+                    "POST", "/rest/api/2/issue/bulk",
+                    json={"issueUpdates": [
+                        {"fields": {**payloads[task_id], "labels": [marker_label(task_id)]}} for task_id in task_ids
+                    ]},
+                )
+                break
+            except SyncError as e:
+                error = e
+            if not error.may_have_succeeded or attempt + 1 >= CREATE_ATTEMPTS:
+                break
+
+            # The bulk request may have been applied; only re-send stories that don't exist yet
+            try:
+                existing = await self._find_by_labels([marker_label(task_id) for task_id in task_ids])
+            except SyncError as e:
+                error = e
+                break
+            for task_id in task_ids:
+                if marker_label(task_id) in existing:
+                    self._record_created(task_id, existing[marker_label(task_id)], payloads, state, result)
+            task_ids = [task_id for task_id in task_ids if marker_label(task_id) not in existing]
+            if not task_ids:
+                return
+
+        if response is None:
+            result["failed"].extend({"task_id": task_id, "error": str(error)} for task_id in task_ids)
+            return
+
+        body = response.json()
+        # Created issues come back in request order, skipping the failed elements
+        failed = {error.get("failedElementNumber"): error for error in body.get("errors", [])}
+        created = iter(body.get("issues", []))
+        for position, task_id in enumerate(task_ids):
+            if position in failed:
+                result["failed"].append({"task_id": task_id, "error": str(failed[position].get("elementErrors", ""))})
+                continue
+            issue = next(created, None)
+            if issue is None:
+                result["failed"].append({"task_id": task_id, "error": "missing from bulk response"})
+                continue
+            self._record_created(task_id, issue, payloads, state, result)
+
+    @staticmethod
+    def _record_created(task_id: str, issue: Dict[str, Any], payloads: Dict[str, Dict], state: SyncState, result: Dict):
+        state.tasks[task_id] = SyncedItem(key=issue["key"], id=issue.get("id"), fingerprint=fingerprint(payloads[task_id]))
+        result["created"].append(issue["key"])
+
+    async def _find_by_labels(self, labels: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Existing issues in the project carrying any of the marker labels, by label."""
+        quoted = ", ".join(f'"{label}"' for label in labels)
+        jql = f'project = "{self.project_key}" AND labels in ({quoted})'
+        response = await self.client.request(
+            "GET", "/rest/api/2/search", params={"jql": jql, "fields": "labels", "maxResults": len(labels)}
+        )
+        wanted = set(labels)
+        found = {}
+        for issue in response.json().get("issues", []):
+            for label in (issue.get("fields") or {}).get("labels", []):
+                if label in wanted:
+                    found[label] = issue
+        return found
+
+    async def _update(self, task_id: str, fields: Dict[str, Any], state: SyncState):
+        synced = state.tasks[task_id]
+        await self.client.request("PUT", f"/rest/api/2/issue/{synced.key}", json={"fields": fields})
+        synced.fingerprint = fingerprint(fields)
+
+    async def aclose(self):
+        await self.client.aclose()
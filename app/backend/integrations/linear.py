@@ -0,0 +1,199 @@
+"""Linear sync: a parent issue per workflow, task issues batched into one GraphQL request."""
+
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+from .http import CREATE_ATTEMPTS, RetryingHTTPClient, SyncError, create_once
+from .state import SyncState, SyncedItem, fingerprint
+
+LINEAR_API_URL = "https://api.linear.app"
+
+# Linear priority: 1 urgent, 2 high, 3 medium, 4 low
+LINEAR_PRIORITY = {"critical": 1, "high": 2, "medium": 3, "low": 4}
+
+# Aliased mutations per GraphQL request (keeps requests under Linear's complexity limit)
+LINEAR_BATCH_LIMIT = 25
+
+# Namespace of the client-chosen issue ids (Linear accepts an id on issueCreate)
+PM33_ISSUE_NAMESPACE = uuid.UUID("6f1c9d0e-6a43-5c1b-9a3e-2d7f4b8e0c51")
+
+
+class LinearSync:
+    """Pushes a StrategicWorkflow to a Linear team using aliased GraphQL mutations."""
+
+    tool = "linear"
+
+    def __init__(self, api_key: str, team_id: str, base_url: str = LINEAR_API_URL,
+                 max_concurrency: int = 2, transport: Any = None):
+        self.team_id = team_id
+        self.client = RetryingHTTPClient(
+            base_url,
+            headers={"Authorization": api_key, "Content-Type": "application/json"},
+            max_concurrency=max_concurrency,
+            transport=transport,
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], transport: Any = None) -> "LinearSync":
+        """Build from integration_config, falling back to LINEAR_* environment variables."""
+        api_key = config.get("linear_api_key") or os.getenv("LINEAR_API_KEY")
+        team_id = config.get("linear_team_id") or os.getenv("LINEAR_TEAM_ID")
+        if not api_key or not team_id:
+            raise SyncError("Linear sync needs linear_api_key and linear_team_id")
+        return cls(api_key, team_id, base_url=config.get("linear_base_url", LINEAR_API_URL), transport=transport)
+
+    def issue_uuid(self, item_id: str) -> str:
+        """Stable issue id for a workflow or task, so a create whose response was lost can be found again."""
+        return str(uuid.uuid5(PM33_ISSUE_NAMESPACE, f"{self.team_id}:{item_id}"))
+
+    def parent_input(self, workflow) -> Dict[str, Any]:
+        return {
+            "teamId": self.team_id,
+            "title": workflow.name,
+            "description": f"Strategic Objective: {workflow.strategic_objective}\n\n{workflow.description}",
+        }
+
+    def task_input(self, task, parent_id: str) -> Dict[str, Any]:
+        return {
+            "teamId": self.team_id,
+            "parentId": parent_id,
+            "title": task.title,
+            "description": f"**Strategic Rationale:** {task.strategic_rationale}\n\n**Success Criteria:** {task.success_criteria}\n\n{task.description}",
+            "priority": LINEAR_PRIORITY.get(task.priority.value, 3),
+            "dueDate": task.due_date.strftime("%Y-%m-%d"),
+        }
+
+    async def sync(self, workflow, state: Optional[SyncState] = None) -> Dict[str, Any]:
+        """Create or update the parent issue, then create/update changed tasks in batched mutations."""
+        state = state or SyncState(tool=self.tool)
+        result = {"parent": None, "created": [], "updated": [], "unchanged": 0, "failed": []}
+
+        parent_input = self.parent_input(workflow)
+        if state.parent is None:
+            parent_id = self.issue_uuid(workflow.id)
+
+            async def create_parent():
+                data = await self._mutate([("create", "p", {**parent_input, "id": parent_id}, None)])
+                issue = self._issue(data, "p")
+                if issue is None:
+                    # Answered by the API, so nothing was created
+                    raise SyncError(f"Linear parent issue creation failed: {data.get('_errors')}", status_code=400)
+                return issue
+
+            async def find_parent():
+                return (await self._find_issues([parent_id])).get(parent_id)
+
+            issue = await create_once(create_parent, find_parent)
+            state.parent = SyncedItem(key=issue["identifier"], id=issue["id"], fingerprint=fingerprint(parent_input))
+        elif state.parent.fingerprint != fingerprint(parent_input):
+            update = {key: value for key, value in parent_input.items() if key != "teamId"}
+            await self._mutate([("update", "p", update, state.parent.id)])
+            state.parent.fingerprint = fingerprint(parent_input)
+        result["parent"] = state.parent.key
+
+        payloads = {task.id: self.task_input(task, state.parent.id) for task in workflow.tasks}
+        to_create, to_update, unchanged = state.diff(payloads)
+        result["unchanged"] = len(unchanged)
+
+        # Creates and updates share requests: one aliased mutation per task
+        operations = [("create", task_id) for task_id in to_create] + [("update", task_id) for task_id in to_update]
+        for start in range(0, len(operations), LINEAR_BATCH_LIMIT):
+            await self._sync_batch(operations[start:start + LINEAR_BATCH_LIMIT], payloads, state, result)
+
+        result["removed"] = state.removed(payloads)
+        result["requests"] = self.client.counters["requests"]
+        result["state"] = state.to_dict()
+        return result
+
+    async def _sync_batch(self, batch: List[tuple], payloads: Dict[str, Dict], state: SyncState, result: Dict):
+        """Send one batch of (kind, task id) operations, re-sending only creates that didn't land."""
+        data, error = None, None
+        for attempt in range(CREATE_ATTEMPTS):
+            mutations = []
+            for position, (kind, task_id) in enumerate(batch):
+                payload = payloads[task_id]
+                if kind == "update":
+                    payload = {key: value for key, value in payload.items() if key != "teamId"}
+                    mutations.append((kind, f"t{position}", payload, state.tasks[task_id].id))
+                else:
+                    mutations.append((kind, f"t{position}", {**payload, "id": self.issue_uuid(task_id)}, None))
+
+            try:
+                data = await self._mutate(mutations)
+                break
+            except SyncError as e:
+                error = e
+            if not error.may_have_succeeded or attempt + 1 >= CREATE_ATTEMPTS:
+                break
+
+            # The batch may have been applied; updates are safe to repeat, existing creates are not
+            creates = [task_id for kind, task_id in batch if kind == "create"]
+            try:
+                existing = await self._find_issues([self.issue_uuid(task_id) for task_id in creates])
+            except SyncError as e:
+                error = e
+                break
+            for task_id in creates:
+                issue = existing.get(self.issue_uuid(task_id))
+                if issue is not None:
+                    state.tasks[task_id] = SyncedItem(key=issue["identifier"], id=issue["id"], fingerprint=fingerprint(payloads[task_id]))
+                    result["created"].append(issue["identifier"])
+            batch = [(kind, task_id) for kind, task_id in batch if kind == "update" or self.issue_uuid(task_id) not in existing]
+            if not batch:
+                return
+
+        if data is None:
+            result["failed"].extend({"task_id": task_id, "error": str(error)} for _, task_id in batch)
+            return
+
+        for position, (kind, task_id) in enumerate(batch):
+            issue = self._issue(data, f"t{position}")
+            if issue is None:
+                result["failed"].append({"task_id": task_id, "error": str(data.get("_errors", "mutation failed"))})
+                continue
+            state.tasks[task_id] = SyncedItem(key=issue["identifier"], id=issue["id"], fingerprint=fingerprint(payloads[task_id]))
+            result["created" if kind == "create" else "updated"].append(issue["identifier"])
+
+    async def _find_issues(self, issue_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Issues that already exist among the given client-chosen ids, by id."""
+        if not issue_ids:
+            return {}
+        query = "query FindIssues($ids: [ID!], $first: Int) { issues(filter: { id: { in: $ids } }, first: $first) { nodes { id identifier } } }"
+        response = await self.client.request(
+            "POST", "/graphql", idempotent=True,  # Read-only query
+            json={"query": query, "variables": {"ids": issue_ids, "first": len(issue_ids)}},
+        )
+        nodes = ((response.json().get("data") or {}).get("issues") or {}).get("nodes") or []
+        return {node["id"]: node for node in nodes}
+
+    async def _mutate(self, mutations: List[tuple]) -> Dict[str, Any]:
+        """Run (kind, alias, input, issue id) mutations as one aliased GraphQL document."""
+        declarations, fields, variables = [], [], {}
+        for kind, alias, payload, issue_id in mutations:
+            variables[f"{alias}_input"] = payload
+            if kind == "create":
+                declarations.append(f"${alias}_input: IssueCreateInput!")
+                fields.append(f"{alias}: issueCreate(input: ${alias}_input) {{ success issue {{ id identifier }} }}")
+            else:
+                variables[f"{alias}_id"] = issue_id
+                declarations.append(f"${alias}_id: String!, ${alias}_input: IssueUpdateInput!")
+                fields.append(f"{alias}: issueUpdate(id: ${alias}_id, input: ${alias}_input) {{ success issue {{ id identifier }} }}")
+
+        query = f"mutation SyncWorkflow({', '.join(declarations)}) {{ {' '.join(fields)} }}"
+        response = await self.client.request("POST", "/graphql", json={"query": query, "variables": variables})
+        body = response.json()
+        data = body.get("data") or {}
+        if body.get("errors"):
+            data["_errors"] = [error.get("message") for error in body["errors"]]
+        return data
+
+    @staticmethod
+    def _issue(data: Dict[str, Any], alias: str) -> Optional[Dict[str, Any]]:
+        payload = data.get(alias)
+        if not payload or not payload.get("success"):
+            return None
+        return payload.get("issue")
+
+    async def aclose(self):
+        await self.client.aclose()
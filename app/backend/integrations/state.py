@@ -0,0 +1,63 @@
+"""Sync state for diff-based resync of workflows to external PM tools."""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def fingerprint(payload: Dict[str, Any]) -> str:
+    """Stable hash of the fields pushed for one issue."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SyncedItem:
+    """One workflow item (the epic or a task) as last pushed to the tool."""
+
+    key: str
+    fingerprint: str
+    id: Optional[str] = None
+
+
+@dataclass
+class SyncState:
+    """What was pushed for a workflow: the parent (epic) and every task, keyed by task id."""
+
+    tool: str
+    parent: Optional[SyncedItem] = None
+    tasks: Dict[str, SyncedItem] = field(default_factory=dict)
+
+    def diff(self, payloads: Dict[str, Dict[str, Any]]) -> Tuple[List[str], List[str], List[str]]:
+        """Split task ids into (to create, to update, unchanged) against the last sync."""
+        create, update, unchanged = [], [], []
+        for task_id, payload in payloads.items():
+            synced = self.tasks.get(task_id)
+            if synced is None:
+                create.append(task_id)
+            elif synced.fingerprint != fingerprint(payload):
+                update.append(task_id)
+            else:
+                unchanged.append(task_id)
+        return create, update, unchanged
+
+    def removed(self, task_ids) -> List[str]:
+        """External keys of tasks that were synced before but are no longer in the workflow."""
+        return [item.key for task_id, item in self.tasks.items() if task_id not in task_ids]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tool": self.tool,
+            "parent": vars(self.parent) if self.parent else None,
+            "tasks": {task_id: vars(item) for task_id, item in self.tasks.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]], tool: str) -> "SyncState":
+        if not data:
+            return cls(tool=tool)
+        return cls(
+            tool=data.get("tool", tool),
+            parent=SyncedItem(**data["parent"]) if data.get("parent") else None,
+            tasks={task_id: SyncedItem(**item) for task_id, item in data.get("tasks", {}).items()},
+        )
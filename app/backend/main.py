@@ -14,6 +14,11 @@ from routes import strategic_chat, auth, operations, subscriptions, billing
 from utils.config import settings
 from utils.logging import setup_logging, logger
 from utils.database import async_engine, Base
+from utils.llm_clients import llm_clients
+from utils.usage_ledger import usage_ledger
+from services.usage_service import UsageService
+from services.workflow_service import WorkflowService
+from workflow_jobs import workflow_jobs
 
 
 @asynccontextmanager
@@ -29,11 +34,22 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created (debug mode)")
     
+    # Persist LLM token/cost records in batches
+    usage_ledger.set_sink(UsageService.persist_usage_batch)
+    usage_ledger.start_background_flush()
+    
+    # Background workflow generation; job progress and results are stored as they happen
+    workflow_jobs.set_persistence(WorkflowService.save_job_state, WorkflowService.store_generated_workflow)
+    workflow_jobs.start(strategic_chat.get_workflow_engine())
+    
     yield
     
     # Shutdown
     logger.info("PM33 Intelligence Operations API shutting down...")
+    await workflow_jobs.stop()
+    await usage_ledger.stop_background_flush()
     await async_engine.dispose()
+    await llm_clients.aclose()
 
 
 app = FastAPI(
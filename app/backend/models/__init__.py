@@ -4,5 +4,9 @@ from .user import User
 from .subscription import Subscription
 from .operation import Operation
 from .billing import BillingRecord
+from .llm_usage import LLMUsage
+from .workflow import StoredWorkflow
+from .workflow_job import WorkflowJob
+from .context_document import ContextDocument
 
-__all__ = ["User", "Subscription", "Operation", "BillingRecord"]
\ No newline at end of file
+__all__ = ["User", "Subscription", "Operation", "BillingRecord", "LLMUsage", "StoredWorkflow", "WorkflowJob", "ContextDocument"]
\ No newline at end of file
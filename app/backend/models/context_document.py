@@ -0,0 +1,30 @@
+"""Context document model for per-tenant strategic company context."""
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint
+from sqlalchemy.sql import func
+from utils.sync_database import Base
+
+
+class ContextDocument(Base):
+    """Model for one tenant's context document (e.g. company_profile markdown)."""
+    
+    __tablename__ = "context_documents"
+    __table_args__ = (UniqueConstraint("tenant_id", "context_type", name="uq_context_documents_tenant_type"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(String(64), nullable=False, index=True)
+    context_type = Column(String(50), nullable=False)  # Key of context_manager.CONTEXT_FILES
+    content = Column(Text, nullable=False)  # Markdown
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def to_dict(self) -> dict:
+        """Convert context document to dictionary."""
+        return {
+            "tenant_id": self.tenant_id,
+            "context_type": self.context_type,
+            "content": self.content,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,62 @@
+"""LLM usage model for per-call token and cost accounting."""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Boolean
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from utils.sync_database import Base
+
+
+class LLMUsage(Base):
+    """Model for one LLM provider call, written in batches by the usage ledger."""
+    
+    __tablename__ = "llm_usage"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    operation_id = Column(Integer, ForeignKey("operations.id"), nullable=True)  # None for calls outside an operation
+    
+    # Call details
+    engine = Column(String(50), nullable=False)  # anthropic, openai, groq, together
+    model = Column(String(100), nullable=False)
+    call_site = Column(String(100), nullable=False)  # e.g., "workflow.analysis"; used to rank prompts by cost
+    success = Column(Boolean, default=True)
+    cancelled = Column(Boolean, default=False)  # Abandoned by the caller; failures are success=False and not cancelled
+    latency_ms = Column(Integer, nullable=True)
+    
+    # Token usage
+    input_tokens = Column(Integer, default=0)  # Uncached input tokens
+    output_tokens = Column(Integer, default=0)
+    cache_read_tokens = Column(Integer, default=0)
+    cache_write_tokens = Column(Integer, default=0)
+    
+    # Provider cost in USD
+    cost = Column(Numeric(12, 6), nullable=False, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    operation = relationship("Operation", back_populates="llm_usage")
+    
+    @property
+    def total_tokens(self) -> int:
+        """Get all tokens billed for this call."""
+        return (self.input_tokens or 0) + (self.output_tokens or 0) + (self.cache_read_tokens or 0) + (self.cache_write_tokens or 0)
+    
+    def to_dict(self) -> dict:
+        """Convert usage record to dictionary."""
+        return {
+            "id": self.id,
+            "operation_id": self.operation_id,
+            "engine": self.engine,
+            "model": self.model,
+            "call_site": self.call_site,
+            "success": self.success,
+            "cancelled": self.cancelled,
+            "latency_ms": self.latency_ms,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "total_tokens": self.total_tokens,
+            "cost": float(self.cost) if self.cost else 0.0,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
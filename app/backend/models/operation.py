@@ -44,6 +44,7 @@ class Operation(Base):
     
     # Relationships
     user = relationship("User", back_populates="operations")
+    llm_usage = relationship("LLMUsage", back_populates="operation", cascade="all, delete-orphan")
     
     @property
     def duration_seconds(self) -> float:
@@ -21,6 +21,7 @@ class User(Base):
     last_name = Column(String(100), nullable=True)
     company = Column(String(255), nullable=True)
     role = Column(String(50), default="user")  # user, admin
+    tenant_id = Column(String(64), nullable=True, index=True)  # Context tenant; None is the default tenant
     
     # Account status
     is_active = Column(Boolean, default=True)
@@ -68,6 +69,7 @@ class User(Base):
             "last_name": self.last_name,
             "company": self.company,
             "role": self.role,
+            "tenant_id": self.tenant_id,
             "is_active": self.is_active,
             "is_verified": self.is_verified,
             "created_at": self.created_at.isoformat() if self.created_at else None,
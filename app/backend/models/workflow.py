@@ -0,0 +1,43 @@
+"""Stored workflow model for generated strategic workflows."""
+
+import json
+from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy.sql import func
+from utils.sync_database import Base
+
+
+class StoredWorkflow(Base):
+    """Model for a generated StrategicWorkflow, kept so retries and lookups skip regeneration."""
+    
+    __tablename__ = "workflows"
+    
+    id = Column(String(64), primary_key=True)  # StrategicWorkflow.id ("workflow_<uuid4 hex>")
+    
+    # Idempotency
+    idempotency_key = Column(String(255), unique=True, nullable=True)  # Client-supplied Idempotency-Key header
+    request_hash = Column(String(64), nullable=False)  # sha256 of query + context, detects key reuse
+    
+    # Request and result
+    query = Column(Text, nullable=False)
+    workflow_type = Column(String(50), nullable=False)
+    name = Column(String(255), nullable=True)
+    result = Column(Text, nullable=False)  # JSON StrategicWorkflow.to_dict()
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    @property
+    def workflow_data(self) -> dict:
+        """Get the stored workflow as a dictionary."""
+        return json.loads(self.result)
+    
+    def to_dict(self) -> dict:
+        """Convert stored workflow to dictionary."""
+        return {
+            "id": self.id,
+            "idempotency_key": self.idempotency_key,
+            "query": self.query,
+            "workflow_type": self.workflow_type,
+            "name": self.name,
+            "workflow": self.workflow_data,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
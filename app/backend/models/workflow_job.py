@@ -0,0 +1,39 @@
+"""Workflow job model for background workflow generation."""
+
+import json
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey
+from sqlalchemy.sql import func
+from utils.sync_database import Base
+
+
+class WorkflowJob(Base):
+    """Model for a queued workflow generation and its outcome."""
+    
+    __tablename__ = "workflow_jobs"
+    
+    id = Column(String(64), primary_key=True)  # "job_<uuid4 hex>"
+    status = Column(String(50), default="queued")  # queued, running, completed, failed, persist_failed
+    query = Column(Text, nullable=False)
+    
+    # Progress and outcome
+    stage = Column(String(50), nullable=True)  # Last progress stage, e.g. "classified"
+    progress = Column(Text, nullable=True)  # JSON list of progress events
+    workflow_id = Column(String(64), ForeignKey("workflows.id"), nullable=True)
+    error_message = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    def to_dict(self) -> dict:
+        """Convert job to dictionary."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "query": self.query,
+            "stage": self.stage,
+            "progress": json.loads(self.progress) if self.progress else [],
+            "workflow_id": self.workflow_id,
+            "error": self.error_message,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -12,12 +12,14 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 import sqlite3
-import anthropic
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
+from utils.llm_clients import get_llm_client
+from utils.usage_ledger import usage_ledger
+
 load_dotenv()
 
 # Initialize FastAPI app
@@ -33,7 +35,7 @@ app.add_middleware(
 )
 
 # Initialize Anthropic client
-claude = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+claude = get_llm_client('anthropic')
 
 # Enums
 class ProjectStatus(Enum):
@@ -193,11 +195,12 @@ class PM33AIEngine:
         """
         
         try:
-            response = self.claude.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "core.analyze_project") as call:
+                response = call.response = self.claude.messages.create(
+                    model="claude-3-5-sonnet-20241022",
+                    max_tokens=2000,
+                    messages=[{"role": "user", "content": prompt}]
+                )
             
             return {
                 "analysis": response.content[0].text,
@@ -237,11 +240,12 @@ class PM33AIEngine:
         """
         
         try:
-            response = self.claude.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "core.prioritize_tasks") as call:
+                response = call.response = self.claude.messages.create(
+                    model="claude-3-5-sonnet-20241022",
+                    max_tokens=2000,
+                    messages=[{"role": "user", "content": prompt}]
+                )
             
             # Parse AI response and update tasks with priority scores
             prioritized_tasks = []
@@ -278,11 +282,12 @@ class PM33AIEngine:
         """
         
         try:
-            response = self.claude.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=3000,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "core.generate_roadmap") as call:
+                response = call.response = self.claude.messages.create(
+                    model="claude-3-5-sonnet-20241022",
+                    max_tokens=3000,
+                    messages=[{"role": "user", "content": prompt}]
+                )
             
             return {
                 "roadmap": response.content[0].text,
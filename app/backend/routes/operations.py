@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from services.operation_service import OperationService
 from services.subscription_service import SubscriptionService
+from services.usage_service import UsageService
 from utils.auth import get_current_user
 from utils.database import get_db
 from utils.logging import logger
@@ -50,6 +51,11 @@ class UsageStatistics(BaseModel):
     operations_by_status: Dict[str, int]
     total_cost: float
     average_cost_per_operation: float
+    llm_cost: float = 0.0
+    llm_calls: int = 0
+    average_llm_cost_per_operation: float = 0.0
+    llm_cost_by_operation_type: Dict[str, float] = {}
+    tokens: Dict[str, int] = {}
 
 
 @router.post("/execute", response_model=OperationResponse)
@@ -224,6 +230,27 @@ async def get_usage_statistics(
     return UsageStatistics(**statistics)
 
 
+@router.get("/statistics/prompts")
+async def get_prompt_cost_ranking(
+    days: int = 30,
+    limit: int = 10,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the most expensive LLM prompts across all users (admin only)."""
+    
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return {
+        "period_days": min(days, 365),
+        "prompts": await UsageService.get_most_expensive_prompts(db, days=min(days, 365), limit=limit)
+    }
+
+
 @router.get("/types/available")
 async def get_available_operation_types():
     """Get list of available operation types."""
@@ -1,54 +1,224 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional
 import sys
 import os
+import json
+import asyncio
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from strategic_workflow_engine import StrategicWorkflowEngine
+from strategic_workflow_engine import StrategicWorkflowEngine, workflow_templates
+from utils.prompt_cache import prompt_cache_stats
+from workflow_classifier import workflow_classifier
+from analysis_cache import analysis_cache
+from workflow_jobs import workflow_jobs, JobQueueFull
+from context_store import DEFAULT_TENANT, tenant_contexts
+from services.workflow_service import WorkflowService
+from utils.auth import get_current_user
+from utils.database import get_db, AsyncSessionLocal
+from utils.logging import logger
 
 router = APIRouter(prefix="/api/strategic", tags=["strategic"])
 
+_workflow_engine: Optional[StrategicWorkflowEngine] = None
+
+# Keyed streaming generations run to completion even if their client disconnects
+_keyed_streams: set = set()
+
+def get_workflow_engine() -> StrategicWorkflowEngine:
+    """Process-wide workflow engine (its provider clients are pooled and reused)"""
+    global _workflow_engine
+    if _workflow_engine is None:
+        _workflow_engine = StrategicWorkflowEngine()
+    return _workflow_engine
+
 class StrategyQuery(BaseModel):
     query: str
     context: Dict[str, Any] = {}
 
+class BatchStrategyQuery(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=50)
+    context: Dict[str, Any] = {}
+    max_concurrency: Optional[int] = Field(None, ge=1, le=16)
+
+class ContextUpdate(BaseModel):
+    content: str = Field(..., max_length=200_000)
+
 class ChatMessage(BaseModel):
     message: str
     context: Dict[str, Any] = {}
+    stream: bool = False
+
+def _chat_task_payload(task) -> Dict[str, Any]:
+    """Compact task summary used by the chat endpoint"""
+    return {
+        "title": task.title,
+        "assignee": task.assignee_role,
+        "priority": task.priority.value,
+        "due_date": task.due_date.isoformat()
+    }
+
+def _chat_workflow_payload(workflow) -> Dict[str, Any]:
+    """Compact workflow summary returned by the chat endpoint"""
+    return {
+        "id": workflow.id,
+        "name": workflow.name,
+        "objective": workflow.strategic_objective,
+        "tasks": [_chat_task_payload(task) for task in workflow.tasks[:5]]  # First 5 tasks
+    }
+
+def _format_sse(event: str, payload: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
 
 @router.post("/chat")
-async def strategic_chat(message: ChatMessage):
+async def strategic_chat(
+    message: ChatMessage,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: AsyncSession = Depends(get_db)
+):
     """Strategic AI chat with workflow generation"""
-    engine = StrategicWorkflowEngine()
+    engine = get_workflow_engine()
     
-    # Generate strategic response
-    workflow = await engine.generate_strategic_workflow(
-        message.message, 
-        message.context
+    if message.stream or "text/event-stream" in request.headers.get("accept", ""):
+        replayed = False
+        if not idempotency_key:
+            events = _stream_chat(engine, message)
+        else:
+            request_hash = WorkflowService.request_hash(message.message, message.context)
+            stored = await WorkflowService.get_by_idempotency_key(db, idempotency_key, request_hash)
+            if stored is not None:
+                events, replayed = _replay_chat(stored), True
+            else:
+                # Same in-flight registry as non-streaming requests: a retry attaches to the running generation
+                pending, owner = WorkflowService.claim_in_flight(idempotency_key, request_hash)
+                if owner:
+                    events = _start_keyed_stream(engine, message, idempotency_key, pending)
+                else:
+                    events, replayed = _attach_chat(pending), True
+        return StreamingResponse(
+            events,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Idempotent-Replayed": "true" if replayed else "false"}
+        )
+    
+    # Generate strategic response (or replay the stored one for a retried key)
+    workflow, replayed = await WorkflowService.get_or_generate(
+        db,
+        lambda: engine.generate_strategic_workflow(message.message, message.context),
+        message.message,
+        message.context,
+        idempotency_key
     )
+    response.headers["Idempotent-Replayed"] = "true" if replayed else "false"
     
     return {
         "response": f"Here's your strategic analysis with executable plan:",
-        "workflow": {
-            "id": workflow.id,
-            "name": workflow.name,
-            "objective": workflow.strategic_objective,
-            "tasks": [
-                {
-                    "title": task.title,
-                    "assignee": task.assignee_role,
-                    "priority": task.priority.value,
-                    "due_date": task.due_date.isoformat()
-                } for task in workflow.tasks[:5]  # First 5 tasks
-            ]
-        }
+        "workflow": _chat_workflow_payload(workflow)
     }
 
+async def _stream_chat(engine: StrategicWorkflowEngine, message: ChatMessage, idempotency_key: Optional[str] = None,
+                       pending: Optional[asyncio.Future] = None):
+    """SSE stream: analysis tokens and tasks as they arrive, then the generated workflow
+
+    With ``pending`` (a claimed in-flight key), the stored workflow or the
+    error is also handed to retries attached to the key.
+    """
+    workflow, error = None, None
+    try:
+        async for event in engine.stream_strategic_workflow(message.message, message.context):
+            if event["type"] == "token":
+                yield _format_sse("token", {"text": event["text"]})
+            elif event["type"] == "task":
+                yield _format_sse("task", _chat_task_payload(event["task"]))
+            elif event["type"] == "workflow":
+                # Request-scoped sessions are closed once streaming starts, so use a fresh one
+                async with AsyncSessionLocal() as db:
+                    if idempotency_key:
+                        workflow = await WorkflowService.save_workflow(
+                            db, event["workflow"], message.message, message.context, idempotency_key
+                        )
+                    else:
+                        workflow = await WorkflowService.save_unkeyed_workflow(
+                            db, event["workflow"], message.message, message.context
+                        )
+                yield _format_sse("workflow", _chat_workflow_payload(workflow))
+        yield _format_sse("done", {"response": "Here's your strategic analysis with executable plan:"})
+    except Exception as e:
+        error = e
+        yield _format_sse("error", {"error": str(e)[:200]})
+    finally:
+        if pending is not None:
+            WorkflowService.release_in_flight(
+                idempotency_key, pending, workflow=workflow,
+                error=error or RuntimeError("Stream ended without a workflow")
+            )
+
+def _start_keyed_stream(engine: StrategicWorkflowEngine, message: ChatMessage, idempotency_key: str,
+                        pending: asyncio.Future):
+    """Run a keyed streaming generation as its own task and relay its events
+
+    The task, not the client connection, owns the in-flight key, so a client
+    that disconnects cannot leave the key claimed; its retry attaches to the
+    run or replays the stored workflow.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for chunk in _stream_chat(engine, message, idempotency_key, pending):
+                events.put_nowait(chunk)
+        finally:
+            events.put_nowait(None)
+
+    task = asyncio.get_running_loop().create_task(produce())
+    _keyed_streams.add(task)
+    task.add_done_callback(_keyed_streams.discard)
+    return _relay_stream(events)
+
+async def _relay_stream(events: asyncio.Queue):
+    while True:
+        chunk = await events.get()
+        if chunk is None:
+            return
+        yield chunk
+
+async def _attach_chat(pending: asyncio.Future):
+    """SSE stream for a retry that arrived mid-generation: the original run's workflow once stored"""
+    try:
+        workflow = await asyncio.shield(pending)
+    except Exception as e:
+        yield _format_sse("error", {"error": str(e)[:200]})
+        return
+    async for chunk in _replay_chat(workflow):
+        yield chunk
+
+async def _replay_chat(workflow):
+    """SSE stream for a retried request: the stored workflow, no regeneration"""
+    yield _format_sse("workflow", _chat_workflow_payload(workflow))
+    yield _format_sse("done", {"response": "Here's your strategic analysis with executable plan:"})
+
 @router.post("/workflow/generate")
-async def generate_workflow(query: StrategyQuery):
+async def generate_workflow(
+    query: StrategyQuery,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: AsyncSession = Depends(get_db)
+):
     """Generate executable workflow from strategic query"""
-    engine = StrategicWorkflowEngine()
-    workflow = await engine.generate_strategic_workflow(query.query, query.context)
+    engine = get_workflow_engine()
+    workflow, replayed = await WorkflowService.get_or_generate(
+        db,
+        lambda: engine.generate_strategic_workflow(query.query, query.context),
+        query.query,
+        query.context,
+        idempotency_key
+    )
+    response.headers["Idempotent-Replayed"] = "true" if replayed else "false"
     
     return {
         "workflow_id": workflow.id,
@@ -65,4 +235,175 @@ async def generate_workflow(query: StrategyQuery):
                 "strategic_rationale": task.strategic_rationale
             } for task in workflow.tasks
         ]
-    }
\ No newline at end of file
+    }
+
+@router.post("/workflow/batch")
+async def generate_workflow_batch(batch: BatchStrategyQuery):
+    """Generate workflows for many queries at once, streamed as SSE as each completes"""
+    engine = get_workflow_engine()
+    return StreamingResponse(
+        _stream_batch(engine, batch),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _stream_batch(engine: StrategicWorkflowEngine, batch: BatchStrategyQuery):
+    """SSE stream: one workflow (or error) event per query in completion order, then done"""
+    options = {"max_concurrency": batch.max_concurrency} if batch.max_concurrency else {}
+    completed = failed = 0
+    
+    async for result in engine.generate_strategic_workflows(batch.queries, batch.context, **options):
+        if "error" in result:
+            failed += 1
+            yield _format_sse("error", {"index": result["index"], "query": result["query"], "error": result["error"][:200]})
+            continue
+        
+        workflow = result["workflow"]
+        try:
+            async with AsyncSessionLocal() as db:
+                workflow = await WorkflowService.save_workflow(db, workflow, result["query"], batch.context)
+        except Exception as e:
+            # Still deliver the generated workflow; it just can't be fetched later
+            logger.error(f"Failed to store batch workflow {workflow.id}: {e}")
+        
+        completed += 1
+        yield _format_sse("workflow", {"index": result["index"], "query": result["query"], **_chat_workflow_payload(workflow)})
+    
+    yield _format_sse("done", {"total": len(batch.queries), "completed": completed, "failed": failed})
+
+@router.get("/workflow/{workflow_id}")
+async def get_workflow(workflow_id: str, db: AsyncSession = Depends(get_db)):
+    """Fetch a previously generated workflow"""
+    workflow = await WorkflowService.get_workflow(db, workflow_id)
+    if workflow is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return workflow.to_dict()
+
+@router.post("/jobs", status_code=202)
+async def submit_workflow_job(query: StrategyQuery):
+    """Queue a long workflow generation; poll the status URL or subscribe to its events"""
+    try:
+        job = await workflow_jobs.submit(query.query, query.context)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/strategic/jobs/{job.id}",
+        "events_url": f"/api/strategic/jobs/{job.id}/events"
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_workflow_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Job status and progress (the workflow is at /workflow/{workflow_id} once completed; a persist_failed job carries it inline)"""
+    job = workflow_jobs.get(job_id)
+    if job is not None:
+        return job.to_dict()
+    
+    stored = await WorkflowService.get_job(db, job_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return stored
+
+@router.get("/jobs/{job_id}/events")
+async def stream_workflow_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """SSE stream of a job's progress events until it completes or fails"""
+    if workflow_jobs.get(job_id) is None:
+        # Finished before this process's memory of it; replay what was stored
+        stored = await WorkflowService.get_job(db, job_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        events = _replay_job_events(stored)
+    else:
+        events = _stream_job_events(job_id)
+    
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _stream_job_events(job_id: str):
+    """SSE stream: one progress event per stage ("analysis_done", "classified", "task", ...)"""
+    async for event in workflow_jobs.subscribe(job_id):
+        yield _format_sse(event["stage"], event)
+
+async def _replay_job_events(job: Dict[str, Any]):
+    """SSE stream of a stored job's recorded progress"""
+    for event in job["progress"]:
+        yield _format_sse(event["stage"], event)
+
+@router.get("/jobs")
+async def get_workflow_job_stats():
+    """Background job queue depth, worker count and outcomes"""
+    return workflow_jobs.stats()
+
+def _authorize_tenant(tenant_id: str, user, admin: bool = False):
+    """403 unless the user belongs to the tenant (and, for writes, is an admin)"""
+    if tenant_id != (user.tenant_id or DEFAULT_TENANT):
+        raise HTTPException(status_code=403, detail="Not a member of this tenant")
+    if admin and user.role != "admin":
+        raise HTTPException(status_code=403, detail="Operation not permitted")
+
+async def _tenant_context(tenant_id: str):
+    """Tenant's context manager (loaded off the event loop on first use)"""
+    try:
+        return await run_in_threadpool(tenant_contexts.get, tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/context/{tenant_id}")
+async def get_tenant_context(tenant_id: str, current_user = Depends(get_current_user)):
+    """Loaded context documents and their health for one tenant"""
+    _authorize_tenant(tenant_id, current_user)
+    manager = await _tenant_context(tenant_id)
+    return manager.get_context_summary()
+
+@router.get("/context/{tenant_id}/search")
+async def search_tenant_context(tenant_id: str, query: str, current_user = Depends(get_current_user)):
+    """Context sections most relevant to a strategic query"""
+    _authorize_tenant(tenant_id, current_user)
+    manager = await _tenant_context(tenant_id)
+    return {"query": query, "context": manager.get_relevant_context(query)}
+
+@router.put("/context/{tenant_id}/{context_type}")
+async def update_tenant_context(
+    tenant_id: str,
+    context_type: str,
+    update: ContextUpdate,
+    current_user = Depends(get_current_user)
+):
+    """Replace one of a tenant's context documents (tenant admins only)"""
+    _authorize_tenant(tenant_id, current_user, admin=True)
+    await _tenant_context(tenant_id)
+    if not await run_in_threadpool(tenant_contexts.update, tenant_id, context_type, update.content):
+        raise HTTPException(status_code=400, detail=f"Could not update context '{context_type}'")
+    return {"tenant_id": tenant_id, "context_type": context_type, "updated": True}
+
+@router.get("/prompt-cache")
+async def get_prompt_cache_stats():
+    """Provider prompt-cache hit rates, local context dedupe and analysis reuse statistics"""
+    return {**prompt_cache_stats(), "analysis_cache": analysis_cache.stats()}
+
+@router.get("/templates")
+async def get_workflow_templates():
+    """Loaded workflow templates with their versions"""
+    return {
+        "templates": {workflow_type: template.to_dict() for workflow_type, template in workflow_templates.templates().items()},
+        "registry": workflow_templates.stats()
+    }
+
+@router.post("/templates/reload")
+async def reload_workflow_templates(current_user = Depends(get_current_user)):
+    """Re-read template files now (admin only; invalid files keep the current templates)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if not workflow_templates.reload():
+        raise HTTPException(status_code=422, detail=workflow_templates.last_error)
+    return {"versions": workflow_templates.versions()}
+
+@router.get("/classifier")
+async def get_classifier_stats():
+    """Local workflow classifier confidence and LLM fallback rate"""
+    return workflow_classifier.stats()
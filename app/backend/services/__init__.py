@@ -5,11 +5,15 @@ from .subscription_service import SubscriptionService
 from .operation_service import OperationService
 from .billing_service import BillingService
 from .stripe_service import StripeService
+from .usage_service import UsageService
+from .workflow_service import WorkflowService
 
 __all__ = [
     "UserService",
     "SubscriptionService", 
     "OperationService",
     "BillingService",
-    "StripeService"
+    "StripeService",
+    "UsageService",
+    "WorkflowService"
 ]
\ No newline at end of file
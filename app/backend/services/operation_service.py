@@ -11,8 +11,10 @@ from models.user import User
 from models.operation import Operation
 from models.subscription import Subscription
 from services.subscription_service import SubscriptionService
+from services.usage_service import UsageService
 from utils.config import settings
 from utils.logging import logger, log_operation
+from utils.usage_ledger import operation_scope
 
 
 class OperationService:
@@ -67,10 +69,11 @@ class OperationService:
             operation.mark_started()
             await db.commit()
             
-            # Execute the actual operation
-            result = await OperationService._execute_operation_logic(
-                operation_type, query, context_data
-            )
+            # Execute the actual operation (LLM calls inside are attributed to it)
+            with operation_scope(operation.id):
+                result = await OperationService._execute_operation_logic(
+                    operation_type, query, context_data
+                )
             
             # Mark operation as completed
             operation.mark_completed(json.dumps(result))
@@ -361,13 +364,17 @@ class OperationService:
         cost_result = await db.execute(cost_stmt)
         total_cost = cost_result.scalar() or 0
         
+        # Actual provider cost from the LLM usage ledger
+        llm_usage = await UsageService.get_user_llm_usage(db, user_id, days)
+        
         return {
             "period_days": days,
             "total_operations": total_operations,
             "operations_by_type": operations_by_type,
             "operations_by_status": operations_by_status,
             "total_cost": float(total_cost),
-            "average_cost_per_operation": float(total_cost / total_operations) if total_operations > 0 else 0
+            "average_cost_per_operation": float(total_cost / total_operations) if total_operations > 0 else 0,
+            **llm_usage
         }
     
     @staticmethod
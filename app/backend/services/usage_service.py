@@ -0,0 +1,146 @@
+"""LLM token and cost accounting service."""
+
+from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func, desc, insert
+from models.llm_usage import LLMUsage
+from models.operation import Operation
+from utils.database import AsyncSessionLocal
+from utils.logging import logger
+from utils.usage_ledger import UsageRecord
+
+
+class UsageService:
+    """Service for persisting and aggregating per-call LLM usage."""
+
+    @staticmethod
+    async def persist_usage_batch(records: List[UsageRecord]) -> None:
+        """Write one batch of ledger records (installed as the usage ledger sink)."""
+        if not records:
+            return
+
+        rows = [
+            {
+                "operation_id": record.operation_id,
+                "engine": record.engine,
+                "model": record.model,
+                "call_site": record.call_site,
+                "success": record.success,
+                "cancelled": record.cancelled,
+                "latency_ms": record.latency_ms,
+                "input_tokens": record.input_tokens,
+                "output_tokens": record.output_tokens,
+                "cache_read_tokens": record.cache_read_tokens,
+                "cache_write_tokens": record.cache_write_tokens,
+                "cost": record.cost,
+                "created_at": record.created_at,
+            }
+            for record in records
+        ]
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(insert(LLMUsage), rows)
+            await session.commit()
+
+        logger.debug(f"Persisted {len(rows)} LLM usage records")
+
+    @staticmethod
+    async def get_user_llm_usage(
+        db: AsyncSession,
+        user_id: int,
+        days: int = 30
+    ) -> Dict[str, Any]:
+        """Get provider token usage and cost for a user's operations."""
+        since_date = datetime.utcnow() - timedelta(days=days)
+        scope = and_(
+            Operation.user_id == user_id,
+            Operation.created_at >= since_date
+        )
+
+        # Totals
+        totals_stmt = (
+            select(
+                func.coalesce(func.sum(LLMUsage.cost), 0),
+                func.coalesce(func.sum(LLMUsage.input_tokens), 0),
+                func.coalesce(func.sum(LLMUsage.output_tokens), 0),
+                func.coalesce(func.sum(LLMUsage.cache_read_tokens), 0),
+                func.coalesce(func.sum(LLMUsage.cache_write_tokens), 0),
+                func.count(LLMUsage.id),
+                func.count(func.distinct(LLMUsage.operation_id)),
+            )
+            .select_from(LLMUsage)
+            .join(Operation, LLMUsage.operation_id == Operation.id)
+            .where(scope)
+        )
+        totals_result = await db.execute(totals_stmt)
+        cost, input_tokens, output_tokens, cache_read, cache_write, calls, operations = totals_result.one()
+
+        # Cost by operation type
+        type_stmt = (
+            select(Operation.operation_type, func.sum(LLMUsage.cost))
+            .select_from(LLMUsage)
+            .join(Operation, LLMUsage.operation_id == Operation.id)
+            .where(scope)
+            .group_by(Operation.operation_type)
+        )
+        type_result = await db.execute(type_stmt)
+        cost_by_type = {operation_type: float(total or 0) for operation_type, total in type_result.fetchall()}
+
+        return {
+            "llm_cost": float(cost),
+            "llm_calls": calls,
+            "average_llm_cost_per_operation": float(cost) / operations if operations else 0.0,
+            "llm_cost_by_operation_type": cost_by_type,
+            "tokens": {
+                "input": int(input_tokens),
+                "output": int(output_tokens),
+                "cache_read": int(cache_read),
+                "cache_write": int(cache_write),
+            },
+        }
+
+    @staticmethod
+    async def get_operation_cost(db: AsyncSession, operation_id: int) -> float:
+        """Get the actual provider cost of a single operation."""
+        stmt = select(func.coalesce(func.sum(LLMUsage.cost), 0)).where(LLMUsage.operation_id == operation_id)
+        result = await db.execute(stmt)
+        return float(result.scalar())
+
+    @staticmethod
+    async def get_most_expensive_prompts(
+        db: AsyncSession,
+        days: int = 30,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Rank call sites (prompts) by total provider cost."""
+        since_date = datetime.utcnow() - timedelta(days=days)
+        total_cost = func.sum(LLMUsage.cost).label("total_cost")
+
+        stmt = (
+            select(
+                LLMUsage.call_site,
+                LLMUsage.model,
+                func.count(LLMUsage.id),
+                total_cost,
+                func.avg(LLMUsage.input_tokens + LLMUsage.cache_read_tokens + LLMUsage.cache_write_tokens),
+                func.avg(LLMUsage.output_tokens),
+            )
+            .where(LLMUsage.created_at >= since_date)
+            .group_by(LLMUsage.call_site, LLMUsage.model)
+            .order_by(desc(total_cost))
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+
+        return [
+            {
+                "call_site": call_site,
+                "model": model,
+                "calls": calls,
+                "total_cost": float(cost or 0),
+                "average_input_tokens": float(avg_input or 0),
+                "average_output_tokens": float(avg_output or 0),
+            }
+            for call_site, model, calls, cost, avg_input, avg_output in result.fetchall()
+        ]
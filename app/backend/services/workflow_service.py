@@ -0,0 +1,210 @@
+"""Strategic workflow storage and idempotent generation service."""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+from models.workflow import StoredWorkflow
+from models.workflow_job import WorkflowJob
+from strategic_workflow_engine import StrategicWorkflow
+from utils.database import AsyncSessionLocal
+from utils.logging import logger
+
+# Idempotency key -> generation in progress in this process (concurrent retries share it)
+_in_flight: Dict[str, Tuple[str, "asyncio.Future[StrategicWorkflow]"]] = {}
+
+
+class WorkflowService:
+    """Service for persisting generated workflows and replaying idempotent requests."""
+
+    @staticmethod
+    def request_hash(query: str, context: Dict[str, Any]) -> str:
+        """Fingerprint of a generation request, used to detect idempotency key reuse."""
+        payload = json.dumps({"query": query, "context": context}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    async def get_workflow(db: AsyncSession, workflow_id: str) -> Optional[StrategicWorkflow]:
+        """Get a stored workflow by id."""
+        stored = await db.get(StoredWorkflow, workflow_id)
+        return StrategicWorkflow.from_dict(stored.workflow_data) if stored else None
+
+    @staticmethod
+    async def get_by_idempotency_key(
+        db: AsyncSession,
+        idempotency_key: str,
+        request_hash: str
+    ) -> Optional[StrategicWorkflow]:
+        """Get the workflow stored for an idempotency key (409 if the key was used for another request)."""
+        result = await db.execute(select(StoredWorkflow).where(StoredWorkflow.idempotency_key == idempotency_key))
+        stored = result.scalar_one_or_none()
+        if stored is None:
+            return None
+
+        if stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Idempotency-Key was already used for a different request"
+            )
+        return StrategicWorkflow.from_dict(stored.workflow_data)
+
+    @staticmethod
+    async def save_workflow(
+        db: AsyncSession,
+        workflow: StrategicWorkflow,
+        query: str,
+        context: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> StrategicWorkflow:
+        """Persist a generated workflow; returns the stored one if another request won the key."""
+        request_hash = WorkflowService.request_hash(query, context)
+        db.add(StoredWorkflow(
+            id=workflow.id,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+            query=query,
+            workflow_type=workflow.workflow_type.value,
+            name=workflow.name[:255] if workflow.name else None,
+            result=json.dumps(workflow.to_dict()),
+        ))
+
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Same key stored concurrently by another worker process
+            await db.rollback()
+            if idempotency_key is None:
+                raise
+            stored = await WorkflowService.get_by_idempotency_key(db, idempotency_key, request_hash)
+            if stored is None:
+                raise
+            return stored
+
+        logger.info(f"Stored workflow {workflow.id}" + (f" for idempotency key {idempotency_key}" if idempotency_key else ""))
+        return workflow
+
+    @staticmethod
+    async def save_unkeyed_workflow(
+        db: AsyncSession,
+        workflow: StrategicWorkflow,
+        query: str,
+        context: Dict[str, Any]
+    ) -> StrategicWorkflow:
+        """Persist a workflow generated without an idempotency key; a storage failure is logged, not raised.
+
+        Nothing can replay an unkeyed request, so the caller still gets the
+        workflow it paid for; it just can't be fetched by id later.
+        """
+        try:
+            return await WorkflowService.save_workflow(db, workflow, query, context)
+        except Exception as e:
+            logger.error(f"Failed to store workflow {workflow.id}: {e}")
+            return workflow
+
+    @staticmethod
+    async def get_or_generate(
+        db: AsyncSession,
+        generate: Callable[[], Awaitable[StrategicWorkflow]],
+        query: str,
+        context: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[StrategicWorkflow, bool]:
+        """Stored workflow for the key, or generate and store one; returns (workflow, replayed)."""
+        if not idempotency_key:
+            workflow = await generate()
+            return await WorkflowService.save_unkeyed_workflow(db, workflow, query, context), False
+
+        request_hash = WorkflowService.request_hash(query, context)
+        stored = await WorkflowService.get_by_idempotency_key(db, idempotency_key, request_hash)
+        if stored is not None:
+            return stored, True
+
+        pending, owner = WorkflowService.claim_in_flight(idempotency_key, request_hash)
+        if not owner:
+            # A retry arrived while the original request is still generating
+            return await asyncio.shield(pending), True
+
+        try:
+            workflow = await generate()
+            workflow = await WorkflowService.save_workflow(db, workflow, query, context, idempotency_key)
+        except BaseException as e:
+            WorkflowService.release_in_flight(idempotency_key, pending, error=e)
+            raise
+        WorkflowService.release_in_flight(idempotency_key, pending, workflow=workflow)
+        return workflow, False
+
+    @staticmethod
+    def claim_in_flight(idempotency_key: str, request_hash: str) -> Tuple["asyncio.Future[StrategicWorkflow]", bool]:
+        """The key's in-progress generation and whether this caller now owns it (409 if it is generating another request)."""
+        if idempotency_key in _in_flight:
+            in_flight_hash, pending = _in_flight[idempotency_key]
+            if in_flight_hash != request_hash:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Idempotency-Key is in use by a different request"
+                )
+            return pending, False
+
+        pending = asyncio.get_running_loop().create_future()
+        _in_flight[idempotency_key] = (request_hash, pending)
+        return pending, True
+
+    @staticmethod
+    def release_in_flight(
+        idempotency_key: str,
+        pending: "asyncio.Future[StrategicWorkflow]",
+        workflow: Optional[StrategicWorkflow] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Hand an owned generation's outcome to attached retries and drop it from the registry."""
+        if not pending.done():
+            if workflow is not None:
+                pending.set_result(workflow)
+            else:
+                pending.set_exception(error if isinstance(error, Exception) else RuntimeError("Workflow generation cancelled"))
+                # Nobody else may be waiting; mark the exception retrieved
+                pending.exception()
+        if _in_flight.get(idempotency_key, (None, None))[1] is pending:
+            del _in_flight[idempotency_key]
+
+    @staticmethod
+    async def store_generated_workflow(
+        workflow: StrategicWorkflow,
+        query: str,
+        context: Dict[str, Any]
+    ) -> StrategicWorkflow:
+        """Persist a workflow produced by a background job (installed as the job queue's workflow sink)."""
+        async with AsyncSessionLocal() as db:
+            try:
+                return await WorkflowService.save_workflow(db, workflow, query, context)
+            except IntegrityError:
+                # The job queue retries failed saves; an earlier attempt may have committed
+                stored = await WorkflowService.get_workflow(db, workflow.id)
+                if stored is None:
+                    raise
+                return stored
+
+    @staticmethod
+    async def save_job_state(job: Dict[str, Any]) -> None:
+        """Upsert a background job's status and progress (installed as the job queue's job sink)."""
+        async with AsyncSessionLocal() as db:
+            await db.merge(WorkflowJob(
+                id=job["job_id"],
+                status=job["status"],
+                query=job["query"],
+                stage=job["stage"],
+                progress=json.dumps(job["progress"]),
+                workflow_id=job["workflow_id"],
+                error_message=job["error"],
+            ))
+            await db.commit()
+
+    @staticmethod
+    async def get_job(db: AsyncSession, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a stored background job by id."""
+        job = await db.get(WorkflowJob, job_id)
+        return job.to_dict() if job else None
@@ -7,15 +7,132 @@ Bridges AI strategic intelligence with executable workflows
 import os
 import json
 import asyncio
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Mapping, Tuple
 from dataclasses import dataclass
 from enum import Enum
-import anthropic
 from dotenv import load_dotenv
 
+from utils.llm_clients import get_async_llm_client
+from utils.usage_ledger import usage_ledger
+from utils.rate_limit import rate_limiter
+from utils.prompt_cache import PromptParts, anthropic_prompt, context_blocks
+from utils.structured_output import IncrementalJSONArrayParser, extract_sections, extract_list_items
+from workflow_classifier import workflow_classifier
+from integrations import sync_workflow
+from workflow_scheduler import apply_due_dates, WorkflowCycleError
+from template_registry import TemplateRegistry, WorkflowTemplate
+from analysis_cache import analysis_cache, context_fingerprint, tenant_key, CachedAnalysis
+
 load_dotenv()
 
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
+
+# Batch generation: queries in flight at once (provider request rate is limited separately)
+BATCH_MAX_CONCURRENCY = int(os.getenv("PM33_BATCH_MAX_CONCURRENCY", "8"))
+
+# Static prompt prefixes: sent as cached system blocks ahead of the per-request content
+ANALYSIS_INSTRUCTIONS = """
+Analyze the strategic product management question that follows the company context and provide comprehensive guidance.
+
+Provide strategic analysis including:
+1. **Situation Assessment**: Current state and key factors
+2. **Strategic Recommendation**: Specific recommended approach
+3. **Success Metrics**: How to measure success (3-5 specific metrics)
+4. **Key Risks**: Primary risks and mitigation approaches
+5. **Resource Requirements**: Team roles and time estimates needed
+6. **Timeline**: Realistic timeline for execution
+7. **Workflow Name**: Concise name for the resulting workflow
+8. **Strategic Objective**: Clear objective statement
+
+Focus on actionable, specific guidance that can be translated into executable tasks.
+"""
+
+# Follow-up questions on an unchanged company context: the prior assessment replaces the full context
+ANALYSIS_DELTA_INSTRUCTIONS = """
+Analyze the follow-up strategic product management question. The company context has not changed since the previous analysis, whose situation assessment follows.
+
+Provide strategic analysis including:
+1. **Situation Assessment**: Write "Unchanged" unless this question changes the prior assessment
+2. **Strategic Recommendation**: Specific recommended approach
+3. **Success Metrics**: How to measure success (3-5 specific metrics)
+4. **Key Risks**: Primary risks and mitigation approaches
+5. **Resource Requirements**: Team roles and time estimates needed
+6. **Timeline**: Realistic timeline for execution
+7. **Workflow Name**: Concise name for the resulting workflow
+8. **Strategic Objective**: Clear objective statement
+
+Focus on actionable, specific guidance that can be translated into executable tasks.
+"""
+
+CLASSIFICATION_INSTRUCTIONS = """
+Classify the product management query into one of these workflow types:
+- competitive_response: Responding to competitor actions
+- feature_prioritization: Deciding between features or initiatives  
+- market_expansion: Entering new markets or segments
+- risk_mitigation: Addressing identified risks or problems
+- strategic_planning: Long-term strategic planning and roadmapping
+
+Respond with just the workflow type (e.g., "competitive_response").
+"""
+
+TASK_GENERATION_INSTRUCTIONS = """
+Based on the strategic analysis provided, create a detailed task breakdown for execution.
+
+For each task, provide:
+1. **Task Title**: Clear, actionable title
+2. **Description**: Specific deliverables and approach
+3. **Assignee Role**: Who should own this (Product Manager, Engineering Lead, etc.)
+4. **Estimated Hours**: Realistic time estimate
+5. **Priority**: Critical/High/Medium/Low
+6. **Strategic Rationale**: Why this task supports the strategic objective
+7. **Success Criteria**: How to know the task is complete
+8. **Dependencies**: Which other tasks must be completed first
+
+Generate 6-10 specific tasks that will execute this strategic recommendation.
+
+Record the tasks with the record_workflow_tasks tool, in execution order. Dependencies are titles of other tasks.
+"""
+
+# Forced tool call: the model returns schema-shaped task JSON instead of prose
+TASK_TOOL = {
+    "name": "record_workflow_tasks",
+    "description": "Record the executable tasks for the strategic workflow",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "tasks": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "description": {"type": "string"},
+                        "assignee_role": {"type": "string"},
+                        "estimated_hours": {"type": "integer"},
+                        "priority": {"type": "string", "enum": ["low", "medium", "high", "critical"]},
+                        "strategic_rationale": {"type": "string"},
+                        "success_criteria": {"type": "string"},
+                        "dependencies": {"type": "array", "items": {"type": "string"}}
+                    },
+                    "required": ["title", "description", "assignee_role", "estimated_hours", "priority"]
+                }
+            }
+        },
+        "required": ["tasks"]
+    }
+}
+
+ANALYSIS_SECTIONS = {
+    "workflow_name": "Workflow Name",
+    "description": "Situation Assessment",
+    "objective": "Strategic Objective",
+    "success_metrics": "Success Metrics",
+    "risks": "Key Risks",
+    "timeline": "Timeline"
+}
+
 class WorkflowType(Enum):
     COMPETITIVE_RESPONSE = "competitive_response"
     FEATURE_PRIORITIZATION = "feature_prioritization"
@@ -23,6 +140,12 @@ class WorkflowType(Enum):
     RISK_MITIGATION = "risk_mitigation"
     STRATEGIC_PLANNING = "strategic_planning"
 
+# Progress listener for long generations: (stage, data)
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+# Loaded and validated once at import; every engine shares the same immutable snapshot
+workflow_templates = TemplateRegistry(required_types=[workflow_type.value for workflow_type in WorkflowType])
+
 class TaskPriority(Enum):
     LOW = "low"
     MEDIUM = "medium"
@@ -41,6 +164,29 @@ class StrategicTask:
     success_criteria: str
     dependencies: List[str]
     due_date: datetime
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable task (for the workflow store)"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "assignee_role": self.assignee_role,
+            "estimated_hours": self.estimated_hours,
+            "priority": self.priority.value,
+            "strategic_rationale": self.strategic_rationale,
+            "success_criteria": self.success_criteria,
+            "dependencies": self.dependencies,
+            "due_date": self.due_date.isoformat()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StrategicTask":
+        return cls(**{
+            **data,
+            "priority": TaskPriority(data["priority"]),
+            "due_date": datetime.fromisoformat(data["due_date"])
+        })
 
 @dataclass
 class StrategicWorkflow:
@@ -53,76 +199,163 @@ class StrategicWorkflow:
     tasks: List[StrategicTask]
     created_at: datetime
     estimated_completion: datetime
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable workflow (for the workflow store)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "workflow_type": self.workflow_type.value,
+            "strategic_objective": self.strategic_objective,
+            "success_metrics": self.success_metrics,
+            "tasks": [task.to_dict() for task in self.tasks],
+            "created_at": self.created_at.isoformat(),
+            "estimated_completion": self.estimated_completion.isoformat()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StrategicWorkflow":
+        return cls(**{
+            **data,
+            "workflow_type": WorkflowType(data["workflow_type"]),
+            "tasks": [StrategicTask.from_dict(task) for task in data["tasks"]],
+            "created_at": datetime.fromisoformat(data["created_at"]),
+            "estimated_completion": datetime.fromisoformat(data["estimated_completion"])
+        })
 
 class StrategicWorkflowEngine:
     """Converts AI strategic recommendations into executable workflows"""
     
-    def __init__(self):
-        self.claude = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-        self.workflow_templates = self._load_workflow_templates()
-        
-    def _load_workflow_templates(self) -> Dict[WorkflowType, Dict]:
-        """Load workflow templates for different strategic scenarios"""
-        return {
-            WorkflowType.COMPETITIVE_RESPONSE: {
-                "standard_tasks": [
-                    "Competitive feature analysis",
-                    "Customer impact assessment", 
-                    "Technical feasibility review",
-                    "Marketing response planning",
-                    "Resource allocation analysis",
-                    "Timeline planning",
-                    "Risk assessment",
-                    "Success metrics definition"
-                ],
-                "typical_duration": 14,  # days
-                "critical_roles": ["Product Manager", "Engineering Lead", "Marketing Lead", "Research Lead"]
-            },
-            WorkflowType.FEATURE_PRIORITIZATION: {
-                "standard_tasks": [
-                    "ROI analysis completion",
-                    "Technical complexity assessment",
-                    "User impact analysis",
-                    "Resource requirement planning",
-                    "Timeline estimation",
-                    "Risk identification",
-                    "Success criteria definition",
-                    "Stakeholder alignment"
-                ],
-                "typical_duration": 7,  # days
-                "critical_roles": ["Product Manager", "Engineering Lead", "UX Research", "Data Analyst"]
-            },
-            WorkflowType.MARKET_EXPANSION: {
-                "standard_tasks": [
-                    "Market opportunity analysis",
-                    "Competitive landscape review",
-                    "Customer segment validation",
-                    "Go-to-market planning",
-                    "Resource requirement analysis",
-                    "Partnership evaluation",
-                    "Risk assessment",
-                    "Success metrics definition"
-                ],
-                "typical_duration": 21,  # days
-                "critical_roles": ["Product Manager", "Marketing Lead", "Sales Lead", "Business Development"]
-            }
-        }
+    @property
+    def async_claude(self):
+        """Pooled async client for the running event loop"""
+        return get_async_llm_client('anthropic')
+        
+    @property
+    def workflow_templates(self) -> Mapping[str, WorkflowTemplate]:
+        """Shared template snapshot, keyed by workflow type value"""
+        return workflow_templates.templates()
     
-    async def generate_strategic_workflow(self, strategic_query: str, context: Dict[str, Any]) -> StrategicWorkflow:
-        """Generate executable workflow from strategic AI recommendation"""
+    def _template(self, workflow_type: WorkflowType) -> WorkflowTemplate:
+        return workflow_templates.get(workflow_type.value)
+    
+    async def generate_strategic_workflow(self, strategic_query: str, context: Dict[str, Any], context_str: Optional[str] = None,
+                                          progress: Optional[ProgressCallback] = None) -> StrategicWorkflow:
+        """Generate executable workflow from strategic AI recommendation
         
-        # First, get strategic analysis and recommendation
-        strategic_analysis = await self._get_strategic_analysis(strategic_query, context)
+        progress, if given, is called with (stage, data) as work completes:
+        "analysis_done", "classified" and one "task" event per generated task.
+        """
         
-        # Determine workflow type
-        workflow_type = await self._classify_workflow_type(strategic_query)
+        async def analysis() -> Dict[str, Any]:
+            strategic_analysis = await self._get_strategic_analysis(strategic_query, context, context_str)
+            self._report(progress, "analysis_done", workflow_name=strategic_analysis.get("workflow_name"))
+            return strategic_analysis
+        
+        async def classification() -> WorkflowType:
+            workflow_type = await self._classify_workflow_type(strategic_query)
+            self._report(progress, "classified", workflow_type=workflow_type.value)
+            return workflow_type
+        
+        # Classification only needs the query, so it runs alongside the analysis
+        strategic_analysis, workflow_type = await asyncio.gather(analysis(), classification())
+        
+        # Generate specific workflow tasks once both are in
+        if progress is None:
+            workflow_tasks = await self._generate_workflow_tasks(strategic_analysis, workflow_type, context)
+        else:
+            # Stream so each task can be reported as soon as it is generated
+            workflow_tasks = []
+            async for task in self.stream_workflow_tasks(strategic_analysis, workflow_type):
+                workflow_tasks.append(task)
+                self._report(progress, "task", done=len(workflow_tasks), title=task.title)
+            self._schedule_tasks(workflow_tasks, datetime.now() + timedelta(days=1))
+        
+        return self._build_workflow(strategic_analysis, workflow_type, workflow_tasks)
+    
+    @staticmethod
+    def _report(progress: Optional[ProgressCallback], stage: str, **data):
+        """Send a progress event; a failing listener never breaks generation"""
+        if progress is None:
+            return
+        try:
+            progress(stage, data)
+        except Exception as e:
+            print(f"⚠️ Progress listener failed: {e}")
+    
+    async def generate_strategic_workflows(self, strategic_queries: List[str], context: Dict[str, Any],
+                                           max_concurrency: int = BATCH_MAX_CONCURRENCY) -> AsyncIterator[Dict[str, Any]]:
+        """Generate workflows for many queries sharing one context, yielding each as it completes
         
-        # Generate specific workflow tasks
-        workflow_tasks = await self._generate_workflow_tasks(strategic_analysis, workflow_type, context)
+        Yields {"index": i, "query": ..., "workflow": ...} or {"index": i,
+        "query": ..., "error": ...} in completion order. At most max_concurrency
+        queries run at once; provider request rates are limited per call.
+        """
+        context_str = self._format_context(context)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def run(index: int, query: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    workflow = await self.generate_strategic_workflow(query, context, context_str)
+                    return {"index": index, "query": query, "workflow": workflow}
+                except Exception as e:
+                    return {"index": index, "query": query, "error": str(e)}
+        
+        pending = [asyncio.ensure_future(run(i, query)) for i, query in enumerate(strategic_queries)]
+        try:
+            for next_result in asyncio.as_completed(pending):
+                yield await next_result
+        finally:
+            # Client went away or the consumer stopped early
+            for task in pending:
+                task.cancel()
+    
+    async def stream_strategic_workflow(self, strategic_query: str, context: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Stream analysis tokens as they arrive, then the finished workflow
         
-        # Create workflow object
-        workflow = StrategicWorkflow(
-            id=f"workflow_{int(datetime.now().timestamp())}",
+        Yields {"type": "token", "text": ...} events while the strategic
+        analysis streams, {"type": "task", "task": ...} as each generated task
+        is complete, then one {"type": "workflow", "workflow": ...} event.
+        """
+        prompt, call_site, complete_analysis = self._prepare_analysis(strategic_query, context)
+        classification = asyncio.ensure_future(self._classify_workflow_type(strategic_query))
+        
+        try:
+            chunks = []
+            await rate_limiter.acquire("anthropic")
+            with usage_ledger.track("anthropic", CLAUDE_MODEL, call_site) as call:
+                async with self.async_claude.messages.stream(
+                    model=CLAUDE_MODEL,
+                    max_tokens=3000,
+                    **anthropic_prompt(prompt, CLAUDE_MODEL)
+                ) as stream:
+                    async for text in stream.text_stream:
+                        chunks.append(text)
+                        yield {"type": "token", "text": text}
+                    call.response = await stream.get_final_message()
+        except BaseException:
+            classification.cancel()
+            raise
+        
+        strategic_analysis = complete_analysis("".join(chunks))
+        workflow_type = await classification
+        
+        workflow_tasks = []
+        async for task in self.stream_workflow_tasks(strategic_analysis, workflow_type):
+            workflow_tasks.append(task)
+            yield {"type": "task", "task": task}
+        
+        # Streamed tasks carry provisional dates until the whole dependency graph is known
+        self._schedule_tasks(workflow_tasks, datetime.now() + timedelta(days=1))
+        
+        yield {"type": "workflow", "workflow": self._build_workflow(strategic_analysis, workflow_type, workflow_tasks)}
+    
+    def _build_workflow(self, strategic_analysis: Dict[str, Any], workflow_type: WorkflowType, workflow_tasks: List[StrategicTask]) -> StrategicWorkflow:
+        """Assemble the workflow object from analysis, type and tasks"""
+        return StrategicWorkflow(
+            id=f"workflow_{uuid.uuid4().hex}",
             name=strategic_analysis.get("workflow_name", "Strategic Initiative"),
             description=strategic_analysis.get("description", ""),
             workflow_type=workflow_type,
@@ -130,151 +363,236 @@ class StrategicWorkflowEngine:
             success_metrics=strategic_analysis.get("success_metrics", []),
             tasks=workflow_tasks,
             created_at=datetime.now(),
-            estimated_completion=datetime.now() + timedelta(days=self.workflow_templates[workflow_type]["typical_duration"])
+            estimated_completion=max(
+                (task.due_date for task in workflow_tasks),
+                default=datetime.now() + timedelta(days=self._template(workflow_type).typical_duration)
+            )
         )
-        
-        return workflow
     
-    async def _get_strategic_analysis(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def _get_strategic_analysis(self, query: str, context: Dict[str, Any], context_str: Optional[str] = None) -> Dict[str, Any]:
         """Get comprehensive strategic analysis from Claude"""
         
-        context_str = self._format_context(context)
-        
-        prompt = f"""
-        Analyze this strategic product management question and provide comprehensive guidance:
+        prompt, call_site, complete_analysis = self._prepare_analysis(query, context, context_str)
         
-        Question: {query}
-        
-        Company Context:
-        {context_str}
+        await rate_limiter.acquire("anthropic")
+        with usage_ledger.track("anthropic", CLAUDE_MODEL, call_site) as call:
+            response = call.response = await self.async_claude.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=3000,
+                **anthropic_prompt(prompt, CLAUDE_MODEL)
+            )
         
-        Provide strategic analysis including:
-        1. **Situation Assessment**: Current state and key factors
-        2. **Strategic Recommendation**: Specific recommended approach
-        3. **Success Metrics**: How to measure success (3-5 specific metrics)
-        4. **Key Risks**: Primary risks and mitigation approaches
-        5. **Resource Requirements**: Team roles and time estimates needed
-        6. **Timeline**: Realistic timeline for execution
-        7. **Workflow Name**: Concise name for the resulting workflow
-        8. **Strategic Objective**: Clear objective statement
+        return complete_analysis(response.content[0].text)
+    
+    def _prepare_analysis(self, query: str, context: Dict[str, Any], context_str: Optional[str] = None) -> Tuple[PromptParts, str, Callable[[str], Dict[str, Any]]]:
+        """Full or delta analysis prompt, its ledger call site, and the parser for the answer
         
-        Focus on actionable, specific guidance that can be translated into executable tasks.
+        When this tenant's formatted context matches a previously analyzed one,
+        the prompt carries the cached situation assessment instead of the full
+        context and asks the model not to rewrite it.
         """
-        
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
+        if context_str is None:
+            context_str = self._format_context(context)
+        tenant, fingerprint = tenant_key(context), context_fingerprint(context_str)
+        cached = analysis_cache.get(tenant, fingerprint)
+        
+        if cached is None:
+            def complete_analysis(analysis_text: str) -> Dict[str, Any]:
+                analysis = self._parse_strategic_analysis(analysis_text)
+                analysis_cache.store(tenant, fingerprint, analysis)
+                return analysis
+            
+            return self._build_analysis_prompt(query, context_str), "workflow.analysis", complete_analysis
+        
+        def complete_delta_analysis(analysis_text: str) -> Dict[str, Any]:
+            analysis = self._parse_strategic_analysis(analysis_text)
+            if not analysis["description"] or analysis["description"].lower().startswith("unchanged"):
+                analysis["description"] = cached.situation_assessment
+            else:
+                # The question shifted the assessment; later follow-ups build on the new one
+                analysis_cache.store(tenant, fingerprint, analysis)
+            return analysis
+        
+        return self._build_delta_analysis_prompt(query, cached), "workflow.analysis_delta", complete_delta_analysis
+    
+    def _build_analysis_prompt(self, query: str, context_str: str) -> PromptParts:
+        """Build the strategic analysis prompt (static instructions + company context + question)"""
+        return PromptParts(
+            static=ANALYSIS_INSTRUCTIONS,
+            context=f"Company Context:\n{context_blocks.compact(context_str)}",
+            dynamic=f"Question: {query}"
         )
-        
-        # Parse response into structured data (simplified for MVP)
-        analysis_text = response.content[0].text
-        
-        # Extract key components (would use more sophisticated parsing in production)
-        return {
-            "full_analysis": analysis_text,
-            "workflow_name": self._extract_section(analysis_text, "Workflow Name"),
-            "description": self._extract_section(analysis_text, "Situation Assessment"),
-            "objective": self._extract_section(analysis_text, "Strategic Objective"),
-            "success_metrics": self._extract_list(analysis_text, "Success Metrics"),
-            "risks": self._extract_section(analysis_text, "Key Risks"),
-            "timeline": self._extract_section(analysis_text, "Timeline")
-        }
+    
+    def _build_delta_analysis_prompt(self, query: str, cached: CachedAnalysis) -> PromptParts:
+        """Build the follow-up prompt (static instructions + prior situation assessment + question)"""
+        return PromptParts(
+            static=ANALYSIS_DELTA_INSTRUCTIONS,
+            context=f"Context Fingerprint: {cached.fingerprint}\nPrior Situation Assessment:\n{context_blocks.compact(cached.situation_assessment, max_chars=1500)}",
+            dynamic=f"Question: {query}"
+        )
+    
+    def _parse_strategic_analysis(self, analysis_text: str) -> Dict[str, Any]:
+        """Parse analysis text into structured data (one pass over the sections)"""
+        
+        sections = extract_sections(analysis_text, ANALYSIS_SECTIONS.values())
+        analysis = {key: sections[name] for key, name in ANALYSIS_SECTIONS.items()}
+        analysis["success_metrics"] = extract_list_items(analysis["success_metrics"], limit=5)
+        analysis["workflow_name"] = analysis["workflow_name"].splitlines()[0].strip("*# ") if analysis["workflow_name"] else "Strategic Initiative"
+        analysis["full_analysis"] = analysis_text
+        return analysis
     
     async def _classify_workflow_type(self, query: str) -> WorkflowType:
         """Classify the type of workflow needed based on the strategic query"""
         
-        classification_prompt = f"""
-        Classify this product management query into one of these workflow types:
-        - competitive_response: Responding to competitor actions
-        - feature_prioritization: Deciding between features or initiatives  
-        - market_expansion: Entering new markets or segments
-        - risk_mitigation: Addressing identified risks or problems
-        - strategic_planning: Long-term strategic planning and roadmapping
+        # Local classifier first; only low-confidence queries pay for an LLM call
+        result = workflow_classifier.classify(query)
+        fallback = not workflow_classifier.is_confident(result)
+        label = result.label
         
-        Query: {query}
+        if fallback:
+            label = await self._classify_workflow_type_llm(query)
         
-        Respond with just the workflow type (e.g., "competitive_response"):
-        """
+        # Free-form LLM answers are mapped before they reach the classifier's training data
+        try:
+            workflow_type = WorkflowType(label)
+        except ValueError:
+            workflow_type = WorkflowType.STRATEGIC_PLANNING
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=50,
-            messages=[{"role": "user", "content": classification_prompt}]
-        )
+        if fallback:
+            # Logged LLM answers become training data for the local model
+            workflow_classifier.learn(query, workflow_type.value)
         
-        classification = response.content[0].text.strip().lower()
+        workflow_classifier.record_outcome(result, workflow_type.value, fallback)
+        return workflow_type
+    
+    async def _classify_workflow_type_llm(self, query: str) -> str:
+        """Ask Claude for the workflow type (fallback for low-confidence queries)"""
         
-        # Map to enum (with fallback)
-        type_mapping = {
-            "competitive_response": WorkflowType.COMPETITIVE_RESPONSE,
-            "feature_prioritization": WorkflowType.FEATURE_PRIORITIZATION,
-            "market_expansion": WorkflowType.MARKET_EXPANSION,
-            "risk_mitigation": WorkflowType.RISK_MITIGATION,
-            "strategic_planning": WorkflowType.STRATEGIC_PLANNING
-        }
+        classification_prompt = PromptParts(static=CLASSIFICATION_INSTRUCTIONS, dynamic=f"Query: {query}")
         
-        return type_mapping.get(classification, WorkflowType.STRATEGIC_PLANNING)
+        await rate_limiter.acquire("anthropic")
+        with usage_ledger.track("anthropic", CLAUDE_MODEL, "workflow.classification") as call:
+            response = call.response = await self.async_claude.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=50,
+                **anthropic_prompt(classification_prompt, CLAUDE_MODEL)
+            )
+        
+        return response.content[0].text.strip().lower()
     
     async def _generate_workflow_tasks(self, strategic_analysis: Dict, workflow_type: WorkflowType, context: Dict) -> List[StrategicTask]:
         """Generate specific executable tasks from strategic analysis"""
         
-        template = self.workflow_templates[workflow_type]
-        
-        task_generation_prompt = f"""
-        Based on this strategic analysis, create a detailed task breakdown for execution:
-        
-        Strategic Analysis:
-        {strategic_analysis.get('full_analysis', '')}
-        
-        Workflow Type: {workflow_type.value}
-        Standard Tasks for this type: {template['standard_tasks']}
-        
-        For each task, provide:
-        1. **Task Title**: Clear, actionable title
-        2. **Description**: Specific deliverables and approach
-        3. **Assignee Role**: Who should own this (Product Manager, Engineering Lead, etc.)
-        4. **Estimated Hours**: Realistic time estimate
-        5. **Priority**: Critical/High/Medium/Low
-        6. **Strategic Rationale**: Why this task supports the strategic objective
-        7. **Success Criteria**: How to know the task is complete
-        8. **Dependencies**: Which other tasks must be completed first
+        await rate_limiter.acquire("anthropic")
+        with usage_ledger.track("anthropic", CLAUDE_MODEL, "workflow.task_generation") as call:
+            response = call.response = await self.async_claude.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=4000,
+                tools=[TASK_TOOL],
+                tool_choice={"type": "tool", "name": TASK_TOOL["name"]},
+                **anthropic_prompt(self._build_task_prompt(strategic_analysis, workflow_type), CLAUDE_MODEL)
+            )
         
-        Generate 6-10 specific tasks that will execute this strategic recommendation.
+        tasks_data = []
+        for block in response.content:
+            if block.type == "tool_use":
+                tasks_data = block.input.get("tasks", [])
+            elif block.type == "text" and not tasks_data:
+                # Model answered in plain text: take any JSON array it contains
+                tasks_data = IncrementalJSONArrayParser().parse_all(block.text)
         
-        Format as JSON array with each task as an object.
-        """
+        return self._tasks_or_fallback(tasks_data, workflow_type)
+    
+    async def stream_workflow_tasks(self, strategic_analysis: Dict, workflow_type: WorkflowType) -> AsyncIterator[StrategicTask]:
+        """Yield each task as soon as its JSON object has streamed in"""
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": task_generation_prompt}]
+        parser = IncrementalJSONArrayParser()
+        base_date = datetime.now() + timedelta(days=1)  # Start tomorrow
+        count = 0
+        
+        await rate_limiter.acquire("anthropic")
+        with usage_ledger.track("anthropic", CLAUDE_MODEL, "workflow.task_generation") as call:
+            async with self.async_claude.messages.stream(
+                model=CLAUDE_MODEL,
+                max_tokens=4000,
+                tools=[TASK_TOOL],
+                tool_choice={"type": "tool", "name": TASK_TOOL["name"]},
+                **anthropic_prompt(self._build_task_prompt(strategic_analysis, workflow_type), CLAUDE_MODEL)
+            ) as stream:
+                async for event in stream:
+                    if event.type != "content_block_delta":
+                        continue
+                    delta = event.delta
+                    fragment = delta.partial_json if delta.type == "input_json_delta" else getattr(delta, "text", "")
+                    for task_data in parser.feed(fragment):
+                        if isinstance(task_data, dict):
+                            yield self._task_from_data(task_data, count, base_date)
+                            count += 1
+                call.response = await stream.get_final_message()
+        
+        if count == 0:
+            for task in self._tasks_or_fallback([], workflow_type):
+                yield task
+    
+    def _build_task_prompt(self, strategic_analysis: Dict, workflow_type: WorkflowType) -> PromptParts:
+        """Task generation prompt (static instructions + workflow template + analysis)"""
+        template = self._template(workflow_type)
+        return PromptParts(
+            static=TASK_GENERATION_INSTRUCTIONS,
+            context=f"Workflow Type: {workflow_type.value}\nStandard Tasks for this type: {list(template.standard_tasks)}",
+            dynamic=f"Strategic Analysis:\n{strategic_analysis.get('full_analysis', '')}"
         )
+    
+    def _tasks_or_fallback(self, tasks_data: List[Any], workflow_type: WorkflowType) -> List[StrategicTask]:
+        """Convert task dicts to StrategicTasks; template tasks if the model returned none"""
+        tasks_data = [task_data for task_data in tasks_data if isinstance(task_data, dict)]
+        if not tasks_data:
+            tasks_data = self._template_tasks(workflow_type)
         
-        # Parse tasks (simplified for MVP - would use structured JSON parsing)
-        tasks_data = self._parse_tasks_from_response(response.content[0].text)
-        
-        # Convert to StrategicTask objects
-        tasks = []
         base_date = datetime.now() + timedelta(days=1)  # Start tomorrow
-        
-        for i, task_data in enumerate(tasks_data):
-            task = StrategicTask(
-                id=f"task_{int(datetime.now().timestamp())}_{i}",
-                title=task_data.get("title", f"Strategic Task {i+1}"),
-                description=task_data.get("description", ""),
-                assignee_role=task_data.get("assignee_role", "Product Manager"),
-                estimated_hours=task_data.get("estimated_hours", 8),
-                priority=TaskPriority(task_data.get("priority", "medium").lower()),
-                strategic_rationale=task_data.get("strategic_rationale", ""),
-                success_criteria=task_data.get("success_criteria", ""),
-                dependencies=task_data.get("dependencies", []),
-                due_date=base_date + timedelta(days=i*2)  # Stagger task due dates
-            )
-            tasks.append(task)
-        
+        tasks = [self._task_from_data(task_data, i, base_date) for i, task_data in enumerate(tasks_data)]
+        return self._schedule_tasks(tasks, base_date)
+    
+    def _schedule_tasks(self, tasks: List[StrategicTask], base_date: datetime) -> List[StrategicTask]:
+        """Set due dates from dependencies, estimates and role capacity (keeps staggered dates on a cycle)"""
+        try:
+            apply_due_dates(tasks, base_date)
+        except WorkflowCycleError as e:
+            print(f"⚠️ Could not schedule workflow tasks: {e}")
         return tasks
     
+    def _task_from_data(self, task_data: Dict[str, Any], index: int, base_date: datetime) -> StrategicTask:
+        """Build one StrategicTask from schema-shaped task JSON"""
+        try:
+            priority = TaskPriority(str(task_data.get("priority", "medium")).lower())
+        except ValueError:
+            priority = TaskPriority.MEDIUM
+        
+        try:
+            estimated_hours = int(task_data.get("estimated_hours", 8))
+        except (TypeError, ValueError):
+            estimated_hours = 8
+        
+        # Models sometimes send one title instead of a list, or objects instead of titles
+        dependencies = task_data.get("dependencies") or []
+        if isinstance(dependencies, str):
+            dependencies = [dependencies]
+        elif not isinstance(dependencies, (list, tuple)):
+            dependencies = []
+        
+        return StrategicTask(
+            id=f"task_{uuid.uuid4().hex[:12]}_{index}",
+            title=task_data.get("title", f"Strategic Task {index+1}"),
+            description=task_data.get("description", ""),
+            assignee_role=task_data.get("assignee_role", "Product Manager"),
+            estimated_hours=estimated_hours,
+            priority=priority,
+            strategic_rationale=task_data.get("strategic_rationale", ""),
+            success_criteria=task_data.get("success_criteria", ""),
+            dependencies=[dependency for dependency in dependencies if isinstance(dependency, str)],
+            due_date=base_date + timedelta(days=index*2)  # Stagger task due dates
+        )
+    
     def _format_context(self, context: Dict[str, Any]) -> str:
         """Format company context for AI analysis"""
         formatted_context = []
@@ -297,146 +615,30 @@ class StrategicWorkflowEngine:
         
         return "\n".join(formatted_context) if formatted_context else "No additional context provided"
     
-    def _extract_section(self, text: str, section_name: str) -> str:
-        """Extract a specific section from analysis text"""
-        lines = text.split('\n')
-        section_content = []
-        in_section = False
-        
-        for line in lines:
-            if section_name.lower() in line.lower() and ('**' in line or '#' in line):
-                in_section = True
-                continue
-            elif in_section and ('**' in line or line.startswith('#')):
-                break
-            elif in_section:
-                section_content.append(line)
-        
-        return '\n'.join(section_content).strip()
-    
-    def _extract_list(self, text: str, section_name: str) -> List[str]:
-        """Extract a list from a section"""
-        section_text = self._extract_section(text, section_name)
-        
-        # Extract bullet points or numbered items
-        items = []
-        for line in section_text.split('\n'):
-            line = line.strip()
-            if line.startswith('-') or line.startswith('*') or (line and line[0].isdigit()):
-                # Remove bullet point or number prefix
-                clean_line = line.lstrip('-*0123456789. ').strip()
-                if clean_line:
-                    items.append(clean_line)
-        
-        return items[:5]  # Limit to 5 items
-    
-    def _parse_tasks_from_response(self, response_text: str) -> List[Dict]:
-        """Parse task details from AI response (simplified for MVP)"""
-        
-        # This is a simplified parser - in production would use structured JSON
-        # For MVP, create standard tasks based on workflow type
-        
-        standard_tasks = [
-            {
-                "title": "Strategic Analysis and Planning",
-                "description": "Complete detailed analysis of the strategic situation and create execution plan",
-                "assignee_role": "Product Manager", 
-                "estimated_hours": 16,
-                "priority": "high",
-                "strategic_rationale": "Foundation for all subsequent strategic actions",
-                "success_criteria": "Comprehensive analysis document with clear recommendations",
-                "dependencies": []
-            },
-            {
-                "title": "Stakeholder Alignment and Communication",
-                "description": "Align key stakeholders on strategic approach and get buy-in for execution plan",
-                "assignee_role": "Product Manager",
-                "estimated_hours": 8,
-                "priority": "critical",
-                "strategic_rationale": "Ensures organizational support for strategic initiative",
-                "success_criteria": "Stakeholder sign-off on strategic approach",
-                "dependencies": ["Strategic Analysis and Planning"]
-            },
-            {
-                "title": "Resource Planning and Allocation",
-                "description": "Determine resource requirements and allocate team capacity for execution",
-                "assignee_role": "Engineering Lead",
-                "estimated_hours": 12,
-                "priority": "high",
-                "strategic_rationale": "Ensures adequate resources for successful execution",
-                "success_criteria": "Resource plan with clear allocations and timeline",
-                "dependencies": ["Strategic Analysis and Planning"]
-            },
-            {
-                "title": "Risk Assessment and Mitigation Planning",
-                "description": "Identify potential risks and create mitigation strategies",
-                "assignee_role": "Product Manager",
-                "estimated_hours": 6,
-                "priority": "medium",
-                "strategic_rationale": "Proactive risk management ensures smoother execution",
-                "success_criteria": "Risk registry with mitigation plans for top risks",
-                "dependencies": ["Strategic Analysis and Planning"]
-            },
-            {
-                "title": "Success Metrics and Tracking Setup",
-                "description": "Define success metrics and set up tracking and reporting mechanisms",
-                "assignee_role": "Data Analyst",
-                "estimated_hours": 10,
-                "priority": "medium",
-                "strategic_rationale": "Enables measurement of strategic initiative success",
-                "success_criteria": "Metrics dashboard with baseline measurements",
-                "dependencies": ["Strategic Analysis and Planning"]
-            },
+    def _template_tasks(self, workflow_type: WorkflowType) -> List[Dict]:
+        """Workflow template's standard tasks, used when generation returns nothing usable"""
+        template = self._template(workflow_type)
+        roles = template.critical_roles
+        
+        return [
             {
-                "title": "Execution Kick-off and Initial Implementation",
-                "description": "Begin execution of strategic initiative with initial implementation phase",
-                "assignee_role": "Product Manager",
-                "estimated_hours": 20,
-                "priority": "critical",
-                "strategic_rationale": "Translates strategy into concrete action and momentum",
-                "success_criteria": "First milestone of strategic initiative completed",
-                "dependencies": ["Stakeholder Alignment and Communication", "Resource Planning and Allocation"]
+                "title": title,
+                "description": f"{title} for the {workflow_type.value.replace('_', ' ')} workflow",
+                "assignee_role": roles[i % len(roles)],
+                "priority": "high" if i == 0 else "medium",
+                "dependencies": [template.standard_tasks[i - 1]] if i else []
             }
+            for i, title in enumerate(template.standard_tasks)
         ]
-        
-        return standard_tasks
     
-    async def sync_workflow_to_external_tools(self, workflow: StrategicWorkflow, integration_config: Dict) -> Dict[str, Any]:
-        """Sync generated workflow to external PM tools (Jira, Linear, etc.)"""
+    async def sync_workflow_to_external_tools(self, workflow: StrategicWorkflow, integration_config: Dict,
+                                              previous_state: Optional[Dict[str, Dict]] = None) -> Dict[str, Any]:
+        """Sync generated workflow to external PM tools (Jira, Linear)
         
-        sync_results = {}
-        
-        # Example integration with Jira (would be implemented based on specific tool APIs)
-        if integration_config.get("jira_enabled"):
-            jira_project_key = integration_config.get("jira_project_key")
-            
-            # Create epic for strategic workflow
-            epic_data = {
-                "summary": workflow.name,
-                "description": f"Strategic Objective: {workflow.strategic_objective}\n\n{workflow.description}",
-                "issuetype": {"name": "Epic"},
-                "project": {"key": jira_project_key}
-            }
-            
-            # Create individual tasks as stories under epic
-            task_sync_results = []
-            for task in workflow.tasks:
-                story_data = {
-                    "summary": task.title,
-                    "description": f"Strategic Rationale: {task.strategic_rationale}\n\nSuccess Criteria: {task.success_criteria}\n\n{task.description}",
-                    "issuetype": {"name": "Story"},
-                    "project": {"key": jira_project_key},
-                    "priority": {"name": task.priority.value.title()},
-                    "duedate": task.due_date.strftime("%Y-%m-%d")
-                }
-                task_sync_results.append({"task_id": task.id, "jira_data": story_data})
-            
-            sync_results["jira"] = {
-                "epic": epic_data,
-                "stories": task_sync_results
-            }
-        
-        return sync_results
+        Only tasks that are new or changed since previous_state are pushed; each
+        tool's result carries the "state" to pass back on the next sync.
+        """
+        return await sync_workflow(workflow, integration_config, previous_state)
 
 # Example usage
 async def example_strategic_workflow():
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+PM33 Workflow Template Registry
+Versioned workflow templates loaded once from JSON data files and shared by every engine
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+TEMPLATE_DIR = Path(os.getenv("PM33_WORKFLOW_TEMPLATE_DIR", Path(__file__).parent / "workflow_templates"))
+# Seconds between checks for edited template files (0 disables hot reload)
+TEMPLATE_RELOAD_INTERVAL = float(os.getenv("PM33_TEMPLATE_RELOAD_INTERVAL", "5"))
+
+
+class TemplateValidationError(ValueError):
+    """A template file is malformed or a required workflow type has no template."""
+
+
+@dataclass(frozen=True)
+class WorkflowTemplate:
+    workflow_type: str
+    version: int
+    typical_duration: int  # days
+    standard_tasks: Tuple[str, ...]
+    critical_roles: Tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: str) -> "WorkflowTemplate":
+        """Validate one template document"""
+        def require(name, kind):
+            value = data.get(name)
+            if not isinstance(value, kind) or isinstance(value, bool):
+                raise TemplateValidationError(f"{source}: '{name}' must be {kind.__name__}")
+            return value
+
+        workflow_type = require("workflow_type", str)
+        version = require("version", int)
+        typical_duration = require("typical_duration", int)
+        standard_tasks = require("standard_tasks", list)
+        critical_roles = require("critical_roles", list)
+
+        if typical_duration <= 0:
+            raise TemplateValidationError(f"{source}: 'typical_duration' must be positive")
+        for name, values in (("standard_tasks", standard_tasks), ("critical_roles", critical_roles)):
+            if not values or not all(isinstance(value, str) and value.strip() for value in values):
+                raise TemplateValidationError(f"{source}: '{name}' must be a non-empty list of strings")
+
+        return cls(workflow_type, version, typical_duration, tuple(standard_tasks), tuple(critical_roles))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "workflow_type": self.workflow_type,
+            "version": self.version,
+            "typical_duration": self.typical_duration,
+            "standard_tasks": list(self.standard_tasks),
+            "critical_roles": list(self.critical_roles),
+        }
+
+
+class TemplateRegistry:
+    """Immutable snapshot of workflow templates, swapped atomically on reload
+
+    Readers get a read-only mapping that never changes under them; a reload
+    that fails validation keeps the previous snapshot and reports the error
+    once, and hot reload retries only after the files change again.
+    """
+
+    def __init__(self, directory: Path = TEMPLATE_DIR, required_types: Iterable[str] = (),
+                 reload_interval: float = TEMPLATE_RELOAD_INTERVAL):
+        self.directory = Path(directory)
+        self.required_types = tuple(required_types)
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._templates: Mapping[str, WorkflowTemplate] = MappingProxyType({})
+        self._signature: Tuple = ()
+        self._checked_at = 0.0
+        self.counters = {"loads": 0, "reload_errors": 0}
+        self.last_error: Optional[str] = None
+        self.load()
+
+    def load(self) -> Mapping[str, WorkflowTemplate]:
+        """Read and validate every template file; raises TemplateValidationError"""
+        signature = self._file_signature()
+        templates = {}
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                raise TemplateValidationError(f"{path.name}: {e}") from e
+            template = WorkflowTemplate.from_dict(data, path.name)
+            if template.workflow_type in templates:
+                raise TemplateValidationError(f"{path.name}: duplicate template for '{template.workflow_type}'")
+            templates[template.workflow_type] = template
+
+        missing = [workflow_type for workflow_type in self.required_types if workflow_type not in templates]
+        if missing:
+            raise TemplateValidationError(f"No workflow template for: {', '.join(missing)}")
+
+        with self._lock:
+            self._templates = MappingProxyType(templates)
+            self._signature = signature
+            self._checked_at = time.monotonic()
+            self.counters["loads"] += 1
+            self.last_error = None
+        return self._templates
+
+    def reload(self) -> bool:
+        """Reload from disk, keeping the current templates if the new files are invalid"""
+        signature = self._file_signature()
+        try:
+            self.load()
+            return True
+        except TemplateValidationError as e:
+            with self._lock:
+                # Remember the bad files so templates() doesn't re-parse them on every check
+                self._signature = signature
+                self.counters["reload_errors"] += 1
+                self.last_error = str(e)
+            print(f"⚠️ Workflow templates not reloaded: {e}")
+            return False
+
+    def templates(self) -> Mapping[str, WorkflowTemplate]:
+        """Current snapshot (picks up edited files at most every reload_interval seconds)"""
+        if self.reload_interval > 0 and time.monotonic() - self._checked_at >= self.reload_interval:
+            self._checked_at = time.monotonic()
+            if self._file_signature() != self._signature:
+                self.reload()
+        return self._templates
+
+    def get(self, workflow_type: str) -> WorkflowTemplate:
+        return self.templates()[workflow_type]
+
+    def versions(self) -> Dict[str, int]:
+        return {workflow_type: template.version for workflow_type, template in self.templates().items()}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "directory": str(self.directory),
+            "versions": self.versions(),
+            "last_error": self.last_error,
+        }
+
+    def _file_signature(self) -> Tuple:
+        try:
+            return tuple(
+                (path.name, stat.st_mtime_ns, stat.st_size)
+                for path in sorted(self.directory.glob("*.json"))
+                for stat in (path.stat(),)
+            )
+        except OSError:
+            return ()
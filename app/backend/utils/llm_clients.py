@@ -0,0 +1,217 @@
+"""Process-wide pooled HTTP and LLM provider clients.
+
+Every PM33 component that talks to an LLM provider gets its SDK client from
+here instead of constructing its own. Each provider gets one keep-alive HTTP
+transport for synchronous clients and one per event loop for async clients
+(connections are bound to the loop that opened them). HTTP/2 is enabled when
+the optional ``h2`` package is installed.
+
+Transports are built with the SDK's own ``DefaultHttpxClient`` classes so the
+pool limits apply whichever httpx distribution the installed SDK is built on.
+
+This module deliberately does not import ``utils.config`` so it can be used
+by the MCP server, marketing scripts and root-level demos without a database.
+"""
+
+import asyncio
+import atexit
+import importlib
+import os
+import sys
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+# Pool limits (overridable per deployment)
+LLM_MAX_CONNECTIONS = int(os.getenv("PM33_LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PM33_LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("PM33_LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("PM33_LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("PM33_LLM_READ_TIMEOUT", "60"))
+LLM_HTTP2 = os.getenv("PM33_LLM_HTTP2", "auto").lower()
+
+# provider -> (module, sync class, async class)
+PROVIDER_CLASSES: Dict[str, Tuple[str, str, str]] = {
+    "anthropic": ("anthropic", "Anthropic", "AsyncAnthropic"),
+    "openai": ("openai", "OpenAI", "AsyncOpenAI"),
+    "groq": ("groq", "Groq", "AsyncGroq"),
+    "together": ("together", "Together", "AsyncTogether"),
+}
+
+PROVIDER_API_KEY_ENV = {
+    "anthropic": "ANTHROPIC_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "groq": "GROQ_API_KEY",
+    "together": "TOGETHER_API_KEY",
+}
+
+
+def http2_enabled() -> bool:
+    """HTTP/2 is used when requested (or 'auto') and the h2 package is importable."""
+    if LLM_HTTP2 in ("0", "false", "no", "off"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_http_client(provider: str, is_async: bool) -> Any:
+    """Pooled keep-alive transport built with the provider SDK's httpx client class."""
+    module = importlib.import_module(PROVIDER_CLASSES[provider][0])
+    client_class = getattr(module, "DefaultAsyncHttpxClient" if is_async else "DefaultHttpxClient")
+    # The SDK may be built on httpx or a fork of it; limits must come from the same package
+    httpx_module = sys.modules[client_class.__mro__[1].__module__.split(".")[0]]
+
+    return client_class(
+        http2=http2_enabled(),
+        limits=httpx_module.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx_module.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+    )
+
+
+class LLMClientRegistry:
+    """Caches provider SDK clients on top of shared, pooled HTTP transports."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # provider -> pooled sync transport
+        self._sync_http: Dict[str, Any] = {}
+        # (provider, api key) -> sync SDK client
+        self._sync_clients: Dict[Tuple[str, str], Any] = {}
+        # event loop -> {"http": {provider: transport}, "clients": {(provider, key): client}}
+        self._async_pools: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self.counters = {"sync_clients_created": 0, "async_clients_created": 0, "client_reuses": 0}
+
+    def get(self, provider: str, api_key: Optional[str] = None, **options) -> Any:
+        """Synchronous SDK client for provider, reused across the process."""
+        api_key = self._resolve_key(provider, api_key)
+        key = (provider, api_key)
+
+        with self._lock:
+            client = self._sync_clients.get(key)
+            if client is not None and not options:
+                self.counters["client_reuses"] += 1
+                return client
+
+            http_client = self._sync_http.get(provider)
+            if http_client is None or http_client.is_closed:
+                http_client = self._sync_http[provider] = _build_http_client(provider, is_async=False)
+
+        client = self._construct(provider, 1, api_key, http_client, options)
+        if options:
+            return client
+
+        with self._lock:
+            # Another thread may have won the race; keep the first one
+            if key not in self._sync_clients:
+                self._sync_clients[key] = client
+                self.counters["sync_clients_created"] += 1
+            return self._sync_clients[key]
+
+    def get_async(self, provider: str, api_key: Optional[str] = None, **options) -> Any:
+        """Async SDK client for provider bound to the running event loop.
+
+        Outside a running loop the client gets a private transport; call sites
+        that hold async clients across requests should resolve them through
+        this method at call time instead.
+        """
+        api_key = self._resolve_key(provider, api_key)
+        key = (provider, api_key)
+        pool = self._async_pool()
+
+        with self._lock:
+            client = pool["clients"].get(key)
+            if client is not None and not options:
+                self.counters["client_reuses"] += 1
+                return client
+
+            http_client = pool["http"].get(provider)
+            if http_client is None or http_client.is_closed:
+                http_client = pool["http"][provider] = _build_http_client(provider, is_async=True)
+
+        client = self._construct(provider, 2, api_key, http_client, options)
+        if options:
+            return client
+
+        with self._lock:
+            if key not in pool["clients"]:
+                pool["clients"][key] = client
+                self.counters["async_clients_created"] += 1
+            return pool["clients"][key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and client counters for status endpoints."""
+        with self._lock:
+            return {
+                **self.counters,
+                "pooled_providers": sorted(self._sync_http),
+                "cached_sync_clients": len(self._sync_clients),
+                "event_loops": len(self._async_pools),
+                "http2": http2_enabled(),
+                "max_connections": LLM_MAX_CONNECTIONS,
+                "max_keepalive_connections": LLM_MAX_KEEPALIVE_CONNECTIONS,
+                "keepalive_expiry": LLM_KEEPALIVE_EXPIRY,
+            }
+
+    def close(self):
+        """Close the shared sync transports (registered with atexit)."""
+        with self._lock:
+            transports = list(self._sync_http.values())
+            self._sync_http.clear()
+            self._sync_clients.clear()
+        for http_client in transports:
+            http_client.close()
+
+    async def aclose(self):
+        """Close the async transports of the running loop (call on app shutdown)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._async_pools.pop(loop, None)
+        if pool is not None:
+            for http_client in pool["http"].values():
+                await http_client.aclose()
+
+    def _async_pool(self) -> Dict[str, Any]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to bind to: hand out an unshared pool
+            return {"http": {}, "clients": {}}
+
+        with self._lock:
+            pool = self._async_pools.get(loop)
+            if pool is None:
+                pool = self._async_pools[loop] = {"http": {}, "clients": {}}
+            return pool
+
+    @staticmethod
+    def _resolve_key(provider: str, api_key: Optional[str]) -> str:
+        if provider not in PROVIDER_CLASSES:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+        return api_key or os.getenv(PROVIDER_API_KEY_ENV[provider], "")
+
+    @staticmethod
+    def _construct(provider: str, class_index: int, api_key: str, http_client, options: Dict) -> Any:
+        module = importlib.import_module(PROVIDER_CLASSES[provider][0])
+        client_class = getattr(module, PROVIDER_CLASSES[provider][class_index])
+        return client_class(api_key=api_key or None, http_client=http_client, **options)
+
+
+llm_clients = LLMClientRegistry()
+atexit.register(llm_clients.close)
+
+
+def get_llm_client(provider: str, api_key: Optional[str] = None, **options) -> Any:
+    """Shared synchronous SDK client for provider."""
+    return llm_clients.get(provider, api_key, **options)
+
+
+def get_async_llm_client(provider: str, api_key: Optional[str] = None, **options) -> Any:
+    """Shared async SDK client for provider on the running event loop."""
+    return llm_clients.get_async(provider, api_key, **options)
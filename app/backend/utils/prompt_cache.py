@@ -0,0 +1,173 @@
+"""Prompt prefix caching helpers.
+
+Prompt builders return ``PromptParts``: a static instruction prefix that is
+identical on every call, an optional semi-static context block (company
+context) and the per-request dynamic suffix (the question). Providers that
+support prompt caching get the stable parts first so the cached prefix can be
+reused:
+
+- Anthropic: static and context go in ``system`` blocks with a single
+  ``cache_control`` breakpoint on the last of them. Anthropic only caches
+  prefixes of at least 1024 tokens (2048 on Haiku); most of our static
+  prefixes are a few hundred tokens, so the breakpoint is only set when a
+  context block brings the prefix over the model's minimum. Prompts without
+  a context block (classification, the MCP analysis) are not cached.
+- OpenAI: static and context lead the system message so its automatic
+  prefix cache matches across calls.
+
+Context blocks are also compacted locally (repeated long lines removed, blank
+runs collapsed, truncated on a line boundary) and memoized by content hash,
+which is the only saving available on providers without prompt caching.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from utils.usage_ledger import usage_ledger
+
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+# Anthropic ignores cache_control on shorter prefixes (and still bills the request normally)
+CACHE_MIN_TOKENS = 1024
+CACHE_MIN_TOKENS_BY_MODEL = {"claude-3-haiku": 2048, "claude-3-5-haiku": 2048}
+
+# Rough count for the minimum check; the prefix only needs to clear it, not be billed from it
+CHARS_PER_TOKEN = 4
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Shorter lines (headers, separators, list stubs) carry structure and are never dropped
+DEDUPE_MIN_LINE_CHARS = 20
+
+
+@dataclass(frozen=True)
+class PromptParts:
+    """A prompt split into cacheable prefix and per-request suffix."""
+
+    static: str
+    context: str = ""
+    dynamic: str = ""
+
+    def text(self) -> str:
+        """The whole prompt as one string (for providers without message roles)."""
+        return "\n\n".join(part for part in (self.static, self.context, self.dynamic) if part)
+
+
+def cache_min_tokens(model: str) -> int:
+    """Smallest prefix (in tokens) Anthropic will cache for ``model``."""
+    for prefix, minimum in CACHE_MIN_TOKENS_BY_MODEL.items():
+        if model.startswith(prefix):
+            return minimum
+    return CACHE_MIN_TOKENS
+
+
+def anthropic_prompt(parts: PromptParts, model: str) -> Dict[str, Any]:
+    """``system``/``messages`` kwargs for messages.create.
+
+    The stable blocks share one cache breakpoint on the last of them, set only
+    when they are long enough for ``model`` to cache.
+    """
+    system = [{"type": "text", "text": parts.static}]
+    if parts.context:
+        system.append({"type": "text", "text": parts.context})
+    prefix_chars = len(parts.static) + len(parts.context)
+    if prefix_chars // CHARS_PER_TOKEN >= cache_min_tokens(model):
+        system[-1]["cache_control"] = EPHEMERAL_CACHE
+    return {
+        "system": system,
+        "messages": [{"role": "user", "content": parts.dynamic}],
+    }
+
+
+def chat_messages(parts: PromptParts) -> List[Dict[str, str]]:
+    """OpenAI-compatible messages with the stable prefix first."""
+    prefix = "\n\n".join(part for part in (parts.static, parts.context) if part)
+    return [
+        {"role": "system", "content": prefix},
+        {"role": "user", "content": parts.dynamic},
+    ]
+
+
+class ContextBlockCache:
+    """LRU of compacted context blocks keyed by content hash."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._blocks: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "chars_in": 0, "chars_out": 0}
+
+    def compact(self, context: str, max_chars: Optional[int] = None) -> str:
+        """Deduplicated (and optionally truncated) context, memoized by content."""
+        key = (hashlib.sha256(context.encode("utf-8")).hexdigest(), max_chars)
+
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                self.counters["hits"] += 1
+                return block
+
+        block = self._dedupe(context)
+        if max_chars is not None and len(block) > max_chars:
+            cut = block.rfind("\n", 0, max_chars)
+            block = block[:cut if cut > max_chars // 2 else max_chars]
+
+        with self._lock:
+            self.counters["misses"] += 1
+            self.counters["chars_in"] += len(context)
+            self.counters["chars_out"] += len(block)
+            self._blocks[key] = block
+            while len(self._blocks) > self.max_entries:
+                self._blocks.popitem(last=False)
+        return block
+
+    @staticmethod
+    def _dedupe(context: str) -> str:
+        seen = set()
+        lines = []
+        for line in context.splitlines():
+            normalized = _WHITESPACE.sub(" ", line).strip().lower()
+            if not normalized:
+                if lines and lines[-1] != "":
+                    lines.append("")
+                continue
+            if len(normalized) >= DEDUPE_MIN_LINE_CHARS:
+                if normalized in seen:
+                    continue
+                seen.add(normalized)
+            lines.append(line.rstrip())
+        return "\n".join(lines).strip()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            size = len(self._blocks)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "size": size,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+            "dedupe_ratio": round(1 - counters["chars_out"] / counters["chars_in"], 3) if counters["chars_in"] else 0.0,
+        }
+
+
+context_blocks = ContextBlockCache()
+
+
+def prompt_cache_stats() -> Dict[str, Any]:
+    """Provider prompt-cache hit rates (from the usage ledger) and local dedupe stats."""
+    providers = {}
+    for engine, totals in usage_ledger.aggregates("engine").items():
+        prompt_tokens = totals["input_tokens"] + totals["cache_read_tokens"] + totals["cache_write_tokens"]
+        providers[engine] = {
+            "calls": totals["calls"],
+            "cache_read_tokens": totals["cache_read_tokens"],
+            "cache_write_tokens": totals["cache_write_tokens"],
+            "token_hit_rate": round(totals["cache_read_tokens"] / prompt_tokens, 3) if prompt_tokens else 0.0,
+        }
+    return {"providers": providers, "local_context": context_blocks.stats()}
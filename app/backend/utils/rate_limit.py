@@ -0,0 +1,107 @@
+"""Per-provider request rate limiting for outgoing LLM calls.
+
+Each provider gets an asyncio token bucket sized from its requests-per-minute
+budget, so bursts of concurrent work (batch workflow generation) queue locally
+instead of tripping provider 429s. Limits come from
+``PM33_<PROVIDER>_REQUESTS_PER_MINUTE``; 0 disables limiting for a provider.
+
+Buckets are bound to the event loop they were created on, like the async
+clients in ``utils.llm_clients``.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict
+
+DEFAULT_REQUESTS_PER_MINUTE = {
+    "anthropic": 50,
+    "openai": 500,
+    "groq": 30,
+    "together": 60,
+}
+
+
+def requests_per_minute(provider: str) -> float:
+    """Configured request budget for provider (0 = unlimited)."""
+    default = DEFAULT_REQUESTS_PER_MINUTE.get(provider, 60)
+    return float(os.getenv(f"PM33_{provider.upper()}_REQUESTS_PER_MINUTE", default))
+
+
+class AsyncTokenBucket:
+    """Token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.counters = {"acquired": 0, "waited": 0, "wait_seconds": 0.0}
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until tokens are available and take them (FIFO under the lock)."""
+        async with self._lock:
+            waited = 0.0
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+                delay = (tokens - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+            self.counters["acquired"] += 1
+            if waited:
+                self.counters["waited"] += 1
+                self.counters["wait_seconds"] += waited
+
+
+class ProviderRateLimiter:
+    """Token buckets per (event loop, provider)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    async def acquire(self, provider: str):
+        """Wait for a request slot on provider (no-op when its limit is 0)."""
+        bucket = self._bucket(provider)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def _bucket(self, provider: str):
+        rpm = requests_per_minute(provider)
+        if rpm <= 0:
+            return None
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            buckets = self._buckets.setdefault(loop, {})
+            bucket = buckets.get(provider)
+            if bucket is None:
+                # Allow a burst of up to a tenth of the minute's budget
+                bucket = buckets[provider] = AsyncTokenBucket(rpm / 60.0, max(1.0, rpm / 10.0))
+            return bucket
+
+    def stats(self) -> Dict[str, Any]:
+        """Request budgets and queueing counters per provider."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for buckets in list(self._buckets.values()):
+                for provider, bucket in buckets.items():
+                    entry = totals.setdefault(provider, {"requests_per_minute": requests_per_minute(provider),
+                                                         "acquired": 0, "waited": 0, "wait_seconds": 0.0})
+                    for name, value in bucket.counters.items():
+                        entry[name] += value
+        for entry in totals.values():
+            entry["wait_seconds"] = round(entry["wait_seconds"], 3)
+        return totals
+
+
+rate_limiter = ProviderRateLimiter()
@@ -0,0 +1,108 @@
+"""Helpers for structured (tool / JSON) LLM output.
+
+``IncrementalJSONArrayParser`` is fed raw JSON text as it streams (tool-use
+``input_json_delta`` fragments or a plain JSON answer) and returns each
+object of the first array as soon as its closing brace arrives, so callers
+can act on the first item while the rest is still being generated.
+
+``extract_sections`` splits a markdown-ish analysis into its headed
+sections in a single pass over the text.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# "## Timeline", "**Timeline**:", "3. **Timeline**" (bullets like "- **Metric**" are content)
+_HEADER = re.compile(r"^\s*(?:#+\s*(?P<hash>.+?)\s*#*\s*$|(?:\d+[.)]\s*)?\*\*(?P<bold>[^*]+)\*\*:?\s*(?P<rest>.*)$)")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(?P<item>.+)$")
+
+
+class IncrementalJSONArrayParser:
+    """Yields the objects of the first JSON array in a stream of text chunks."""
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._stack: List[str] = []
+        self._array_depth: Optional[int] = None
+        self._item: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self.items_parsed = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume chunk; return the array items completed by it."""
+        completed = []
+        for char in chunk:
+            collecting = self._array_depth is not None and len(self._stack) > self._array_depth
+            if collecting:
+                self._item.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                if char == "[" and self._array_depth is None:
+                    self._array_depth = len(self._stack) + 1
+                self._stack.append(char)
+                if self._array_depth is not None and len(self._stack) == self._array_depth + 1:
+                    self._item = [char]
+            elif char in "]}":
+                if self._stack:
+                    self._stack.pop()
+                if self._array_depth is not None and len(self._stack) == self._array_depth and self._item:
+                    try:
+                        completed.append(json.loads("".join(self._item)))
+                        self.items_parsed += 1
+                    except ValueError:
+                        pass
+                    self._item = []
+        return completed
+
+    def parse_all(self, text: str) -> List[Any]:
+        """Parse a complete response in one call."""
+        return self.feed(text)
+
+
+def extract_sections(text: str, names: Iterable[str]) -> Dict[str, str]:
+    """Content under each named header, found in one pass over the text.
+
+    A header matches a name when it contains it (case-insensitive); text on
+    the header line after the name ("**Workflow Name**: Launch plan") is kept.
+    """
+    wanted = [(name, name.lower()) for name in names]
+    sections: Dict[str, List[str]] = {name: [] for name, _ in wanted}
+    current: Optional[str] = None
+
+    for line in text.splitlines():
+        header = _HEADER.match(line)
+        if header:
+            title = (header.group("hash") or header.group("bold") or "").lower()
+            current = next((name for name, lowered in wanted if lowered in title), None)
+            if current is not None and not sections[current] and header.group("rest"):
+                sections[current].append(header.group("rest"))
+            continue
+        if current is not None:
+            sections[current].append(line)
+
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def extract_list_items(section_text: str, limit: Optional[int] = None) -> List[str]:
+    """Bullet or numbered items of a section (markdown emphasis stripped)."""
+    items = []
+    for line in section_text.splitlines():
+        match = _LIST_ITEM.match(line)
+        if match:
+            item = match.group("item").replace("**", "").strip()
+            if item:
+                items.append(item)
+    return items[:limit] if limit is not None else items
@@ -0,0 +1,337 @@
+"""Token and cost ledger for every LLM call made by PM33.
+
+Call sites report the provider response (or its usage numbers) after each
+call; the ledger prices it, keeps running aggregates in memory and buffers the
+individual records until a sink persists them in batches. The owning
+``Operation.id`` is picked up from a context variable set by
+``OperationService`` so call sites do not need to thread it through.
+
+Like ``utils.llm_clients`` this module does not import ``utils.config`` so it
+can be used outside the FastAPI app; without a sink only the in-memory
+aggregates are kept. Only the API server (main.py) installs a sink, so calls
+made by pm33-core.py, the MCP server and the marketing scripts show up in
+their own process's aggregates but not in the llm_usage table.
+"""
+
+import asyncio
+import contextvars
+import inspect
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+LEDGER_BATCH_SIZE = int(os.getenv("PM33_USAGE_BATCH_SIZE", "50"))
+LEDGER_FLUSH_INTERVAL = float(os.getenv("PM33_USAGE_FLUSH_INTERVAL", "5"))
+LEDGER_MAX_BUFFER = int(os.getenv("PM33_USAGE_MAX_BUFFER", "10000"))
+
+# USD per million tokens: (input, output, cache read, cache write)
+MODEL_PRICING: Dict[str, Tuple[float, float, float, float]] = {
+    "claude-3-5-sonnet-20241022": (3.00, 15.00, 0.30, 3.75),
+    "claude-3-haiku-20240307": (0.25, 1.25, 0.03, 0.30),
+    "gpt-4o-mini": (0.15, 0.60, 0.075, 0.15),
+    "gpt-3.5-turbo": (0.50, 1.50, 0.50, 0.50),
+    "llama-3.1-70b-versatile": (0.59, 0.79, 0.59, 0.59),
+    "llama3-8b-8192": (0.05, 0.08, 0.05, 0.05),
+    "NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO": (0.60, 0.60, 0.60, 0.60),
+}
+
+current_operation_id: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "pm33_current_operation_id", default=None
+)
+
+UsageSink = Callable[[List["UsageRecord"]], Optional[Awaitable[None]]]
+
+
+@dataclass
+class UsageRecord:
+    """One priced LLM call."""
+
+    engine: str
+    model: str
+    call_site: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    latency_ms: int = 0
+    cost: float = 0.0
+    success: bool = True
+    cancelled: bool = False  # Abandoned by the caller (not a provider failure); success is False
+    operation_id: Optional[int] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens + self.cache_read_tokens + self.cache_write_tokens
+
+    def summary(self) -> Dict[str, Any]:
+        """Token counts and cost, for response metadata."""
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "cost": round(self.cost, 6),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        return data
+
+
+def estimate_cost(model: str, input_tokens: int = 0, output_tokens: int = 0,
+                  cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+    """Price a call from MODEL_PRICING; unknown models cost 0 and are flagged in stats."""
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return 0.0
+    input_price, output_price, cache_read_price, cache_write_price = pricing
+    return (
+        input_tokens * input_price
+        + output_tokens * output_price
+        + cache_read_tokens * cache_read_price
+        + cache_write_tokens * cache_write_price
+    ) / 1_000_000
+
+
+def extract_usage(response: Any) -> Dict[str, int]:
+    """Token counts from an Anthropic message or an OpenAI-compatible completion.
+
+    Anthropic reports uncached input separately from cache reads/writes; OpenAI
+    style APIs include cached tokens inside prompt_tokens, so they are split
+    out here to keep ``input_tokens`` meaning "uncached input" everywhere.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        # Groq reports streaming usage on an extension field of the last chunk
+        usage = getattr(getattr(response, "x_groq", None), "usage", None)
+    if usage is None:
+        return {"input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0}
+
+    if hasattr(usage, "input_tokens"):
+        return {
+            "input_tokens": usage.input_tokens or 0,
+            "output_tokens": usage.output_tokens or 0,
+            "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        }
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    return {
+        "input_tokens": max(0, prompt_tokens - cached),
+        "output_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "cache_read_tokens": cached,
+        "cache_write_tokens": 0,
+    }
+
+
+@contextmanager
+def operation_scope(operation_id: Optional[int]):
+    """Attribute every LLM call made inside the block to operation_id."""
+    token = current_operation_id.set(operation_id)
+    try:
+        yield
+    finally:
+        current_operation_id.reset(token)
+
+
+class UsageLedger:
+    """Buffers priced LLM calls for batched persistence and keeps live aggregates."""
+
+    def __init__(self, batch_size: int = LEDGER_BATCH_SIZE, max_buffer: int = LEDGER_MAX_BUFFER):
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: deque = deque(maxlen=max_buffer)
+        self._sink: Optional[UsageSink] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        # (engine, model, call_site) -> running totals
+        self._aggregates: Dict[Tuple[str, str, str], Dict[str, float]] = {}
+        self.counters = {"recorded": 0, "flushed": 0, "dropped": 0, "flush_errors": 0, "unpriced": 0}
+
+    def set_sink(self, sink: Optional[UsageSink]):
+        """Install the batch writer (sync or async callable taking a list of records)."""
+        self._sink = sink
+
+    def record(self, engine: str, model: str, call_site: str, latency: float = 0.0,
+               success: bool = True, operation_id: Optional[int] = None, cancelled: bool = False,
+               **tokens) -> UsageRecord:
+        """Price and record one call; tokens are input/output/cache_read/cache_write_tokens."""
+        record = UsageRecord(
+            engine=engine,
+            model=model,
+            call_site=call_site,
+            latency_ms=int(latency * 1000),
+            success=success and not cancelled,
+            cancelled=cancelled,
+            operation_id=operation_id if operation_id is not None else current_operation_id.get(),
+            **tokens,
+        )
+        record.cost = estimate_cost(
+            model, record.input_tokens, record.output_tokens, record.cache_read_tokens, record.cache_write_tokens
+        )
+
+        with self._lock:
+            self.counters["recorded"] += 1
+            if model not in MODEL_PRICING:
+                self.counters["unpriced"] += 1
+            if self._sink is not None:
+                if len(self._pending) == self._pending.maxlen:
+                    self.counters["dropped"] += 1
+                self._pending.append(record)
+
+            totals = self._aggregates.setdefault(
+                (engine, model, call_site),
+                {"calls": 0, "errors": 0, "cancelled": 0, "input_tokens": 0, "output_tokens": 0,
+                 "cache_read_tokens": 0, "cache_write_tokens": 0, "cost": 0.0, "latency_ms": 0},
+            )
+            totals["calls"] += 1
+            totals["errors"] += 0 if record.success or cancelled else 1
+            totals["cancelled"] += 1 if cancelled else 0
+            totals["input_tokens"] += record.input_tokens
+            totals["output_tokens"] += record.output_tokens
+            totals["cache_read_tokens"] += record.cache_read_tokens
+            totals["cache_write_tokens"] += record.cache_write_tokens
+            totals["cost"] += record.cost
+            totals["latency_ms"] += record.latency_ms
+
+        return record
+
+    def record_response(self, response: Any, engine: str, model: str, call_site: str,
+                        latency: float = 0.0, success: bool = True) -> UsageRecord:
+        """Record a provider response object, reading its usage block."""
+        return self.record(engine, model, call_site, latency=latency, success=success, **extract_usage(response))
+
+    def record_failure(self, engine: str, model: str, call_site: str, latency: float = 0.0) -> UsageRecord:
+        """Record a failed call (no tokens billed, but counted for error rates)."""
+        return self.record(engine, model, call_site, latency=latency, success=False)
+
+    @contextmanager
+    def track(self, engine: str, model: str, call_site: str):
+        """Time a call and record it; set ``call.response`` to the provider response.
+
+            with usage_ledger.track("anthropic", model, "workflow.analysis") as call:
+                call.response = client.messages.create(...)
+
+        Afterwards ``call.record`` holds the priced UsageRecord. Only an
+        ``Exception`` counts as a failed call; cancellation (CancelledError,
+        or GeneratorExit when a stream is closed early) is recorded as
+        cancelled with the usage known so far: the response's if it was set,
+        otherwise the running estimate a streaming call site keeps in
+        ``call.usage``.
+        """
+        call = _TrackedCall()
+        start_time = time.time()
+        try:
+            yield call
+        except Exception:
+            self.record_failure(engine, model, call_site, time.time() - start_time)
+            raise
+        except BaseException:
+            tokens = extract_usage(call.response) if call.response is not None else dict(call.usage)
+            call.record = self.record(engine, model, call_site, latency=time.time() - start_time,
+                                      cancelled=True, **tokens)
+            raise
+        call.record = self.record_response(call.response, engine, model, call_site, time.time() - start_time)
+
+    def drain(self, limit: Optional[int] = None) -> List[UsageRecord]:
+        """Remove and return up to limit pending records."""
+        with self._lock:
+            count = len(self._pending) if limit is None else min(limit, len(self._pending))
+            return [self._pending.popleft() for _ in range(count)]
+
+    async def flush(self) -> int:
+        """Write all pending records through the sink in batches; returns records written."""
+        if self._sink is None:
+            return 0
+
+        written = 0
+        while True:
+            batch = self.drain(self.batch_size)
+            if not batch:
+                return written
+            try:
+                result = self._sink(batch)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                with self._lock:
+                    self.counters["flush_errors"] += 1
+                    # Put the batch back for the next attempt (oldest first). Records
+                    # added while the sink ran take precedence; the oldest that no
+                    # longer fit are dropped, as on a full buffer
+                    room = self._pending.maxlen - len(self._pending)
+                    kept = batch[len(batch) - room:] if room > 0 else []
+                    self.counters["dropped"] += len(batch) - len(kept)
+                    self._pending.extendleft(reversed(kept))
+                return written
+            written += len(batch)
+            with self._lock:
+                self.counters["flushed"] += len(batch)
+
+    def start_background_flush(self, interval: float = LEDGER_FLUSH_INTERVAL):
+        """Flush periodically from the running event loop (FastAPI lifespan)."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop(interval))
+
+    async def stop_background_flush(self):
+        """Stop the periodic flush and write whatever is still pending."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    def aggregates(self, group_by: str = "call_site") -> Dict[str, Dict[str, float]]:
+        """Running totals grouped by 'engine', 'model' or 'call_site'."""
+        position = {"engine": 0, "model": 1, "call_site": 2}[group_by]
+        grouped: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for key, totals in self._aggregates.items():
+                bucket = grouped.setdefault(key[position], dict.fromkeys(totals, 0))
+                for name, value in totals.items():
+                    bucket[name] += value
+
+        for bucket in grouped.values():
+            bucket["cost"] = round(bucket["cost"], 6)
+            bucket["avg_latency_ms"] = round(bucket["latency_ms"] / bucket["calls"]) if bucket["calls"] else 0
+        return grouped
+
+    def most_expensive(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Call sites (prompts) ranked by total cost since process start."""
+        ranked = sorted(self.aggregates("call_site").items(), key=lambda item: item[1]["cost"], reverse=True)
+        return [{"call_site": call_site, **totals} for call_site, totals in ranked[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and per-engine totals for status endpoints."""
+        with self._lock:
+            counters = dict(self.counters)
+            pending = len(self._pending)
+        return {**counters, "pending": pending, "by_engine": self.aggregates("engine")}
+
+
+class _TrackedCall:
+    response: Any = None
+    record: Optional[UsageRecord] = None
+
+    def __init__(self):
+        # Tokens sent/streamed so far, recorded if the call is cancelled before a response
+        self.usage = {"input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0}
+
+
+usage_ledger = UsageLedger()
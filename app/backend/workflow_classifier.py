@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+PM33 Workflow Type Classifier
+In-process classifier that picks a workflow type without an LLM round trip
+"""
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from context_index import STOPWORDS
+
+# Seed lexicon: phrase -> weight (pseudo-count) per workflow type value
+WORKFLOW_TYPE_LEXICON: Dict[str, Dict[str, float]] = {
+    "competitive_response": {
+        "competitor": 4, "competitors": 4, "competitive": 3, "competition": 3, "rival": 3,
+        "launched": 2, "copycat": 3, "undercut": 3, "price war": 4, "market share": 2,
+        "threat": 2, "respond": 2, "response": 1, "counter": 2, "switching": 2,
+        "productboard": 3, "aha": 2, "linear": 2, "jira product discovery": 3,
+    },
+    "feature_prioritization": {
+        "prioritize": 4, "prioritise": 4, "prioritization": 4, "priority": 2, "priorities": 3,
+        "feature": 2, "features": 2, "backlog": 3, "which feature": 4, "build next": 4,
+        "rice": 3, "ice": 2, "trade off": 3, "tradeoff": 3, "versus": 2, "vs": 2,
+        "should we build": 3, "first": 1, "mvp": 2, "scope": 2,
+    },
+    "market_expansion": {
+        "expand": 4, "expansion": 4, "new market": 4, "new markets": 4, "international": 3,
+        "europe": 3, "eu": 2, "apac": 3, "latam": 3, "segment": 2, "segments": 2,
+        "enterprise": 2, "smb": 2, "vertical": 2, "geography": 3, "localization": 3,
+        "go to market": 3, "gtm": 3, "enter": 2, "entering": 3, "upmarket": 3, "tam": 2,
+    },
+    "risk_mitigation": {
+        "risk": 4, "risks": 4, "mitigate": 4, "mitigation": 4, "churn": 3, "outage": 3,
+        "security": 3, "compliance": 3, "gdpr": 3, "soc 2": 3, "breach": 3, "incident": 3,
+        "technical debt": 3, "debt": 1, "problem": 1, "issue": 1, "decline": 2,
+        "declining": 2, "dropping": 2, "retention": 2, "burn": 2, "runway": 2,
+    },
+    "strategic_planning": {
+        "strategy": 3, "strategic plan": 4, "plan": 2, "planning": 3, "roadmap": 3,
+        "vision": 3, "okr": 3, "okrs": 3, "quarter": 2, "quarterly": 2, "annual": 2,
+        "long term": 3, "next year": 3, "goals": 2, "mission": 2, "north star": 3,
+        "12 month": 3, "18 month": 3,
+    },
+}
+
+DEFAULT_LABEL = "strategic_planning"
+
+# Below this posterior the caller should fall back to the LLM classifier
+CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("PM33_CLASSIFIER_MIN_CONFIDENCE", "0.6"))
+
+# Learned (LLM fallback) data is bounded so logged answers refine the lexicon
+# rather than outweigh it: a learned feature never counts more than this for a
+# label (seed terms carry 2-4), only this many distinct features are learned
+# per label, and at most this many documents per label shape the prior
+CLASSIFIER_MAX_LEARNED_WEIGHT = float(os.getenv("PM33_CLASSIFIER_MAX_LEARNED_WEIGHT", "1.5"))
+CLASSIFIER_MAX_LEARNED_FEATURES = int(os.getenv("PM33_CLASSIFIER_MAX_LEARNED_FEATURES", "2000"))
+CLASSIFIER_MAX_LEARNED_DOCUMENTS = int(os.getenv("PM33_CLASSIFIER_MAX_LEARNED_DOCUMENTS", "200"))
+
+# Question phrasing and words every PM query shares; like stopwords, never learned as evidence
+QUERY_FILLER = STOPWORDS | frozenset("""
+about all also any best company do get going help improve just like make need new now one other
+over product products some start team think users customers want way ways
+""".split())
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _features(text: str) -> List[str]:
+    """Unigram, bigram and trigram features of lowercased text"""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])] + [
+        f"{a} {b} {c}" for a, b, c in zip(tokens, tokens[1:], tokens[2:])
+    ]
+
+
+def _is_content(feature: str) -> bool:
+    """Whether an n-gram is made only of content words (no stopwords, filler or single characters)"""
+    return all(token not in QUERY_FILLER and len(token) > 1 for token in feature.split())
+
+
+@dataclass
+class Classification:
+    label: str
+    confidence: float
+    scores: Dict[str, float]
+    matched_features: int
+
+
+class WorkflowTypeClassifier:
+    """Multinomial naive Bayes over query n-grams, seeded from a keyword lexicon
+
+    The lexicon provides pseudo-counts so the classifier works with no
+    training data; ``learn`` adds labelled queries (e.g. LLM fallback answers)
+    so accuracy improves as queries are logged. Only content words and seed
+    phrases are learned, with capped weight, so phrasing shared by all queries
+    ("how should we ...") never becomes evidence for one label. Features never
+    seen for any label are ignored, so a query with no known terms gets a
+    uniform posterior and therefore low confidence.
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, Dict[str, float]]] = None, smoothing: float = 0.5):
+        self.smoothing = smoothing
+        self.labels = list((lexicon or WORKFLOW_TYPE_LEXICON).keys())
+        self._counts: Dict[str, Counter] = {label: Counter() for label in self.labels}
+        self._totals: Dict[str, float] = {label: 0.0 for label in self.labels}
+        self._documents: Counter = Counter()
+        self._vocabulary: set = set()
+        self._seed_vocabulary: set = set()
+        self._learned: Dict[str, Counter] = {label: Counter() for label in self.labels}
+        self._lock = threading.Lock()
+        self.counters = {"classified": 0, "local": 0, "fallbacks": 0, "learned": 0, "confidence_sum": 0.0}
+        self._label_counts: Counter = Counter()
+
+        for label, phrases in (lexicon or WORKFLOW_TYPE_LEXICON).items():
+            for phrase, weight in phrases.items():
+                feature = " ".join(_TOKEN_PATTERN.findall(phrase.lower()))
+                self._add(label, feature, weight)
+                self._seed_vocabulary.add(feature)
+
+    def _add(self, label: str, feature: str, weight: float):
+        self._counts[label][feature] += weight
+        self._totals[label] += weight
+        self._vocabulary.add(feature)
+
+    def learn(self, query: str, label: str, weight: float = 1.0):
+        """Add a labelled query (online training from logged/LLM-labelled queries)"""
+        if label not in self._counts:
+            return
+        with self._lock:
+            learned = self._learned[label]
+            for feature in set(_features(query)):
+                if feature not in self._seed_vocabulary and not _is_content(feature):
+                    continue
+                if feature not in learned and len(learned) >= CLASSIFIER_MAX_LEARNED_FEATURES:
+                    continue
+                added = min(weight, CLASSIFIER_MAX_LEARNED_WEIGHT - learned[feature])
+                if added > 0:
+                    learned[feature] += added
+                    self._add(label, feature, added)
+            self._documents[label] = min(self._documents[label] + 1, CLASSIFIER_MAX_LEARNED_DOCUMENTS)
+            self.counters["learned"] += 1
+
+    def fit(self, examples: Iterable[Tuple[str, str]]):
+        """Train on (query, label) pairs"""
+        for query, label in examples:
+            self.learn(query, label)
+
+    def classify(self, query: str) -> Classification:
+        """Most likely workflow type with its posterior probability"""
+        with self._lock:
+            # Function words only count where a seed phrase contains them ("should we build")
+            features = [
+                f for f in _features(query)
+                if f in self._vocabulary and (f in self._seed_vocabulary or _is_content(f))
+            ]
+            vocabulary_size = len(self._vocabulary)
+            document_total = sum(self._documents.values())
+
+            log_scores = {}
+            for label in self.labels:
+                # Prior: logged label frequency, uniform until queries are learned; the
+                # pseudo-counts keep any label's prior within 2x of the others
+                prior = (self._documents[label] + CLASSIFIER_MAX_LEARNED_DOCUMENTS) / (
+                    document_total + CLASSIFIER_MAX_LEARNED_DOCUMENTS * len(self.labels)
+                )
+                denominator = self._totals[label] + self.smoothing * vocabulary_size
+                log_scores[label] = math.log(prior) + sum(
+                    math.log((self._counts[label][f] + self.smoothing) / denominator) for f in features
+                )
+
+        top = max(log_scores.values())
+        exp_scores = {label: math.exp(score - top) for label, score in log_scores.items()}
+        norm = sum(exp_scores.values())
+        probabilities = {label: value / norm for label, value in exp_scores.items()}
+
+        label = max(probabilities, key=probabilities.get) if features else DEFAULT_LABEL
+        return Classification(
+            label=label,
+            confidence=probabilities[label],
+            scores=probabilities,
+            matched_features=len(features),
+        )
+
+    def is_confident(self, result: Classification, min_confidence: float = CLASSIFIER_MIN_CONFIDENCE) -> bool:
+        """Whether the local answer can be used without the LLM fallback"""
+        return result.matched_features > 0 and result.confidence >= min_confidence
+
+    def record_outcome(self, result: Classification, label: str, fallback: bool):
+        """Count one classification for the confidence and fallback-rate metrics"""
+        with self._lock:
+            self.counters["classified"] += 1
+            self.counters["fallbacks" if fallback else "local"] += 1
+            self.counters["confidence_sum"] += result.confidence
+            self._label_counts[label] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Classification counters, fallback rate and mean local confidence"""
+        with self._lock:
+            counters = dict(self.counters)
+            labels = dict(self._label_counts)
+        classified = counters.pop("classified")
+        confidence_sum = counters.pop("confidence_sum")
+        return {
+            "classified": classified,
+            **counters,
+            "fallback_rate": round(counters["fallbacks"] / classified, 3) if classified else 0.0,
+            "average_confidence": round(confidence_sum / classified, 3) if classified else 0.0,
+            "min_confidence": CLASSIFIER_MIN_CONFIDENCE,
+            "by_type": labels,
+        }
+
+
+workflow_classifier = WorkflowTypeClassifier()
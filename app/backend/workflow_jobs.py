@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+PM33 Workflow Jobs
+Background workflow generation on an in-process asyncio worker pool
+"""
+
+import asyncio
+import inspect
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+WORKFLOW_JOB_WORKERS = int(os.getenv("PM33_WORKFLOW_JOB_WORKERS", "4"))
+WORKFLOW_JOB_QUEUE_SIZE = int(os.getenv("PM33_WORKFLOW_JOB_QUEUE_SIZE", "100"))
+# Finished jobs kept in memory for polling (older ones are served from the database)
+WORKFLOW_JOB_HISTORY = int(os.getenv("PM33_WORKFLOW_JOB_HISTORY", "1000"))
+# Saving a generated workflow is retried with exponential backoff before the job gives up
+WORKFLOW_JOB_SAVE_ATTEMPTS = int(os.getenv("PM33_WORKFLOW_JOB_SAVE_ATTEMPTS", "3"))
+WORKFLOW_JOB_SAVE_RETRY_DELAY = float(os.getenv("PM33_WORKFLOW_JOB_SAVE_RETRY_DELAY", "1.0"))
+
+# "persist_failed": generated, but could not be stored; the workflow is kept on the job
+TERMINAL_STATUSES = ("completed", "failed", "persist_failed")
+
+# (job state dict) -> None; (workflow, query, context) -> stored workflow
+JobSink = Callable[[Dict[str, Any]], Optional[Awaitable[None]]]
+WorkflowSink = Callable[[Any, str, Dict[str, Any]], Awaitable[Any]]
+
+
+class JobQueueFull(Exception):
+    """No room for another job; the client should retry later."""
+
+
+@dataclass
+class JobState:
+    id: str
+    query: str
+    context: Dict[str, Any]
+    status: str = "queued"
+    stage: Optional[str] = None
+    progress: List[Dict[str, Any]] = field(default_factory=list)
+    workflow_id: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    workflow: Any = None  # Generated workflow, kept when it could not be stored
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = {
+            "job_id": self.id,
+            "status": self.status,
+            "query": self.query,
+            "stage": self.stage,
+            "progress": list(self.progress),
+            "workflow_id": self.workflow_id,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+        }
+        if self.status == "persist_failed":
+            state["workflow"] = _workflow_data(self.workflow)
+        return state
+
+
+def _workflow_data(workflow) -> Any:
+    return workflow.to_dict() if hasattr(workflow, "to_dict") else None
+
+
+class WorkflowJobQueue:
+    """Bounded queue of workflow generations served by a fixed pool of asyncio workers
+
+    Jobs report progress events that pollers read from ``get`` and
+    subscribers receive live from ``subscribe``. Job state and the finished
+    workflow are handed to the persistence sinks (installed by the FastAPI
+    lifespan) so results outlive the process.
+    """
+
+    def __init__(self, workers: int = WORKFLOW_JOB_WORKERS, max_queued: int = WORKFLOW_JOB_QUEUE_SIZE,
+                 history: int = WORKFLOW_JOB_HISTORY, save_attempts: int = WORKFLOW_JOB_SAVE_ATTEMPTS,
+                 save_retry_delay: float = WORKFLOW_JOB_SAVE_RETRY_DELAY):
+        self.worker_count = workers
+        self.max_queued = max_queued
+        self.history = history
+        self.save_attempts = save_attempts
+        self.save_retry_delay = save_retry_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._engine = None
+        self._jobs: "OrderedDict[str, JobState]" = OrderedDict()
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._job_sink: Optional[JobSink] = None
+        self._workflow_sink: Optional[WorkflowSink] = None
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "persist_failed": 0, "rejected": 0}
+
+    def set_persistence(self, job_sink: Optional[JobSink], workflow_sink: Optional[WorkflowSink]):
+        """Install the writers for job state and finished workflows."""
+        self._job_sink = job_sink
+        self._workflow_sink = workflow_sink
+
+    def start(self, engine):
+        """Start the worker pool on the running event loop (FastAPI lifespan)."""
+        if self._workers:
+            return
+        self._engine = engine
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self):
+        """Stop the workers; jobs still queued or running are marked failed."""
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+        for job in list(self._jobs.values()):
+            if job.status not in TERMINAL_STATUSES:
+                await self._finish(job, "failed", error="Server shut down before the job finished")
+
+    async def submit(self, query: str, context: Dict[str, Any]) -> JobState:
+        """Queue a generation and return its job at once; raises JobQueueFull."""
+        if not self._workers:
+            raise JobQueueFull("Workflow job workers are not running")
+
+        job = JobState(id=f"job_{uuid.uuid4().hex}", query=query, context=context)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            raise JobQueueFull(f"{self.max_queued} workflow jobs already queued")
+
+        self._remember(job)
+        self.counters["submitted"] += 1
+        await self._persist(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[JobState]:
+        """Job state while it is in memory (recent jobs); None otherwise."""
+        return self._jobs.get(job_id)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Progress events for a job: those so far, then live ones until it finishes."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+
+        listener: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(listener)
+        try:
+            history = list(job.progress)
+            for event in history:
+                yield event
+            if history and history[-1]["stage"] in TERMINAL_STATUSES:
+                return
+            # Events emitted while the history was replayed are also in the listener
+            while True:
+                event = await listener.get()
+                if event["sequence"] < len(history):
+                    continue
+                yield event
+                if event["stage"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            self._subscribers[job_id].remove(listener)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            **self.counters,
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queued": self.max_queued,
+            "by_status": statuses,
+        }
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: JobState):
+        job.status = "running"
+        self._emit(job, "running")
+        await self._persist(job)
+
+        try:
+            workflow = await self._engine.generate_strategic_workflow(
+                job.query, job.context, progress=lambda stage, data: self._emit(job, stage, **data)
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._finish(job, "failed", error=str(e)[:500])
+            return
+
+        # A storage outage must not throw away a generation that already succeeded
+        job.workflow = workflow
+        try:
+            workflow = await self._store(job, workflow)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The event carries the workflow, so the job sink keeps it with the job's progress
+            await self._finish(job, "persist_failed", error=f"Workflow generated but not saved: {e}"[:500],
+                               workflow=_workflow_data(workflow))
+            return
+
+        job.workflow = None
+        job.workflow_id = workflow.id
+        await self._finish(job, "completed", workflow_id=workflow.id, tasks=len(workflow.tasks))
+
+    async def _store(self, job: JobState, workflow):
+        """Hand the workflow to the workflow sink, retrying with backoff; raises the last error."""
+        if self._workflow_sink is None:
+            return workflow
+        for attempt in range(self.save_attempts):
+            try:
+                return await self._workflow_sink(workflow, job.query, job.context)
+            except Exception as e:
+                if attempt + 1 >= self.save_attempts:
+                    raise
+                print(f"⚠️ Could not save workflow for job {job.id} (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(self.save_retry_delay * 2 ** attempt)
+
+    async def _finish(self, job: JobState, status: str, **data):
+        job.status = status
+        if status != "completed":
+            job.error = data.get("error")
+        self.counters[status] += 1
+        self._emit(job, status, **data)
+        await self._persist(job)
+
+    def _emit(self, job: JobState, stage: str, **data):
+        event = {"stage": stage, "sequence": len(job.progress), "at": datetime.utcnow().isoformat(), **data}
+        job.stage = stage
+        job.progress.append(event)
+        for listener in self._subscribers.get(job.id, []):
+            listener.put_nowait(event)
+
+    def _remember(self, job: JobState):
+        self._jobs[job.id] = job
+        # Evict the oldest finished jobs; unfinished ones are always kept
+        while len(self._jobs) > self.history:
+            oldest_id = next((job_id for job_id, state in self._jobs.items() if state.status in TERMINAL_STATUSES), None)
+            if oldest_id is None:
+                break
+            del self._jobs[oldest_id]
+
+    async def _persist(self, job: JobState):
+        if self._job_sink is None:
+            return
+        try:
+            result = self._job_sink(job.to_dict())
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"⚠️ Could not persist workflow job {job.id}: {e}")
+
+
+workflow_jobs = WorkflowJobQueue()
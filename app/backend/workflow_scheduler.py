@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+PM33 Workflow Scheduler
+Dependency-aware due dates and critical path for StrategicTask lists
+"""
+
+import heapq
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+HOURS_PER_DAY = float(os.getenv("PM33_SCHEDULER_HOURS_PER_DAY", "6"))  # Focused hours per person per day
+DEFAULT_ROLE_CAPACITY = int(os.getenv("PM33_SCHEDULER_ROLE_CAPACITY", "1"))  # People per role
+
+PRIORITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+class WorkflowCycleError(ValueError):
+    """Task dependencies form a cycle, so no execution order exists."""
+
+    def __init__(self, cycle: List[str]):
+        super().__init__(f"Task dependencies form a cycle: {' -> '.join(cycle)}")
+        self.cycle = cycle
+
+
+@dataclass
+class TaskSlot:
+    start_day: float
+    finish_day: float
+    slack_days: float = 0.0
+
+
+@dataclass
+class Schedule:
+    order: List[str]
+    slots: Dict[str, TaskSlot]
+    critical_path: List[str]
+    duration_days: float
+    unknown_dependencies: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def add_working_days(start: datetime, days: float) -> datetime:
+    """start plus a (fractional) number of Monday-Friday working days"""
+    whole = int(days)
+    current = start
+    while whole > 0:
+        current += timedelta(days=1)
+        if current.weekday() < 5:
+            whole -= 1
+    return current + timedelta(days=days - int(days))
+
+
+def _resolve_dependencies(tasks) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Task id -> prerequisite task ids; dependencies may name task ids or titles"""
+    by_key = {}
+    for task in tasks:
+        by_key[task.id] = task.id
+        by_key.setdefault(task.title.strip().lower(), task.id)
+
+    prerequisites, unknown = {}, {}
+    for task in tasks:
+        resolved = []
+        for dependency in task.dependencies:
+            if not isinstance(dependency, str):
+                # Only ids and titles can be resolved (e.g. not an object from malformed JSON)
+                unknown.setdefault(task.id, []).append(str(dependency))
+                continue
+            task_id = by_key.get(dependency) or by_key.get(dependency.strip().lower())
+            if task_id is None:
+                unknown.setdefault(task.id, []).append(dependency)
+            elif task_id != task.id and task_id not in resolved:
+                resolved.append(task_id)
+        prerequisites[task.id] = resolved
+    return prerequisites, unknown
+
+
+def _find_cycle(remaining: List[str], prerequisites: Dict[str, List[str]]) -> List[str]:
+    """One dependency cycle among tasks Kahn's algorithm could not order"""
+    remaining_set = set(remaining)
+    node = remaining[0]
+    seen: Dict[str, int] = {}
+    path: List[str] = []
+    # Every remaining task has a remaining prerequisite, so walking them must loop
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = next(dep for dep in prerequisites[node] if dep in remaining_set)
+    # Walked against the dependency direction; report it in execution order
+    return list(reversed(path[seen[node]:] + [node]))
+
+
+def schedule_tasks(tasks, role_capacity: Optional[Dict[str, int]] = None,
+                   hours_per_day: float = HOURS_PER_DAY) -> Schedule:
+    """Order tasks by dependency, place them on role capacity and compute the critical path
+
+    Tasks start as soon as their prerequisites finish and someone in the
+    assignee role is free (ties go to the higher priority task). The critical
+    path is the longest dependency chain by duration; slack is how long a
+    task can slip without delaying the workflow (ignoring role contention).
+    Runs in O((V + E) log V).
+    """
+    role_capacity = role_capacity or {}
+    tasks_by_id = {task.id: task for task in tasks}
+    prerequisites, unknown = _resolve_dependencies(tasks)
+    dependents: Dict[str, List[str]] = {task_id: [] for task_id in tasks_by_id}
+    for task_id, deps in prerequisites.items():
+        for dep in deps:
+            dependents[dep].append(task_id)
+
+    durations = {task.id: max(0.0, float(task.estimated_hours or 0)) / hours_per_day for task in tasks}
+    position = {task.id: i for i, task in enumerate(tasks)}
+    remaining_deps = {task_id: len(deps) for task_id, deps in prerequisites.items()}
+    ready_at = {task_id: 0.0 for task_id in tasks_by_id}
+
+    def rank(task_id):
+        task = tasks_by_id[task_id]
+        priority = getattr(task.priority, "value", task.priority)
+        return (ready_at[task_id], PRIORITY_RANK.get(priority, 2), position[task_id], task_id)
+
+    # Per-role heaps of the day each person becomes free
+    workers: Dict[str, List[float]] = {}
+    ready = [rank(task_id) for task_id, count in remaining_deps.items() if count == 0]
+    heapq.heapify(ready)
+
+    order, slots = [], {}
+    while ready:
+        *_, task_id = heapq.heappop(ready)
+        role = tasks_by_id[task_id].assignee_role
+        free = workers.get(role)
+        if free is None:
+            free = workers[role] = [0.0] * max(1, role_capacity.get(role, DEFAULT_ROLE_CAPACITY))
+
+        start = max(ready_at[task_id], heapq.heappop(free))
+        finish = start + durations[task_id]
+        heapq.heappush(free, finish)
+        slots[task_id] = TaskSlot(start_day=start, finish_day=finish)
+        order.append(task_id)
+
+        for dependent in dependents[task_id]:
+            ready_at[dependent] = max(ready_at[dependent], finish)
+            remaining_deps[dependent] -= 1
+            if remaining_deps[dependent] == 0:
+                heapq.heappush(ready, rank(dependent))
+
+    if len(order) < len(tasks_by_id):
+        raise WorkflowCycleError(_find_cycle([t for t in tasks_by_id if t not in slots], prerequisites))
+
+    # Critical path method over the dependency graph (unlimited capacity)
+    earliest_finish: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+    for task_id in order:
+        best = max(prerequisites[task_id], key=lambda dep: earliest_finish[dep], default=None)
+        earliest_finish[task_id] = (earliest_finish[best] if best else 0.0) + durations[task_id]
+        via[task_id] = best
+
+    project_end = max(earliest_finish.values(), default=0.0)
+    latest_finish: Dict[str, float] = {}
+    for task_id in reversed(order):
+        latest_finish[task_id] = min(
+            (latest_finish[dep] - durations[dep] for dep in dependents[task_id]), default=project_end
+        )
+        slots[task_id].slack_days = round(latest_finish[task_id] - earliest_finish[task_id], 6)
+
+    critical_path = []
+    node = max(earliest_finish, key=earliest_finish.get) if earliest_finish else None
+    while node is not None:
+        critical_path.append(node)
+        node = via[node]
+    critical_path.reverse()
+
+    return Schedule(
+        order=order,
+        slots=slots,
+        critical_path=critical_path,
+        duration_days=max((slot.finish_day for slot in slots.values()), default=0.0),
+        unknown_dependencies=unknown,
+    )
+
+
+def apply_due_dates(tasks, start: datetime, role_capacity: Optional[Dict[str, int]] = None,
+                    hours_per_day: float = HOURS_PER_DAY) -> Schedule:
+    """Schedule tasks and set each task's due_date to its finish (working days from start)"""
+    schedule = schedule_tasks(tasks, role_capacity, hours_per_day)
+    for task in tasks:
+        task.due_date = add_working_days(start, schedule.slots[task.id].finish_day)
+    return schedule
@@ -7,18 +7,32 @@ import asyncio
 import json
 import sys
 from typing import Dict, List, Any
-import anthropic
 from dotenv import load_dotenv
 import os
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from utils.llm_clients import get_llm_client
+from utils.usage_ledger import usage_ledger
+from utils.prompt_cache import PromptParts, anthropic_prompt
+
 # Load environment variables
 load_dotenv()
 
+PROJECT_ANALYSIS_INSTRUCTIONS = """
+        Analyze the AI project named in the request thoroughly but respond in exactly this format:
+        **Status**: [Red/Yellow/Green] - [one sentence status]
+        **Key Issue**: [main blocker or concern]
+        **Action**: [specific next step]
+        **Timeline**: [weeks to meaningful impact]
+        
+        Think deeply about: technical risks, market timing, resource constraints, competitive landscape.
+        """
+
 class PM33McpServer:
     def __init__(self):
         api_key = os.getenv('ANTHROPIC_API_KEY')
         if api_key and api_key != 'your_api_key_here':
-            self.claude = anthropic.Anthropic(api_key=api_key)
+            self.claude = get_llm_client('anthropic', api_key)
         else:
             self.claude = None
             
@@ -127,24 +141,19 @@ class PM33McpServer:
 **Action**: Provide project name to analyze
 **Timeline**: Immediate"""
         
-        prompt = self.think_hard_prefix + f"""
-        AI Project Analysis Request: {project_name}
-        
-        Analyze this AI project thoroughly but respond in exactly this format:
-        **Status**: [Red/Yellow/Green] - [one sentence status]
-        **Key Issue**: [main blocker or concern]
-        **Action**: [specific next step]
-        **Timeline**: [weeks to meaningful impact]
-        
-        Think deeply about: technical risks, market timing, resource constraints, competitive landscape.
-        """
+        # Static instructions go first as a cached system block; only the project name varies
+        prompt = PromptParts(
+            static=self.think_hard_prefix + PROJECT_ANALYSIS_INSTRUCTIONS,
+            dynamic=f"AI Project Analysis Request: {project_name}"
+        )
         
         try:
-            response = self.claude.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=200,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "mcp.analyze_ai_project") as call:
+                response = call.response = self.claude.messages.create(
+                    model="claude-3-5-sonnet-20241022",
+                    max_tokens=200,
+                    **anthropic_prompt(prompt, "claude-3-5-sonnet-20241022")
+                )
             
             return response.content[0].text
         except Exception as e:
@@ -9,14 +9,18 @@ import json
 import asyncio
 from datetime import datetime
 from typing import Dict, List
-import anthropic
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'app', 'backend'))
+from utils.llm_clients import get_llm_client
+from utils.usage_ledger import usage_ledger
+
 load_dotenv()
 
 class ContentEngine:
     def __init__(self):
-        self.claude = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.claude = get_llm_client('anthropic')
         self.content_calendar = {}
         
     def generate_blog_post(self, topic: str, keywords: List[str], target_audience: str = "Product Managers") -> Dict:
@@ -43,11 +47,12 @@ class ContentEngine:
         Output format: Title, meta description, full article content
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.content.generate_blog_post") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=4000,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         content = response.content[0].text
         return {
@@ -82,11 +87,12 @@ class ContentEngine:
         Make it native to the platform while maintaining PM33's value proposition.
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.content.generate_social_content") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1000,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         return {
             "platform": platform,
@@ -118,11 +124,12 @@ class ContentEngine:
             Output: Subject line and email body (300-400 words)
             """
             
-            response = self.claude.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1500,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.content.generate_email_sequence") as call:
+                response = call.response = self.claude.messages.create(
+                    model="claude-3-5-sonnet-20241022",
+                    max_tokens=1500,
+                    messages=[{"role": "user", "content": prompt}]
+                )
             
             sequence.append({
                 "day": day,
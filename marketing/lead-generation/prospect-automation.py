@@ -9,14 +9,18 @@ import json
 import asyncio
 from datetime import datetime
 from typing import Dict, List
-import anthropic
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'app', 'backend'))
+from utils.llm_clients import get_llm_client
+from utils.usage_ledger import usage_ledger
+
 load_dotenv()
 
 class ProspectAutomation:
     def __init__(self):
-        self.claude = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.claude = get_llm_client('anthropic')
         self.qualified_prospects = []
         
     def analyze_prospect(self, prospect_data: Dict) -> Dict:
@@ -46,11 +50,12 @@ class ProspectAutomation:
         looking for AI automation.
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.prospects.analyze_prospect") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1000,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         analysis = response.content[0].text
         
@@ -98,11 +103,12 @@ class ProspectAutomation:
         Include suggested follow-up sequence if they respond positively.
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1500,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.prospects.generate_personalized_outreach") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1500,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         return {
             "prospect_id": prospect_analysis["prospect_id"],
@@ -181,11 +187,12 @@ class ProspectAutomation:
         Keep it brief, personal, and value-focused.
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=800,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.prospects.generate_touchpoint_content") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=800,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         return response.content[0].text
 
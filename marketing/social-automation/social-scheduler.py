@@ -11,14 +11,18 @@ import schedule
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List
-import anthropic
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'app', 'backend'))
+from utils.llm_clients import get_llm_client
+from utils.usage_ledger import usage_ledger
+
 load_dotenv()
 
 class SocialScheduler:
     def __init__(self):
-        self.claude = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.claude = get_llm_client('anthropic')
         self.platforms = {
             'linkedin': {'max_chars': 3000, 'optimal_chars': 1300},
             'twitter': {'max_chars': 280, 'optimal_chars': 240},
@@ -71,11 +75,12 @@ class SocialScheduler:
         For {platform}, focus on what resonates with product managers on this platform.
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.social.generate_platform_content") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1000,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         return {
             "platform": platform,
@@ -123,11 +128,12 @@ class SocialScheduler:
         Output format: Just list the {num_posts} topics, one per line.
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=800,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.social.generate_series_topics") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=800,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         topics = [line.strip() for line in response.content[0].text.split('\n') if line.strip()]
         return topics[:num_posts]
@@ -195,11 +201,12 @@ class SocialScheduler:
         - Share comment: Add context when sharing others' content
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=500,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.social.generate_engagement_responses") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=500,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         return response.content[0].text
     
@@ -227,11 +234,12 @@ class SocialScheduler:
         Keep analysis concise and actionable.
         """
         
-        response = self.claude.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with usage_ledger.track("anthropic", "claude-3-5-sonnet-20241022", "marketing.social.analyze_post_performance") as call:
+            response = call.response = self.claude.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1000,
+                messages=[{"role": "user", "content": prompt}]
+            )
         
         return {
             "post_id": post_data.get('id', 'unknown'),
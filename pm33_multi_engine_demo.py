@@ -4,9 +4,10 @@ PM33 Multi-Engine Demo Service
 Uses intelligent AI engine selection for optimal performance/quality/cost
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 import os
 import sys
+import json
 import time
 from datetime import datetime
 from dotenv import load_dotenv
@@ -46,7 +47,7 @@ class PM33MultiEngineService:
         
         # Initialize AI Engine Manager
         try:
-            self.ai_manager = AIEngineManager()
+            self.ai_manager = AIEngineManager(lazy_init=True)
             self.health_status['ai_manager'] = 'healthy'
             print("✅ Multi-Engine AI Manager initialized")
         except Exception as e:
@@ -117,6 +118,48 @@ class PM33MultiEngineService:
             print(f"❌ Strategic response generation failed: {str(e)}")
             return self._create_service_error(f"Strategic analysis failed: {str(e)}")
     
+    def stream_strategic_response(self, question):
+        """Stream a strategic response as (event, payload) pairs for Server-Sent Events"""
+        print(f"\n🎯 === STREAMING STRATEGIC QUERY ===")
+        print(f"📥 Question: '{question}'")
+        
+        if not self.initialized or not self.ai_manager:
+            error = self._create_service_error("Service not properly initialized" if not self.initialized else "AI Engine Manager not available")
+            yield 'done', error
+            return
+        
+        try:
+            context = ""
+            if self.context_manager:
+                context = self.context_manager.get_relevant_context(question)
+                print(f"✅ Context loaded: {len(context)} characters")
+            
+            yield 'meta', {'service': 'pm33_multi_engine', 'context_chars': len(context)}
+            
+            for event in self.ai_manager.stream_strategic_response(question, context):
+                if event['type'] == 'token':
+                    yield 'token', {'text': event['text']}
+                elif event['type'] == 'error':
+                    yield 'error', {'error': event['error'], 'engine': event['engine']}
+                    return
+                elif event['type'] == 'done':
+                    # Text is complete - extract the workflow once, then finish
+                    ai_response_data = {'response': event['response'], 'meta': event['meta']}
+                    workflow = self._create_workflow_from_ai_response(ai_response_data, question)
+                    yield 'workflow', workflow
+                    yield 'done', {
+                        'response': event['response'],
+                        'workflow': workflow,
+                        'meta': {
+                            **event['meta'],
+                            'service': 'pm33_multi_engine',
+                            'context_chars': len(context)
+                        }
+                    }
+        except Exception as e:
+            print(f"❌ Strategic stream failed: {str(e)}")
+            yield 'done', self._create_service_error(f"Strategic analysis failed: {str(e)}")
+    
     def _create_workflow_from_ai_response(self, ai_response_data, question):
         """Create workflow structure from AI response"""
         
@@ -308,12 +351,21 @@ def mockup():
 def health_check():
     return jsonify(demo_service.get_health_status())
 
+def _format_sse(event, payload):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+def _wants_stream(data):
+    """Client asked for SSE via Accept header or a 'stream' flag in the body"""
+    return bool(data.get('stream')) or 'text/event-stream' in request.headers.get('Accept', '')
+
 @app.route('/api/mock-strategic-response', methods=['POST'])
 def strategic_response():
     """Strategic response endpoint with multi-engine intelligence"""
     try:
         data = request.json
         question = data.get('message', '').strip()
+        stream = _wants_stream(data)
         
         if not question:
             return jsonify({'error': 'No question provided'}), 400
@@ -329,7 +381,7 @@ def strategic_response():
         if ((len(question) < 25 and question_lower in casual_inputs) or 
             question_lower in casual_phrases or 
             question_lower in vague_inputs):
-            return jsonify({
+            greeting = {
                 'response': f'👋 Hello! I received: "{question}". I\'m PM33\'s Strategic AI Co-Pilot. For strategic analysis, ask questions about competitive strategy, resource allocation, market positioning, etc.',
                 'workflow': {
                     'id': 'greeting',
@@ -355,7 +407,16 @@ def strategic_response():
                     'success_metrics': ['Ask a strategic PM question'],
                     'risk_factors': []
                 }
-            })
+            }
+            if stream:
+                return Response(_format_sse('done', greeting), mimetype='text/event-stream')
+            return jsonify(greeting)
+        
+        if stream:
+            # Server-Sent Events: tokens as they arrive, then the extracted workflow
+            events = (_format_sse(event, payload) for event, payload in demo_service.stream_strategic_response(question))
+            return Response(stream_with_context(events), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
         
         # Generate strategic response using multi-engine system
         result = demo_service.generate_strategic_response(question)